@@ -5,43 +5,62 @@ the ChronoCore game's AI-driven storytelling and decision-making.
 """
 
 import os
+import logging
+import msgspec
+import orjson
+import pydantic_core
 import uvicorn
+from functools import lru_cache
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException, Depends, Body
+from fastapi import FastAPI, HTTPException, Depends, Body, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from dotenv import load_dotenv
-from typing import Dict, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Type
 
 from src.models.game_state import GameState
 from src.models.player import Player
 from src.models.quest import Quest
 from src.models.realm import Realm
 from src.models.timeline import Timeline
+from src.models.requests import (
+    EvaluateDecisionRequest, CalculateKarmaRequest, TimelineRequest,
+    RealmRequest, RealmEventRequest, NewGameRequest,
+    SimilarContextsRequest, CompareTextsRequest, TrainingExampleRequest
+)
 
-from src.services.story_generator import StoryGenerator
-from src.services.decision_engine import DecisionEngine
 from src.services.karma_calculator import KarmaCalculator
 from src.services.timeline_analyzer import TimelineAnalyzer
 from src.services.realm_manager import RealmManager
+from src.services.batch_scheduler import BatchScheduler
 
 from src.data.embeddings_store import EmbeddingsStore
-from src.data.prompt_templates import PromptTemplates
+from src.data.prompt_templates import PromptTemplates, TEMPLATE_CATEGORIES, TEMPLATE_CATEGORY_MAP
 from src.data.training_data import TrainingData
 from src.data.game_data import GameData
 
 from src.utils.database import init_db
 from src.utils.embeddings import init_embeddings
+from src.utils.http_client import close_http_clients
 from src.utils.config import Config
 
 # Load environment variables
 load_dotenv()
 
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+
 # Define lifespan context manager
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Initialize database connections and other resources on startup
     await init_db()
     await init_embeddings()
+    embeddings_store.load_corpus()
+    embeddings_store.warm_up()
+    karma_calculator.warm_up()
+    await batch_scheduler.start()
+    await embeddings_store.start()
     
     # Log startup information
     print(f"ChronoCore AI Engine starting with OpenAI model: {Config.OPENAI_MODEL}")
@@ -50,6 +69,10 @@ async def lifespan(app: FastAPI):
     yield
     
     # Clean up resources on shutdown if needed
+    await batch_scheduler.stop()
+    await embeddings_store.stop()
+    embeddings_store.save_corpus()
+    await close_http_clients()
     print("ChronoCore AI Engine shutting down")
 
 # Initialize FastAPI app
@@ -57,6 +80,7 @@ app = FastAPI(
     title="ChronoCore AI Engine",
     description="AI Engine for ChronoCore: Path of Realities board game",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -70,44 +94,111 @@ app.add_middleware(
 )
 
 # Initialize services
-story_generator = StoryGenerator()
-decision_engine = DecisionEngine()
+# LLM-backed services (and LangChain) are loaded on first use so workers start serving sooner
+@lru_cache(maxsize=None)
+def get_story_generator():
+    """Get the shared story generator, creating it on first use."""
+    from src.services.story_generator import StoryGenerator
+    return StoryGenerator()
+
+@lru_cache(maxsize=None)
+def get_decision_engine():
+    """Get the shared decision engine, creating it on first use."""
+    from src.services.decision_engine import DecisionEngine
+    return DecisionEngine()
+
 karma_calculator = KarmaCalculator()
 timeline_analyzer = TimelineAnalyzer()
 realm_manager = RealmManager()
 
+# Coalesce concurrent LLM requests into micro-batches
+batch_scheduler = BatchScheduler()
+batch_scheduler.register("generate_story", lambda game_states: get_story_generator().generate_batch(game_states))
+batch_scheduler.register("generate_quest", lambda requests: get_story_generator().generate_quest_batch(requests))
+
 # Initialize data components
 embeddings_store = EmbeddingsStore()
 game_data = GameData()
 training_data = TrainingData()
 
+def msgspec_body(body_type: Type[msgspec.Struct]) -> Callable:
+    """Build a dependency that decodes the raw request body into a msgspec struct."""
+    async def decode(request: Request) -> Any:
+        try:
+            return msgspec.json.decode(await request.body(), type=body_type)
+        except msgspec.DecodeError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+    
+    return decode
+
+def msgspec_openapi(body_type: Type[msgspec.Struct]) -> Dict:
+    """Describe a msgspec request body in the OpenAPI schema."""
+    _, components = msgspec.json.schema_components([body_type])
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": components[body_type.__name__]}}
+        }
+    }
+
+def model_response(content: Dict[str, Any]) -> Response:
+    """
+    Encode a response holding Pydantic models with pydantic-core's serializer in one pass,
+    instead of FastAPI converting every nested model to plain dicts with jsonable_encoder first.
+    Dataclass models (Realm, Timeline) are not passed here: pydantic-core would serialize them
+    by inference and skip their field serializers, so they are embedded via to_json_bytes() instead.
+    """
+    return Response(content=pydantic_core.to_json(content), media_type="application/json")
+
+async def sse_events(chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Encode text chunks as Server-Sent Events, ending with a done (or error) event."""
+    try:
+        async for chunk in chunks:
+            # Multi-line chunks need one data field per line
+            yield "".join(f"data: {line}\n" for line in chunk.split("\n")) + "\n"
+        yield "event: done\ndata: \n\n"
+    except Exception as e:
+        yield f"event: error\ndata: {e}\n\n"
+
 # Root endpoint
+# The status payload never changes while the process runs, so it is encoded once
+ROOT_RESPONSE_BODY = orjson.dumps({
+    "message": "ChronoCore AI Engine is running",
+    "version": "1.0.0",
+    "openai_model": Config.OPENAI_MODEL,
+    "environment": os.getenv("ENVIRONMENT", "development")
+})
+
 @app.get("/")
 async def root():
     """Root endpoint to check if the API is running."""
-    return {
-        "message": "ChronoCore AI Engine is running",
-        "version": "1.0.0",
-        "openai_model": Config.OPENAI_MODEL,
-        "environment": os.getenv("ENVIRONMENT", "development")
-    }
+    return Response(content=ROOT_RESPONSE_BODY, media_type="application/json")
 
 # Story generation endpoints
 @app.post("/generate-story")
 async def generate_story(game_state: GameState):
     """Generate a story based on the current game state."""
     try:
-        story = await story_generator.generate(game_state)
+        story = await batch_scheduler.submit("generate_story", game_state)
         return {"story": story}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/generate-story/stream")
+async def stream_story(game_state: GameState):
+    """Stream a story based on the current game state as Server-Sent Events."""
+    return StreamingResponse(
+        sse_events(get_story_generator().stream(game_state)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/generate-quest")
 async def generate_quest(player: Player, game_state: GameState):
     """Generate a quest for a specific player based on their actions and game state."""
     try:
-        quest = await story_generator.generate_quest(player, game_state)
-        return {"quest": quest}
+        quest = await batch_scheduler.submit("generate_quest", (player, game_state))
+        return model_response({"quest": quest})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -115,25 +206,25 @@ async def generate_quest(player: Player, game_state: GameState):
 async def generate_ethical_dilemma(realm_id: str, game_state: GameState):
     """Generate an ethical dilemma for a specific realm."""
     try:
-        dilemma = await story_generator.generate_ethical_dilemma(realm_id, game_state)
+        dilemma = await get_story_generator().generate_ethical_dilemma(realm_id, game_state)
         return {"dilemma": dilemma}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # Decision and karma endpoints
-@app.post("/evaluate-decision")
+@app.post("/evaluate-decision", openapi_extra=msgspec_openapi(EvaluateDecisionRequest))
 async def evaluate_decision(
-    player_id: str = Body(...), 
-    decision: str = Body(...), 
-    context: dict = Body(...)
+    background_tasks: BackgroundTasks,
+    request: EvaluateDecisionRequest = Depends(msgspec_body(EvaluateDecisionRequest))
 ):
     """Evaluate a player's decision and calculate karma impact."""
+    player_id, decision, context = request.player_id, request.decision, request.context
     try:
-        evaluation = await decision_engine.evaluate(player_id, decision, context)
-        karma_impact = await karma_calculator.calculate(player_id, decision, evaluation)
+        evaluation = await get_decision_engine().evaluate(player_id, decision, context)
+        karma_impact = karma_calculator.calculate(player_id, decision, evaluation)
         
-        # Store the decision and evaluation for future reference
-        await game_data.save_player_decision(player_id, {
+        # Store the decision and evaluation for future reference after the response is sent
+        background_tasks.add_task(game_data.save_player_decision, player_id, {
             "decision": decision,
             "evaluation": evaluation,
             "karma_impact": karma_impact,
@@ -147,44 +238,38 @@ async def evaluate_decision(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/calculate-karma")
-async def calculate_karma(player_id: str = Body(...), actions: list = Body(...)):
+@app.post("/calculate-karma", openapi_extra=msgspec_openapi(CalculateKarmaRequest))
+async def calculate_karma(request: CalculateKarmaRequest = Depends(msgspec_body(CalculateKarmaRequest))):
     """Calculate karma based on a player's actions."""
     try:
-        karma = await karma_calculator.calculate_total(player_id, actions)
+        karma = karma_calculator.calculate_total(request.player_id, request.actions)
         return {"karma": karma}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 # Timeline analysis endpoints
 @app.post("/analyze-timeline")
-async def analyze_timeline(timeline_id: str = Body(...), game_state: GameState = Body(...)):
+async def analyze_timeline(request: TimelineRequest):
     """Analyze a timeline and return detailed information about its state."""
     try:
-        analysis = await timeline_analyzer.analyze_timeline(timeline_id, game_state)
+        analysis = await timeline_analyzer.analyze_timeline(request.timeline_id, request.game_state)
         return {"analysis": analysis}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/detect-paradoxes")
-async def detect_paradoxes(
-    timeline_id: str = Body(...), 
-    game_state: GameState = Body(...)
-):
+async def detect_paradoxes(request: TimelineRequest):
     """Detect potential paradoxes in a timeline."""
+    timeline_id, game_state = request.timeline_id, request.game_state
     try:
         # Find the timeline
-        timeline = None
-        for t in game_state.timelines:
-            if t.timeline_id == timeline_id:
-                timeline = t
-                break
+        timeline = game_state.get_timeline(timeline_id)
         
         if timeline is None:
             raise HTTPException(status_code=404, detail=f"Timeline with ID {timeline_id} not found")
         
         # Get realms in this timeline
-        realms = [r for r in game_state.realms if r.timeline_id == timeline_id]
+        realms = game_state.get_timeline_realms(timeline_id)
         
         paradoxes = await timeline_analyzer.detect_paradoxes(timeline, realms, game_state)
         return {"paradoxes": paradoxes}
@@ -205,38 +290,33 @@ async def generate_time_rift(game_state: GameState):
 
 # Realm management endpoints
 @app.post("/update-realm")
-async def update_realm(realm: Realm = Body(...), game_state: GameState = Body(...)):
+async def update_realm(request: RealmRequest):
     """Update a realm based on current game state and player decisions."""
     try:
-        updated_realm = await realm_manager.update_realm(realm, game_state)
-        return {"realm": updated_realm}
+        updated_realm = await realm_manager.update_realm(request.realm, request.game_state)
+        return ORJSONResponse({"realm": orjson.Fragment(updated_realm.to_json_bytes())})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/process-realm-event")
-async def process_realm_event(
-    realm: Realm = Body(...),
-    event_type: str = Body(...),
-    event_data: dict = Body(...),
-    game_state: GameState = Body(...)
-):
+async def process_realm_event(request: RealmEventRequest):
     """Process a specific event affecting a realm."""
     try:
         updated_realm, outcome = await realm_manager.process_realm_event(
-            realm, event_type, event_data, game_state
+            request.realm, request.event_type, request.event_data, request.game_state
         )
-        return {
-            "realm": updated_realm,
+        return ORJSONResponse({
+            "realm": orjson.Fragment(updated_realm.to_json_bytes()),
             "outcome": outcome
-        }
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/generate-realm-event")
-async def generate_realm_event(realm: Realm = Body(...), game_state: GameState = Body(...)):
+async def generate_realm_event(request: RealmRequest):
     """Generate a random event for a realm based on its current state."""
     try:
-        event = await realm_manager.generate_realm_event(realm, game_state)
+        event = await realm_manager.generate_realm_event(request.realm, request.game_state)
         if event:
             return {"event": event}
         else:
@@ -251,7 +331,7 @@ async def get_game(game_id: str):
     try:
         game_state = await game_data.get_game(game_id)
         if game_state:
-            return {"game_state": game_state}
+            return model_response({"game_state": game_state})
         else:
             raise HTTPException(status_code=404, detail=f"Game with ID {game_id} not found")
     except Exception as e:
@@ -270,12 +350,12 @@ async def save_game(game_state: GameState):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/game/new")
-async def create_new_game(players: List[Dict] = Body(...), settings: Dict = Body(None)):
+async def create_new_game(request: NewGameRequest):
     """Create a new game with the specified players and settings."""
     try:
-        game_state = await game_data.create_new_game(players, settings)
+        game_state = await game_data.create_new_game(request.players, request.settings)
         if game_state:
-            return {"game_state": game_state}
+            return model_response({"game_state": game_state})
         else:
             raise HTTPException(status_code=500, detail="Failed to create new game")
     except Exception as e:
@@ -287,7 +367,7 @@ async def get_player(player_id: str):
     try:
         player = await game_data.get_player(player_id)
         if player:
-            return {"player": player}
+            return model_response({"player": player})
         else:
             raise HTTPException(status_code=404, detail=f"Player with ID {player_id} not found")
     except Exception as e:
@@ -298,7 +378,7 @@ async def get_player_quests(player_id: str):
     """Get all quests for a player."""
     try:
         quests = await game_data.get_player_quests(player_id)
-        return {"quests": quests}
+        return model_response({"quests": quests})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -313,19 +393,19 @@ async def get_player_decisions(player_id: str, limit: int = 10):
 
 # Semantic search endpoints
 @app.post("/search/similar-contexts")
-async def find_similar_contexts(query: str = Body(...), top_k: int = Body(5)):
+async def find_similar_contexts(request: SimilarContextsRequest):
     """Find game contexts similar to the query."""
     try:
-        results = await embeddings_store.find_similar(query, top_k)
+        results = await embeddings_store.find_similar(request.query, request.top_k)
         return {"results": results}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/search/compare-texts")
-async def compare_texts(text_a: str = Body(...), text_b: str = Body(...)):
+@app.post("/search/compare-texts", openapi_extra=msgspec_openapi(CompareTextsRequest))
+async def compare_texts(request: CompareTextsRequest = Depends(msgspec_body(CompareTextsRequest))):
     """Compare two texts and return their similarity score."""
     try:
-        similarity = await embeddings_store.compare_texts(text_a, text_b)
+        similarity = await embeddings_store.compare_texts(request.text_a, request.text_b)
         return {"similarity": similarity}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -335,8 +415,7 @@ async def compare_texts(text_a: str = Body(...), text_b: str = Body(...)):
 async def get_prompt_categories():
     """Get available prompt template categories."""
     try:
-        categories = [cat for cat in dir(PromptTemplates) if cat.isupper()]
-        return {"categories": categories}
+        return {"categories": list(TEMPLATE_CATEGORIES)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -344,8 +423,8 @@ async def get_prompt_categories():
 async def get_prompt_templates(category: str):
     """Get prompt templates for a specific category."""
     try:
-        if hasattr(PromptTemplates, category) and category.isupper():
-            templates = getattr(PromptTemplates, category)
+        templates = TEMPLATE_CATEGORY_MAP.get(category)
+        if templates is not None:
             return {"templates": templates}
         else:
             raise HTTPException(status_code=404, detail=f"Category {category} not found")
@@ -363,14 +442,10 @@ async def get_training_examples(category: str, count: int = 5):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/training/{category}")
-async def add_training_example(
-    category: str, 
-    input_data: Dict = Body(...), 
-    output_data: Dict = Body(...)
-):
+async def add_training_example(category: str, request: TrainingExampleRequest):
     """Add a new training example."""
     try:
-        success = training_data.add_example(category, input_data, output_data)
+        success = training_data.add_example(category, request.input_data, request.output_data)
         if success:
             return {"message": f"Example added to {category} successfully"}
         else:
@@ -383,4 +458,16 @@ if __name__ == "__main__":
     port = int(os.getenv("PORT", 8000))
     
     # Run the FastAPI app with uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=port, reload=True)                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                 
\ No newline at end of file
+    if os.getenv("ENVIRONMENT") == "production":
+        # A single worker by default: karma history, game caches and the embeddings corpus
+        # live in this process, so several workers would serve inconsistent state
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=port,
+            workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+            loop="uvloop",
+            http="httptools"
+        )
+    else:
+        uvicorn.run("main:app", host="0.0.0.0", port=port, reload=True)                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                 
\ No newline at end of file
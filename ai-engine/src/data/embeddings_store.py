@@ -5,32 +5,406 @@ Manages storage and retrieval of vector embeddings for semantic search and simil
 
 import os
 import json
+import hashlib
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+import time
+from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
 
-from ..utils.embeddings import get_embedding, cosine_similarity
-from ..utils.database import store_vector, query_vectors
+from ..utils.embeddings import get_embeddings_batch, normalize, cosine_similarity_prenorm
+from ..utils.embeddings_numba import cosine_scores, warm_up as warm_up_kernels
+from ..utils.database import store_vectors, query_vectors
 from ..utils.config import Config
+from ..utils.query_cache import QueryCache
+from ..services.batch_scheduler import BatchScheduler
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _match_field(match: Any, name: str) -> Any:
+    """Read a field from a vector database match, which may be a dict or a result object."""
+    if isinstance(match, dict):
+        return match.get(name)
+    return getattr(match, name, None)
+
 class EmbeddingsStore:
     """
     Manages storage and retrieval of vector embeddings for the ChronoCore AI engine.
     Provides an abstraction layer over the vector database (Pinecone).
     """
     
-    def __init__(self):
-        """Initialize the embeddings store."""
-        self.cache = {}  # Local cache for frequently accessed embeddings
+    # Number of corpus rows upcast to float32 per matrix-vector product
+    CORPUS_BLOCK_SIZE = 4096
+    
+    def __init__(self, corpus_dir: str = None):
+        """
+        Initialize the embeddings store.
+        
+        Args:
+            corpus_dir: Directory holding the precomputed corpus (defaults to src/data/embeddings)
+        """
+        # Local cache of stored embeddings as parallel arrays: unit-length rows (grown by
+        # doubling), their IDs and metadata, and each ID's row. Rows are int8 with a
+        # per-row scale, or float16 when Config.EMBEDDING_CACHE_DTYPE is "float16".
+        self.cache_dtype = np.float16 if Config.EMBEDDING_CACHE_DTYPE == "float16" else np.int8
+        self.cache_matrix = None
+        self.cache_scales = None
+        self.cache_ids = []
+        self.cache_metadata = []
+        self.cache_rows = {}
+        
+        # Precomputed corpus of unit-length float16 embeddings, memory-mapped from disk
+        self.corpus_dir = corpus_dir or os.path.join(os.path.dirname(__file__), "embeddings")
+        self.corpus = None
+        self.corpus_ids = []
+        self.corpus_metadata = []
+        
+        # Recent find_similar results, cleared whenever the searchable embeddings change
+        self.query_cache = QueryCache()
+        
+        # Coalesce concurrent query embeddings into a single embeddings API call
+        self.query_batcher = BatchScheduler(max_wait_ms=Config.EMBEDDING_BATCH_WAIT_MS)
+        self.query_batcher.register("embed_query", self.embed_batch)
+        
+        # Coalesce concurrent writes into one embeddings API call and one vector upsert
+        self.write_batcher = BatchScheduler(
+            max_batch=Config.EMBEDDING_WRITE_BATCH_SIZE,
+            max_wait_ms=Config.EMBEDDING_WRITE_WAIT_MS
+        )
+        self.write_batcher.register("store_embedding", self._store_batch)
+    
+    async def start(self) -> None:
+        """Start batching query embeddings and writes."""
+        await self.query_batcher.start()
+        await self.write_batcher.start()
+    
+    async def flush(self) -> None:
+        """Store all pending embedding writes."""
+        await self.write_batcher.flush()
+    
+    async def stop(self) -> None:
+        """Store pending writes, then stop batching query embeddings and writes."""
+        await self.flush()
+        await self.write_batcher.stop()
+        await self.query_batcher.stop()
+    
+    def warm_up(self) -> None:
+        """Compile the similarity kernels ahead of the first request."""
+        warm_up_kernels()
+    
+    # Manifest naming the matrix and index files of the current corpus version
+    CORPUS_MANIFEST = "corpus.manifest.json"
+    
+    # Unreferenced corpus files older than this are removed when a new version is saved
+    STALE_CORPUS_SECONDS = 300
+    
+    def load_corpus(self) -> bool:
+        """
+        Memory-map the precomputed corpus embeddings from disk.
+        The manifest names one matrix/index pair, so the two always come from the same save.
+        
+        Returns:
+            True if a corpus was loaded, False otherwise
+        """
+        manifest_path = os.path.join(self.corpus_dir, self.CORPUS_MANIFEST)
+        
+        if not os.path.exists(manifest_path):
+            logger.info(f"No precomputed embeddings corpus found in {self.corpus_dir}")
+            return False
+        
+        try:
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+            
+            with open(os.path.join(self.corpus_dir, manifest["index"]), 'r') as f:
+                index = json.load(f)
+            
+            corpus = np.load(os.path.join(self.corpus_dir, manifest["matrix"]), mmap_mode="r")
+            
+            if (corpus.dtype != np.float16 or corpus.ndim != 2
+                    or corpus.shape[0] != manifest["rows"] or len(index["ids"]) != manifest["rows"]):
+                logger.error(f"Embeddings corpus in {self.corpus_dir} does not match its manifest")
+                return False
+            
+            self.corpus = corpus
+            self.corpus_ids = index["ids"]
+            self.corpus_metadata = index["metadata"]
+            self.query_cache.invalidate_all()
+            logger.info(f"Loaded embeddings corpus with {corpus.shape[0]} vectors of dimension {corpus.shape[1]}")
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error loading embeddings corpus: {e}")
+            return False
+    
+    def save_corpus(self) -> bool:
+        """
+        Write the corpus and all cached embeddings to disk as a float16 matrix.
+        Vectors are L2-normalized before writing so that search is a single dot product.
+        
+        The matrix and index are written under a new version name and published by atomically
+        replacing the manifest, so concurrent savers never mix one's matrix with another's index.
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        # Cached embeddings replace corpus rows with the same ID
+        rows = {}
+        if self.corpus is not None:
+            for i, id in enumerate(self.corpus_ids):
+                rows[id] = (self.corpus[i], self.corpus_metadata[i])
+        for row, id in enumerate(self.cache_ids):
+            rows[id] = (self._cached_vector(row), self.cache_metadata[row])
+        
+        if not rows:
+            return False
+        
+        try:
+            matrix = np.asarray([vector for vector, _ in rows.values()], dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix /= np.where(norms == 0, 1.0, norms)
+            
+            os.makedirs(self.corpus_dir, exist_ok=True)
+            
+            # New files never overwrite a file another process may have memory-mapped
+            version = f"{os.getpid()}-{time.time_ns()}"
+            matrix_name = f"corpus.{version}.f16.npy"
+            index_name = f"corpus.{version}.json"
+            with open(os.path.join(self.corpus_dir, matrix_name), 'wb') as f:
+                np.save(f, matrix.astype(np.float16))
+            with open(os.path.join(self.corpus_dir, index_name), 'w') as f:
+                json.dump({
+                    "ids": list(rows.keys()),
+                    "metadata": [metadata for _, metadata in rows.values()]
+                }, f, default=str)
+            
+            manifest_path = os.path.join(self.corpus_dir, self.CORPUS_MANIFEST)
+            with open(f"{manifest_path}.{os.getpid()}.tmp", 'w') as f:
+                json.dump({"matrix": matrix_name, "index": index_name, "rows": len(rows)}, f)
+            os.replace(f"{manifest_path}.{os.getpid()}.tmp", manifest_path)
+            
+            self._remove_stale_corpus_files({matrix_name, index_name})
+            
+            logger.info(f"Saved embeddings corpus with {len(rows)} vectors")
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error saving embeddings corpus: {e}")
+            return False
+    
+    def _remove_stale_corpus_files(self, keep: set) -> None:
+        """
+        Remove corpus versions superseded by the manifest.
+        Recent files are left alone since another process may be about to publish them.
+        
+        Args:
+            keep: Names of the files referenced by the current manifest
+        """
+        cutoff = time.time() - self.STALE_CORPUS_SECONDS
+        
+        for name in os.listdir(self.corpus_dir):
+            if name in keep or not name.startswith("corpus.") or not name.endswith((".f16.npy", ".json")):
+                continue
+            if name == self.CORPUS_MANIFEST:
+                continue
+            
+            path = os.path.join(self.corpus_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+    
+    def _search_corpus(self, query_embedding: List[float], top_k: int) -> List[Dict]:
+        """
+        Find the corpus vectors most similar to a query embedding.
+        
+        Args:
+            query_embedding: The query vector
+            top_k: Number of results to return
+            
+        Returns:
+            List of matches with their IDs, metadata and similarity scores
+        """
+        return self._search_matrix(self.corpus, self.corpus_ids, self.corpus_metadata, query_embedding, top_k)
+    
+    def find_similar_local(self, query_embedding: List[float], top_k: int = 5) -> List[Dict]:
+        """
+        Find the cached embeddings most similar to a query embedding.
+        
+        Args:
+            query_embedding: The query vector
+            top_k: Number of results to return
+            
+        Returns:
+            List of matches with their IDs, metadata and similarity scores
+        """
+        if not self.cache_ids:
+            return []
+        
+        size = len(self.cache_ids)
+        scales = self.cache_scales[:size] if self.cache_scales is not None else None
+        return self._search_matrix(
+            self.cache_matrix[:size], self.cache_ids, self.cache_metadata, query_embedding, top_k, scales
+        )
+    
+    def _search_matrix(self, matrix: np.ndarray, ids: List[str], metadata: List[Dict],
+                       query_embedding: List[float], top_k: int,
+                       scales: Optional[np.ndarray] = None) -> List[Dict]:
+        """
+        Find the rows of a unit-length matrix most similar to a query embedding.
+        
+        Args:
+            matrix: Matrix of unit-length float16 (or scaled int8) vectors, one per row
+            ids: ID of each row
+            metadata: Metadata of each row
+            query_embedding: The query vector
+            top_k: Number of results to return
+            scales: Per-row scale of a quantized matrix
+            
+        Returns:
+            List of matches with their IDs, metadata and similarity scores
+        """
+        query = normalize(query_embedding)
+        
+        # Upcast the matrix block by block so BLAS can be used without copying it whole
+        scores = np.empty(matrix.shape[0], dtype=np.float32)
+        for start in range(0, matrix.shape[0], self.CORPUS_BLOCK_SIZE):
+            block = matrix[start:start + self.CORPUS_BLOCK_SIZE]
+            scores[start:start + len(block)] = block.astype(np.float32) @ query
+        
+        if scales is not None:
+            scores *= scales
+        
+        top_k = min(top_k, len(scores))
+        if top_k <= 0:
+            return []
+        
+        top = np.argpartition(scores, -top_k)[-top_k:]
+        top = top[np.argsort(scores[top])[::-1]]
+        
+        return [
+            {
+                "id": ids[i],
+                "score": float(scores[i]),
+                "metadata": metadata[i]
+            }
+            for i in top
+        ]
+    
+    def rerank(self, candidates: List[Any], query_embedding: List[float], top_k: int) -> List[Dict]:
+        """
+        Rescore vector database matches by exact cosine similarity to a query embedding.
+        
+        Args:
+            candidates: Matches returned with their vector values
+            query_embedding: The query vector
+            top_k: Number of results to return
+            
+        Returns:
+            List of matches with their IDs, metadata and similarity scores
+        """
+        candidates = [c for c in candidates if _match_field(c, "values")]
+        top_k = min(top_k, len(candidates))
+        if top_k <= 0:
+            return []
+        
+        matrix = np.asarray([_match_field(c, "values") for c in candidates], dtype=np.float32)
+        query = normalize(query_embedding)
+        
+        scores = np.empty(len(candidates), dtype=np.float32)
+        cosine_scores(matrix, query, scores)
+        
+        top = np.argpartition(scores, -top_k)[-top_k:]
+        top = top[np.argsort(scores[top])[::-1]]
+        
+        return [
+            {
+                "id": _match_field(candidates[i], "id"),
+                "score": float(scores[i]),
+                "metadata": _match_field(candidates[i], "metadata") or {}
+            }
+            for i in top
+        ]
+    
+    def _cache_embedding(self, id: str, embedding: List[float], metadata: Dict) -> None:
+        """
+        Add an embedding to the local cache, replacing any cached embedding with the same ID.
+        
+        Args:
+            id: Unique identifier for the embedding
+            embedding: The embedding vector
+            metadata: Metadata stored with the embedding
+        """
+        # Normalize once on insertion so every later comparison is a plain dot product
+        vector = normalize(embedding)
+        
+        row = self.cache_rows.get(id)
+        if row is None:
+            row = len(self.cache_ids)
+            
+            # Allocate on first insert and double the capacity when full
+            if self.cache_matrix is None:
+                self.cache_matrix = np.empty((64, len(vector)), dtype=self.cache_dtype)
+                if self.cache_dtype == np.int8:
+                    self.cache_scales = np.empty(64, dtype=np.float32)
+            elif row == self.cache_matrix.shape[0]:
+                grown = np.empty((2 * row, self.cache_matrix.shape[1]), dtype=self.cache_dtype)
+                grown[:row] = self.cache_matrix
+                self.cache_matrix = grown
+                if self.cache_scales is not None:
+                    self.cache_scales = np.concatenate([self.cache_scales, np.empty(row, dtype=np.float32)])
+            
+            self.cache_ids.append(id)
+            self.cache_metadata.append(metadata)
+            self.cache_rows[id] = row
+        else:
+            self.cache_metadata[row] = metadata
+        
+        if self.cache_scales is not None:
+            # Symmetric int8 quantization with one scale per row
+            scale = float(np.abs(vector).max()) / 127 or 1.0
+            self.cache_matrix[row] = np.round(vector / scale).astype(np.int8)
+            self.cache_scales[row] = scale
+        else:
+            self.cache_matrix[row] = vector
+    
+    def _cached_vector(self, row: int) -> np.ndarray:
+        """
+        Get a cached embedding as a float32 vector.
+        
+        Args:
+            row: Row of the embedding in the cache
+            
+        Returns:
+            The unit-length embedding, dequantized if needed
+        """
+        vector = self.cache_matrix[row].astype(np.float32)
+        if self.cache_scales is not None:
+            vector *= self.cache_scales[row]
+        return vector
+    
+    async def embed_batch(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """
+        Generate embeddings for several texts with a single embeddings API call.
+        
+        Args:
+            texts: Texts to generate embeddings for
+            
+        Returns:
+            An embedding for each text, in the same order (None for all if generation failed)
+        """
+        embeddings = await get_embeddings_batch(texts)
+        
+        if embeddings is None:
+            return [None] * len(texts)
+        
+        return embeddings
     
     async def store_embedding(self, id: str, text: str, metadata: Dict) -> bool:
         """
         Generate an embedding for text and store it in the vector database.
+        Concurrent calls are batched into a single embeddings request and upsert.
         
         Args:
             id: Unique identifier for the embedding
@@ -41,27 +415,68 @@ class EmbeddingsStore:
             True if successful, False otherwise
         """
         try:
-            # Generate embedding
-            embedding = await get_embedding(text)
+            return await self.write_batcher.submit("store_embedding", (id, text, metadata))
+        
+        except Exception as e:
+            logger.error(f"Error storing embedding: {e}")
+            return False
+    
+    async def store_embeddings_bulk(self, items: List[Tuple[str, str, Dict]]) -> bool:
+        """
+        Generate embeddings for several texts and store them with a single embeddings
+        API call and a single vector database upsert.
+        
+        Args:
+            items: List of (id, text, metadata) tuples
             
-            if embedding is None:
-                logger.error(f"Failed to generate embedding for text: {text[:50]}...")
-                return False
+        Returns:
+            True if successful, False otherwise
+        """
+        if not items:
+            return True
+        
+        results = await self._store_batch(items)
+        
+        return all(results)
+    
+    async def _store_batch(self, items: List[Tuple[str, str, Dict]]) -> List[bool]:
+        """
+        Generate and store embeddings for a batch of texts.
+        
+        Args:
+            items: List of (id, text, metadata) tuples
+            
+        Returns:
+            Whether each item was stored, in the same order
+        """
+        try:
+            # Generate all embeddings in one request
+            embeddings = await self.embed_batch([text for _, text, _ in items])
+            
+            if any(embedding is None for embedding in embeddings):
+                logger.error(f"Failed to generate embeddings for {len(items)} texts")
+                return [False] * len(items)
             
             # Store in cache
-            self.cache[id] = {
-                "embedding": embedding,
-                "metadata": metadata
-            }
+            for (id, _, metadata), embedding in zip(items, embeddings):
+                self._cache_embedding(id, embedding, metadata)
+            self.query_cache.invalidate_all()
             
             # Store in vector database
-            success = await store_vector(id, embedding, metadata)
+            try:
+                success = await store_vectors([
+                    (id, embedding, metadata)
+                    for (id, _, metadata), embedding in zip(items, embeddings)
+                ])
+            finally:
+                # Searches that ran during the upsert may have cached results from before it
+                self.query_cache.invalidate_all()
             
-            return success
+            return [success] * len(items)
         
         except Exception as e:
-            logger.error(f"Error storing embedding: {e}")
-            return False
+            logger.error(f"Error storing embeddings: {e}")
+            return [False] * len(items)
     
     async def find_similar(self, query_text: str, top_k: int = 5) -> List[Dict]:
         """
@@ -75,22 +490,81 @@ class EmbeddingsStore:
             List of similar items with their metadata and similarity scores
         """
         try:
-            # Generate embedding for query
-            query_embedding = await get_embedding(query_text)
+            # Serve repeated queries without re-embedding or re-searching
+            cache_key = (hashlib.sha1(query_text.encode()).digest(), top_k)
+            cached_results = self.query_cache.get(cache_key)
+            if cached_results is not None:
+                return list(cached_results)
+            
+            # Generate embedding for query, batched with other concurrent queries
+            query_embedding = await self.query_batcher.submit("embed_query", query_text)
             
             if query_embedding is None:
                 logger.error(f"Failed to generate embedding for query: {query_text[:50]}...")
                 return []
             
-            # Query vector database
-            results = await query_vectors(query_embedding, top_k)
+            # The shared vector database holds writes from every worker and instance, so it is
+            # searched first; this process's embeddings are only scanned when it has no answer
+            if Config.RERANK_OVERSAMPLE > 1:
+                # Fetch a wider candidate set and rerank it locally by exact cosine similarity
+                candidates = await query_vectors(query_embedding, top_k * Config.RERANK_OVERSAMPLE, include_values=True)
+                results = self.rerank(candidates, query_embedding, top_k)
+            else:
+                results = [
+                    {
+                        "id": _match_field(match, "id"),
+                        "score": _match_field(match, "score"),
+                        "metadata": _match_field(match, "metadata") or {}
+                    }
+                    for match in await query_vectors(query_embedding, top_k)
+                ]
+            
+            if not results:
+                # The vector database is unavailable (query_vectors returns nothing on errors)
+                results = self._search_local(query_embedding, top_k)
+            
+            # Empty results may come from a vector database error, so they are not cached
+            if results:
+                self.query_cache.put(cache_key, results)
             
-            return results
+            return list(results)
         
         except Exception as e:
             logger.error(f"Error finding similar items: {e}")
             return []
     
+    def _search_local(self, query_embedding: List[float], top_k: int) -> List[Dict]:
+        """
+        Search this process's embeddings when the vector database cannot be used.
+        For an ID found in both, embeddings cached since startup win over the (possibly older)
+        precomputed corpus.
+        
+        Args:
+            query_embedding: The query vector
+            top_k: Number of results to return
+            
+        Returns:
+            List of matches with their IDs, metadata and similarity scores
+        """
+        local = self.find_similar_local(query_embedding, top_k)
+        if self.corpus is None:
+            return local
+        
+        merged = {result["id"]: result for result in local}
+        for result in self._search_corpus(query_embedding, top_k + len(merged)):
+            merged.setdefault(result["id"], result)
+        
+        return sorted(merged.values(), key=lambda result: result["score"], reverse=True)[:top_k]
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get query cache statistics.
+        
+        Returns:
+            Dictionary with size, hits, misses, evictions and hit rate
+        """
+        return self.query_cache.get_stats()
+    
     async def compare_texts(self, text_a: str, text_b: str) -> float:
         """
         Compare two texts and return their similarity score.
@@ -103,16 +577,15 @@ class EmbeddingsStore:
             Similarity score between 0 and 1
         """
         try:
-            # Generate embeddings
-            embedding_a = await get_embedding(text_a)
-            embedding_b = await get_embedding(text_b)
+            # Generate both embeddings in one request
+            embedding_a, embedding_b = await self.embed_batch([text_a, text_b])
             
             if embedding_a is None or embedding_b is None:
                 logger.error("Failed to generate embeddings for comparison")
                 return 0.0
             
             # Calculate similarity
-            similarity = cosine_similarity(embedding_a, embedding_b)
+            similarity = cosine_similarity_prenorm(normalize(embedding_a), normalize(embedding_b))
             
             return similarity
         
@@ -133,15 +606,15 @@ class EmbeddingsStore:
         """
         try:
             # Create a combined text representation of the game context
-            context_text = f"""
-            Game ID: {game_id}
-            Current Era: {context.get('current_era', 'Unknown')}
-            Players: {', '.join([p.get('name', 'Unknown') for p in context.get('players', [])])}
-            Timelines: {len(context.get('timelines', []))}
-            Realms: {len(context.get('realms', []))}
-            Global Karma: {context.get('global_karma', 0)}
-            Recent Events: {'; '.join([e.get('description', '') for e in context.get('events_history', [])[-5:]])}
-            """
+            context_text = "\n".join((
+                f"Game ID: {game_id}",
+                f"Current Era: {context.get('current_era', 'Unknown')}",
+                "Players: " + ", ".join(p.get('name', 'Unknown') for p in context.get('players', ())),
+                f"Timelines: {len(context.get('timelines', ()))}",
+                f"Realms: {len(context.get('realms', ()))}",
+                f"Global Karma: {context.get('global_karma', 0)}",
+                "Recent Events: " + "; ".join(e.get('description', '') for e in context.get('events_history', ())[-5:])
+            ))
             
             # Store embedding
             success = await self.store_embedding(
@@ -175,12 +648,7 @@ class EmbeddingsStore:
             results = await self.find_similar(query, top_k)
             
             # Filter for game contexts only
-            game_contexts = [
-                result for result in results
-                if result.get('metadata', {}).get('type') == 'game_context'
-            ]
-            
-            return game_contexts
+            return [result for result in results if result.get('metadata', {}).get('type') == 'game_context']
         
         except Exception as e:
             logger.error(f"Error finding relevant game contexts: {e}")
@@ -5,10 +5,12 @@ Manages game-specific data and provides utilities for game state management.
 
 import os
 import json
+import time
 import logging
 import asyncio
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+from cachetools import LRUCache, TTLCache
 
 from ..utils.database import (
     save_game_state, get_game_state,
@@ -21,7 +23,8 @@ from ..models.game_state import GameState
 from ..models.player import Player
 from ..models.quest import Quest
 from ..models.timeline import Timeline
-from ..models.realm import Realm
+from ..models.realm import REALM_ADAPTER
+from ..utils.config import Config
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -35,11 +38,55 @@ class GameData:
     
     def __init__(self):
         """Initialize the game data manager."""
-        self.cache = {
-            "game_states": {},
-            "players": {},
-            "quests": {},
-            "decisions": {}
+        self.cache = self._create_cache()
+        self.cache_stats = {name: {"hits": 0, "misses": 0} for name in self.cache}
+    
+    def _create_cache(self) -> Dict[str, Any]:
+        """
+        Create empty caches, each bounded to Config.CACHE_MAX_SIZE entries.
+        Game states, players and player quest lists also expire after Config.CACHE_TTL_SECONDS;
+        quests and decisions are evicted least-recently-used.
+        
+        Returns:
+            Dictionary of caches keyed by data type
+        """
+        return {
+            "game_states": TTLCache(maxsize=Config.CACHE_MAX_SIZE, ttl=Config.CACHE_TTL_SECONDS),
+            "players": TTLCache(maxsize=Config.CACHE_MAX_SIZE, ttl=Config.CACHE_TTL_SECONDS),
+            "player_quests": TTLCache(maxsize=Config.CACHE_MAX_SIZE, ttl=Config.CACHE_TTL_SECONDS),
+            "quests": LRUCache(maxsize=Config.CACHE_MAX_SIZE),
+            "decisions": LRUCache(maxsize=Config.CACHE_MAX_SIZE)
+        }
+    
+    def _get_cached(self, name: str, key: str) -> Optional[Any]:
+        """
+        Get a value from a cache, counting the hit or miss.
+        
+        Args:
+            name: Name of the cache (e.g., "players")
+            key: Key of the cached value
+            
+        Returns:
+            The cached value or None if it is not cached
+        """
+        value = self.cache[name].get(key)
+        self.cache_stats[name]["hits" if value is not None else "misses"] += 1
+        return value
+    
+    def get_cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get hit, miss and size counts for each cache.
+        
+        Returns:
+            Dictionary of statistics keyed by cache name
+        """
+        return {
+            name: {
+                **counts,
+                "size": len(self.cache[name]),
+                "hit_rate": counts["hits"] / (counts["hits"] + counts["misses"]) if counts["hits"] + counts["misses"] else 0.0
+            }
+            for name, counts in self.cache_stats.items()
         }
     
     async def get_game(self, game_id: str) -> Optional[GameState]:
@@ -53,8 +100,9 @@ class GameData:
             GameState object or None if not found
         """
         # Check cache first
-        if game_id in self.cache["game_states"]:
-            return self.cache["game_states"][game_id]
+        cached = self._get_cached("game_states", game_id)
+        if cached is not None:
+            return cached
         
         # Get from database
         game_data = await get_game_state(game_id)
@@ -64,8 +112,8 @@ class GameData:
             return None
         
         try:
-            # Convert to GameState object
-            game_state = GameState(**game_data)
+            # Convert to GameState object (stored by save_game, so validation is skipped)
+            game_state = GameState.from_stored(game_data)
             
             # Cache for future use
             self.cache["game_states"][game_id] = game_state
@@ -88,7 +136,7 @@ class GameData:
         """
         try:
             # Convert to dictionary
-            game_data = game_state.dict()
+            game_data = game_state.model_dump()
             
             # Update cache
             self.cache["game_states"][game_state.game_id] = game_state
@@ -113,8 +161,9 @@ class GameData:
             Player object or None if not found
         """
         # Check cache first
-        if player_id in self.cache["players"]:
-            return self.cache["players"][player_id]
+        cached = self._get_cached("players", player_id)
+        if cached is not None:
+            return cached
         
         # Get from database
         player_data = await get_player(player_id)
@@ -124,8 +173,8 @@ class GameData:
             return None
         
         try:
-            # Convert to Player object
-            player = Player(**player_data)
+            # Convert to Player object (stored by save_player, so validation is skipped)
+            player = Player.from_stored(player_data)
             
             # Cache for future use
             self.cache["players"][player_id] = player
@@ -148,7 +197,7 @@ class GameData:
         """
         try:
             # Convert to dictionary
-            player_data = player.dict()
+            player_data = player.model_dump()
             
             # Update cache
             self.cache["players"][player.player_id] = player
@@ -173,8 +222,9 @@ class GameData:
             Quest object or None if not found
         """
         # Check cache first
-        if quest_id in self.cache["quests"]:
-            return self.cache["quests"][quest_id]
+        cached = self._get_cached("quests", quest_id)
+        if cached is not None:
+            return cached
         
         # Get from database
         quest_data = await get_quest(quest_id)
@@ -208,10 +258,11 @@ class GameData:
         """
         try:
             # Convert to dictionary
-            quest_data = quest.dict()
+            quest_data = quest.model_dump()
             
             # Update cache
             self.cache["quests"][quest.quest_id] = quest
+            self.cache["player_quests"].pop(quest.player_id, None)
             
             # Save to database
             success = await save_quest(quest_data)
@@ -232,6 +283,11 @@ class GameData:
         Returns:
             List of Quest objects
         """
+        # Check cache first
+        cached = self._get_cached("player_quests", player_id)
+        if cached is not None:
+            return list(cached)
+        
         # Get from database
         quest_data_list = await get_player_quests(player_id)
         
@@ -249,7 +305,10 @@ class GameData:
             except Exception as e:
                 logger.error(f"Error converting quest data to Quest: {e}")
         
-        return quests
+        # Cache for future use
+        self.cache["player_quests"][player_id] = quests
+        
+        return list(quests)
     
     async def save_player_decision(self, player_id: str, decision: Dict) -> bool:
         """
@@ -309,16 +368,12 @@ class GameData:
         """
         try:
             # Generate a unique game ID
-            game_id = f"game_{datetime.now().strftime('%Y%m%d%H%M%S')}_{len(players)}"
+            game_id = f"game_{time.time_ns():x}_{len(players)}"
+            
+            now = datetime.now()
             
             # Create player objects
-            player_objects = []
-            for player_data in players:
-                player = Player(**player_data)
-                player_objects.append(player)
-                
-                # Save player to database
-                await self.save_player(player)
+            player_objects = [Player(**player_data) for player_data in players]
             
             # Create initial timelines
             timelines = [
@@ -333,29 +388,34 @@ class GameData:
                 for i in range(3)  # Start with 3 timelines
             ]
             
-            # Create initial realms
+            # Create initial realms (start with 9), staging the per-realm fields as columns
+            # and validating plain dicts in one pass through the realm adapter
+            realm_count = 9
+            realm_defaults = {
+                "owner_id": None,  # Initially unowned
+                "development_level": 1,
+                "technology_focus": "Balanced",
+                "ethical_alignment": 0,
+                "resources": 50,
+                "population": 1000000,
+                "description": "A developing realm with moderate resources and a growing population."
+            }
+            realm_ids = [f"realm_{i}" for i in range(realm_count)]
+            realm_names = [f"Realm {i+1}" for i in range(realm_count)]
+            realm_timeline_ids = [f"timeline_{i//3}" for i in range(realm_count)]  # Distribute across timelines
+            
+            validate_realm = REALM_ADAPTER.validate_python
             realms = [
-                Realm(
-                    realm_id=f"realm_{i}",
-                    name=f"Realm {i+1}",
-                    owner_id=None,  # Initially unowned
-                    timeline_id=f"timeline_{i//3}",  # Distribute across timelines
-                    development_level=1,
-                    technology_focus="Balanced",
-                    ethical_alignment=0,
-                    resources=50,
-                    population=1000000,
-                    description=f"A developing realm with moderate resources and a growing population."
-                )
-                for i in range(9)  # Start with 9 realms
+                validate_realm({**realm_defaults, "realm_id": realm_id, "name": name, "timeline_id": timeline_id})
+                for realm_id, name, timeline_id in zip(realm_ids, realm_names, realm_timeline_ids)
             ]
             
             # Add realm IDs to timelines
+            timelines_by_id = {timeline.timeline_id: timeline for timeline in timelines}
             for realm in realms:
-                timeline_id = realm.timeline_id
-                for timeline in timelines:
-                    if timeline.timeline_id == timeline_id:
-                        timeline.realms.append(realm.realm_id)
+                timeline = timelines_by_id.get(realm.timeline_id)
+                if timeline is not None:
+                    timeline.realms.add(realm.realm_id)
             
             # Create game state
             game_state = GameState(
@@ -369,8 +429,8 @@ class GameData:
                 events_history=[],
                 global_karma=0,
                 time_rifts=[],
-                created_at=datetime.now(),
-                updated_at=datetime.now()
+                created_at=now,
+                updated_at=now
             )
             
             # Apply custom settings if provided
@@ -379,10 +439,19 @@ class GameData:
                     if hasattr(game_state, key):
                         setattr(game_state, key, value)
             
-            # Save game state
-            success = await self.save_game(game_state)
+            # Save players and game state concurrently
+            *player_results, success = await asyncio.gather(
+                *(self.save_player(player) for player in player_objects),
+                self.save_game(game_state),
+                return_exceptions=True
+            )
+            
+            # A failed player save is logged but does not abort game creation
+            for player, result in zip(player_objects, player_results):
+                if result is not True:
+                    logger.error(f"Failed to save player {player.player_id}: {result}")
             
-            if success:
+            if success is True:
                 return game_state
             else:
                 logger.error(f"Failed to save new game state")
@@ -394,10 +463,5 @@ class GameData:
     
     def clear_cache(self) -> None:
         """Clear the cache."""
-        self.cache = {
-            "game_states": {},
-            "players": {},
-            "quests": {},
-            "decisions": {}
-        }
+        self.cache = self._create_cache()
         logger.info("Cache cleared")
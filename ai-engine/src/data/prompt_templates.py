@@ -3,21 +3,57 @@ Prompt Templates
 Contains templates for various AI prompts used in the ChronoCore game.
 """
 
-from typing import Dict, Any, List
+from typing import Callable, Dict, Any, List, Optional, Tuple
 import json
 import os
+import string
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def compile_format_template(template: str) -> Optional[Callable[[Dict[str, Any]], str]]:
+    """
+    Compile a str.format template into a render function.
+    The template is parsed a single time and turned into a function that joins its
+    literal text with the formatted variables, so rendering never re-parses it.
+    
+    Args:
+        template: Template string using str.format placeholders
+        
+    Returns:
+        A function rendering the template from a dict of variables, or None if the template
+        uses fields that cannot be compiled (attribute, index, conversion or nested fields),
+        in which case callers should fall back to str.format
+    """
+    parts = []
+    for literal, field_name, format_spec, conversion in string.Formatter().parse(template):
+        if literal:
+            parts.append(repr(literal))
+        if field_name is None:
+            continue
+        if not field_name.isidentifier() or conversion or "{" in (format_spec or ""):
+            return None
+        parts.append(f"format(variables[{field_name!r}], {format_spec or ''!r})")
+    
+    namespace = {}
+    exec(f"def render(variables):\n    return ''.join(({', '.join(parts) or repr('')},))", namespace)
+    return namespace["render"]
+
+
 class PromptTemplates:
     """
     Manages prompt templates for the ChronoCore AI engine.
     Templates are used for consistent AI-generated content across the game.
     """
     
+    # Templates keyed by (category, template name), filled in once the class is defined
+    _registry: Dict[Tuple[str, str], str] = {}
+    
+    # Compiled render functions keyed by (category, template name)
+    _compiled: Dict[Tuple[str, str], Optional[Callable[[Dict], str]]] = {}
+    
     # Story generation templates
     STORY_GENERATION = {
         "world_description": """
@@ -219,11 +255,38 @@ class PromptTemplates:
         Returns:
             The template string or empty string if not found
         """
-        try:
-            return cls.__dict__[category][template_name]
-        except (KeyError, TypeError):
+        template = cls._registry.get((category, template_name))
+        
+        if template is None:
             logger.error(f"Template not found: {category}.{template_name}")
             return ""
+        
+        return template
+    
+    @classmethod
+    def compile_template(cls, category: str, template_name: str) -> Optional[Callable[[Dict], str]]:
+        """
+        Compile a template into a render function, once per template.
+        The template is parsed a single time and turned into a function that joins its
+        literal text with the formatted variables, so rendering never re-parses it.
+        
+        Args:
+            category: Category of the template
+            template_name: Name of the specific template
+            
+        Returns:
+            A function rendering the template from a dict of variables, or None if the
+            template does not exist or uses fields that cannot be compiled
+        """
+        key = (category, template_name)
+        if key in cls._compiled:
+            return cls._compiled[key]
+        
+        template = cls.get_template(category, template_name)
+        render = compile_format_template(template) if template else None
+        
+        cls._compiled[key] = render
+        return render
     
     @classmethod
     def format_template(cls, category: str, template_name: str, **kwargs) -> str:
@@ -244,6 +307,9 @@ class PromptTemplates:
             return ""
         
         try:
+            render = cls.compile_template(category, template_name)
+            if render is not None:
+                return render(kwargs)
             return template.format(**kwargs)
         except KeyError as e:
             logger.error(f"Missing variable in template formatting: {e}")
@@ -251,3 +317,13 @@ class PromptTemplates:
         except Exception as e:
             logger.error(f"Error formatting template: {e}")
             return template
+
+
+# Template categories, computed once at import
+TEMPLATE_CATEGORIES = tuple(sorted(name for name in vars(PromptTemplates) if name.isupper()))
+TEMPLATE_CATEGORY_MAP = {name: getattr(PromptTemplates, name) for name in TEMPLATE_CATEGORIES}
+PromptTemplates._registry = {
+    (category, name): template
+    for category, templates in TEMPLATE_CATEGORY_MAP.items()
+    for name, template in templates.items()
+}
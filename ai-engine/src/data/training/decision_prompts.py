@@ -3,29 +3,16 @@ Decision Prompts Module
 Contains templates for generating decision evaluations and consequences
 """
 
-from typing import Dict, Any
+from typing import Any, Callable, Dict, List, Tuple
 
-# Decision evaluation prompt template
-DECISION_EVALUATION_TEMPLATE = """
+from ..prompt_templates import compile_format_template
+
+# Decision evaluation prompt template, split into a static prefix shared by every request
+# and a short suffix holding the request-specific fields, so providers can cache the prefix
+DECISION_EVALUATION_PREFIX = """
 You are the AI engine for ChronoCore: Path of Realities, a game about time manipulation and ethical choices.
 Your task is to evaluate a player's decision and generate its impact on the game world.
 
-## Player Information
-- Player ID: {player_id}
-- Player Role: {player_role}
-- Current Karma: {player_karma}
-
-## Game Context
-- Current Era: {current_era}
-- Current Turn: {current_turn}
-- Timeline Stability: {timeline_stability}%
-
-## Decision Context
-{context}
-
-## Player's Decision
-{decision}
-
 ## Evaluation Instructions
 1. Analyze the ethical implications of this decision
 2. Determine technological impact on affected realms
@@ -36,7 +23,7 @@ Your task is to evaluate a player's decision and generate its impact on the game
 ## Response Format
 Provide your evaluation in the following JSON format:
 ```
-{
+{{
   "ethical_impact": "Detailed explanation of ethical implications",
   "technological_impact": "Explanation of how this affects technology in relevant realms",
   "temporal_impact": "Description of timeline stability effects",
@@ -44,28 +31,36 @@ Provide your evaluation in the following JSON format:
   "affected_realms": ["list", "of", "realm_ids"],
   "affected_timelines": ["list", "of", "timeline_ids"],
   "explanation": "Overall explanation of decision consequences"
-}
+}}
 ```
 
 Remember to maintain consistency with the game's lore and previous events.
 """
 
-# Quest generation prompt template
-QUEST_GENERATION_TEMPLATE = """
-You are the AI engine for ChronoCore: Path of Realities, a game about time manipulation and ethical choices.
-Your task is to generate a meaningful quest for a player based on their role and the current game state.
-
+DECISION_EVALUATION_SUFFIX = """
 ## Player Information
 - Player ID: {player_id}
 - Player Role: {player_role}
 - Current Karma: {player_karma}
-- Controlled Realms: {player_realms}
 
 ## Game Context
 - Current Era: {current_era}
 - Current Turn: {current_turn}
 - Timeline Stability: {timeline_stability}%
-- Recent Events: {recent_events}
+
+## Decision Context
+{context}
+
+## Player's Decision
+{decision}
+"""
+
+DECISION_EVALUATION_TEMPLATE = DECISION_EVALUATION_PREFIX + DECISION_EVALUATION_SUFFIX
+
+# Quest generation prompt template (static prefix + request-specific suffix)
+QUEST_GENERATION_PREFIX = """
+You are the AI engine for ChronoCore: Path of Realities, a game about time manipulation and ethical choices.
+Your task is to generate a meaningful quest for a player based on their role and the current game state.
 
 ## Quest Generation Instructions
 1. Create a quest appropriate for the player's role and current game state
@@ -77,45 +72,50 @@ Your task is to generate a meaningful quest for a player based on their role and
 ## Response Format
 Provide your quest in the following JSON format:
 ```
-{
+{{
   "title": "Quest Title",
   "description": "Detailed quest description including background and objectives",
   "type": "Ethical|Technical|Diplomatic|Temporal|General",
   "difficulty": integer_between_1_and_5,
   "options": [
-    {
+    {{
       "id": 1,
       "text": "Option 1 description",
       "potential_outcome": "Brief hint about consequences"
-    },
-    {
+    }},
+    {{
       "id": 2,
       "text": "Option 2 description",
       "potential_outcome": "Brief hint about consequences"
-    }
+    }}
     // Additional options as needed
   ]
-}
+}}
 ```
 
 Make the quest engaging, challenging, and relevant to the current game state.
 """
 
-# Time rift generation prompt template
-TIME_RIFT_GENERATION_TEMPLATE = """
-You are the AI engine for ChronoCore: Path of Realities, a game about time manipulation and ethical choices.
-Your task is to generate a time rift (anomaly) in a timeline based on the current game state.
-
-## Timeline Information
-- Timeline ID: {timeline_id}
-- Timeline Name: {timeline_name}
-- Current Stability: {timeline_stability}%
-- Realms in Timeline: {timeline_realms}
+QUEST_GENERATION_SUFFIX = """
+## Player Information
+- Player ID: {player_id}
+- Player Role: {player_role}
+- Current Karma: {player_karma}
+- Controlled Realms: {player_realms}
 
 ## Game Context
 - Current Era: {current_era}
 - Current Turn: {current_turn}
+- Timeline Stability: {timeline_stability}%
 - Recent Events: {recent_events}
+"""
+
+QUEST_GENERATION_TEMPLATE = QUEST_GENERATION_PREFIX + QUEST_GENERATION_SUFFIX
+
+# Time rift generation prompt template (static prefix + request-specific suffix)
+TIME_RIFT_GENERATION_PREFIX = """
+You are the AI engine for ChronoCore: Path of Realities, a game about time manipulation and ethical choices.
+Your task is to generate a time rift (anomaly) in a timeline based on the current game state.
 
 ## Time Rift Generation Instructions
 1. Create a time rift with severity proportional to timeline instability (1-5)
@@ -127,26 +127,153 @@ Your task is to generate a time rift (anomaly) in a timeline based on the curren
 ## Response Format
 Provide your time rift in the following JSON format:
 ```
-{
+{{
   "description": "Detailed description of the time rift and its visible effects",
   "severity": integer_between_1_and_5,
   "potential_consequences": "What might happen if the rift remains unresolved",
   "resolution_approaches": ["Approach 1", "Approach 2", "Approach 3"],
   "affected_realms": ["list", "of", "realm_ids"],
-  "coordinates": {"x": float_coordinate, "y": float_coordinate},
-  "effects": {
+  "coordinates": {{"x": float_coordinate, "y": float_coordinate}},
+  "effects": {{
     "stability_impact": integer_stability_change,
     "technological_impact": "Description of technological effects",
     "ecological_impact": "Description of ecological effects"
-  }
-}
+  }}
+}}
 ```
 
 Make the time rift interesting, challenging, and appropriate for the current game state.
 """
 
+TIME_RIFT_GENERATION_SUFFIX = """
+## Timeline Information
+- Timeline ID: {timeline_id}
+- Timeline Name: {timeline_name}
+- Current Stability: {timeline_stability}%
+- Realms in Timeline: {timeline_realms}
+
+## Game Context
+- Current Era: {current_era}
+- Current Turn: {current_turn}
+- Recent Events: {recent_events}
+"""
+
+TIME_RIFT_GENERATION_TEMPLATE = TIME_RIFT_GENERATION_PREFIX + TIME_RIFT_GENERATION_SUFFIX
+
+# Quest outcome evaluation prompt template (static prefix + request-specific suffix)
+QUEST_OUTCOME_PREFIX = """
+You are the AI engine for ChronoCore: Path of Realities, a game about time manipulation and ethical choices.
+Your task is to evaluate the outcome of a player's quest choice.
+
+## Evaluation Instructions
+1. Generate a detailed outcome based on the player's choice
+2. Determine the karma impact of this choice (between -10 and +10)
+3. Describe any effects on realms, timelines, or other players
+4. Assign rewards or consequences based on the choice
+
+## Response Format
+Provide your evaluation in the following JSON format:
+```
+{{
+  "outcome_description": "Detailed description of what happens as a result of this choice",
+  "karma_impact": integer_between_minus_10_and_plus_10,
+  "realm_effects": "Description of how realms are affected",
+  "timeline_effects": "Description of how timelines are affected",
+  "rewards": ["list", "of", "rewards"],
+  "consequences": ["list", "of", "consequences"]
+}}
+```
+
+Make the outcome engaging, fair, and consistent with the game world.
+"""
+
+QUEST_OUTCOME_SUFFIX = """
+## Player Information
+- Player ID: {player_id}
+- Player Role: {player_role}
+- Current Karma: {player_karma}
+
+## Game Context
+- Current Era: {current_era}
+- Current Turn: {current_turn}
+
+## Quest Information
+- Title: {quest_title}
+- Description: {quest_description}
+- Type: {quest_type}
+- Difficulty: {quest_difficulty}
+
+## Selected Option
+{selected_option}
+"""
+
+QUEST_OUTCOME_TEMPLATE = QUEST_OUTCOME_PREFIX + QUEST_OUTCOME_SUFFIX
+
+def _compile(template: str) -> Callable[[Dict[str, Any]], str]:
+    """
+    Compile a template into a render function, once at import
+    
+    Args:
+        template: Template string using str.format placeholders
+        
+    Returns:
+        Function rendering the template from a dict of its fields (str.format_map for
+        templates the shared compiler cannot handle)
+    """
+    return compile_format_template(template) or template.format_map
+
+def _bullet_list(items: List[str]) -> str:
+    """
+    Format items as a Markdown bullet list with a single join
+    
+    Args:
+        items: Item texts
+        
+    Returns:
+        Bullet list, or an empty string if there are no items
+    """
+    return "- " + "\n- ".join(items) if items else ""
+
+# Static prefixes have no fields, so they are rendered once; only the suffixes are rendered per request
+_DECISION_EVALUATION_SYSTEM = _compile(DECISION_EVALUATION_PREFIX)({})
+_QUEST_GENERATION_SYSTEM = _compile(QUEST_GENERATION_PREFIX)({})
+_TIME_RIFT_GENERATION_SYSTEM = _compile(TIME_RIFT_GENERATION_PREFIX)({})
+_QUEST_OUTCOME_SYSTEM = _compile(QUEST_OUTCOME_PREFIX)({})
+
+_render_decision_evaluation = _compile(DECISION_EVALUATION_SUFFIX)
+_render_quest_generation = _compile(QUEST_GENERATION_SUFFIX)
+_render_time_rift_generation = _compile(TIME_RIFT_GENERATION_SUFFIX)
+_render_quest_outcome = _compile(QUEST_OUTCOME_SUFFIX)
+
+def get_decision_evaluation_template_raw() -> Tuple[str, str]:
+    """
+    Get the unrendered decision evaluation template, for prompt classes that fill it themselves
+    
+    Returns:
+        Tuple of the raw prefix and suffix templates (JSON braces escaped as {{ and }})
+    """
+    return DECISION_EVALUATION_PREFIX, DECISION_EVALUATION_SUFFIX
+
+def get_quest_generation_template_raw() -> Tuple[str, str]:
+    """
+    Get the unrendered quest generation template, for prompt classes that fill it themselves
+    
+    Returns:
+        Tuple of the raw prefix and suffix templates (JSON braces escaped as {{ and }})
+    """
+    return QUEST_GENERATION_PREFIX, QUEST_GENERATION_SUFFIX
+
+def get_time_rift_generation_template_raw() -> Tuple[str, str]:
+    """
+    Get the unrendered time rift generation template, for prompt classes that fill it themselves
+    
+    Returns:
+        Tuple of the raw prefix and suffix templates (JSON braces escaped as {{ and }})
+    """
+    return TIME_RIFT_GENERATION_PREFIX, TIME_RIFT_GENERATION_SUFFIX
+
 def get_decision_evaluation_prompt(player_data: Dict[str, Any], game_data: Dict[str, Any], 
-                                 decision: str, context: Dict[str, Any]) -> str:
+                                 decision: str, context: Dict[str, Any]) -> Tuple[str, str]:
     """
     Generate a decision evaluation prompt
     
@@ -157,22 +284,23 @@ def get_decision_evaluation_prompt(player_data: Dict[str, Any], game_data: Dict[
         context: Decision context
         
     Returns:
-        Formatted prompt string
+        Tuple of the static prompt prefix (identical for every request, suitable as a
+        cached system message) and the formatted request-specific suffix
     """
     context_str = "\n".join([f"- {k}: {v}" for k, v in context.items()])
     
-    return DECISION_EVALUATION_TEMPLATE.format(
-        player_id=player_data.get("id", "unknown"),
-        player_role=player_data.get("role", "unknown"),
-        player_karma=player_data.get("karma", 0),
-        current_era=game_data.get("current_era", "Initiation"),
-        current_turn=game_data.get("current_turn", 1),
-        timeline_stability=game_data.get("timeline_stability", 100),
-        context=context_str,
-        decision=decision
-    )
-
-def get_quest_generation_prompt(player_data: Dict[str, Any], game_data: Dict[str, Any]) -> str:
+    return _DECISION_EVALUATION_SYSTEM, _render_decision_evaluation({
+        "player_id": player_data.get("id", "unknown"),
+        "player_role": player_data.get("role", "unknown"),
+        "player_karma": player_data.get("karma", 0),
+        "current_era": game_data.get("current_era", "Initiation"),
+        "current_turn": game_data.get("current_turn", 1),
+        "timeline_stability": game_data.get("timeline_stability", 100),
+        "context": context_str,
+        "decision": decision
+    })
+
+def get_quest_generation_prompt(player_data: Dict[str, Any], game_data: Dict[str, Any]) -> Tuple[str, str]:
     """
     Generate a quest generation prompt
     
@@ -181,23 +309,24 @@ def get_quest_generation_prompt(player_data: Dict[str, Any], game_data: Dict[str
         game_data: Game state information
         
     Returns:
-        Formatted prompt string
+        Tuple of the static prompt prefix (identical for every request, suitable as a
+        cached system message) and the formatted request-specific suffix
     """
-    player_realms = ", ".join([r.get("name", "Unknown Realm") for r in player_data.get("realms", [])])
-    recent_events = "\n".join([f"- {e.get('description', '')}" for e in game_data.get("recent_events", [])])
+    player_realms = ", ".join([r.get("name", "Unknown Realm") for r in player_data.get("realms", ())])
+    recent_events = _bullet_list([e.get("description", "") for e in game_data.get("recent_events", ())])
     
-    return QUEST_GENERATION_TEMPLATE.format(
-        player_id=player_data.get("id", "unknown"),
-        player_role=player_data.get("role", "unknown"),
-        player_karma=player_data.get("karma", 0),
-        player_realms=player_realms or "None",
-        current_era=game_data.get("current_era", "Initiation"),
-        current_turn=game_data.get("current_turn", 1),
-        timeline_stability=game_data.get("timeline_stability", 100),
-        recent_events=recent_events or "No recent events"
-    )
-
-def get_time_rift_generation_prompt(timeline_data: Dict[str, Any], game_data: Dict[str, Any]) -> str:
+    return _QUEST_GENERATION_SYSTEM, _render_quest_generation({
+        "player_id": player_data.get("id", "unknown"),
+        "player_role": player_data.get("role", "unknown"),
+        "player_karma": player_data.get("karma", 0),
+        "player_realms": player_realms or "None",
+        "current_era": game_data.get("current_era", "Initiation"),
+        "current_turn": game_data.get("current_turn", 1),
+        "timeline_stability": game_data.get("timeline_stability", 100),
+        "recent_events": recent_events or "No recent events"
+    })
+
+def get_time_rift_generation_prompt(timeline_data: Dict[str, Any], game_data: Dict[str, Any]) -> Tuple[str, str]:
     """
     Generate a time rift generation prompt
     
@@ -206,17 +335,46 @@ def get_time_rift_generation_prompt(timeline_data: Dict[str, Any], game_data: Di
         game_data: Game state information
         
     Returns:
-        Formatted prompt string
+        Tuple of the static prompt prefix (identical for every request, suitable as a
+        cached system message) and the formatted request-specific suffix
+    """
+    timeline_realms = ", ".join([r.get("name", "Unknown Realm") for r in timeline_data.get("realms", ())])
+    recent_events = _bullet_list([e.get("description", "") for e in game_data.get("recent_events", ())])
+    
+    return _TIME_RIFT_GENERATION_SYSTEM, _render_time_rift_generation({
+        "timeline_id": timeline_data.get("id", "unknown"),
+        "timeline_name": timeline_data.get("name", "Unknown Timeline"),
+        "timeline_stability": timeline_data.get("stability", 100),
+        "timeline_realms": timeline_realms or "None",
+        "current_era": game_data.get("current_era", "Initiation"),
+        "current_turn": game_data.get("current_turn", 1),
+        "recent_events": recent_events or "No recent events"
+    })
+
+def get_quest_outcome_prompt(quest: Dict[str, Any], selected_option: Dict[str, Any], 
+                             player_data: Dict[str, Any], game_data: Dict[str, Any]) -> Tuple[str, str]:
     """
-    timeline_realms = ", ".join([r.get("name", "Unknown Realm") for r in timeline_data.get("realms", [])])
-    recent_events = "\n".join([f"- {e.get('description', '')}" for e in game_data.get("recent_events", [])])
+    Generate a quest outcome evaluation prompt
     
-    return TIME_RIFT_GENERATION_TEMPLATE.format(
-        timeline_id=timeline_data.get("id", "unknown"),
-        timeline_name=timeline_data.get("name", "Unknown Timeline"),
-        timeline_stability=timeline_data.get("stability", 100),
-        timeline_realms=timeline_realms or "None",
-        current_era=game_data.get("current_era", "Initiation"),
-        current_turn=game_data.get("current_turn", 1),
-        recent_events=recent_events or "No recent events"
-    )
+    Args:
+        quest: Quest data
+        selected_option: Option the player selected
+        player_data: Player information
+        game_data: Game state information
+        
+    Returns:
+        Tuple of the static prompt prefix (identical for every request, suitable as a
+        cached system message) and the formatted request-specific suffix
+    """
+    return _QUEST_OUTCOME_SYSTEM, _render_quest_outcome({
+        "player_id": player_data.get("id", "unknown"),
+        "player_role": player_data.get("role", "unknown"),
+        "player_karma": player_data.get("karma", 0),
+        "current_era": game_data.get("current_era", "Initiation"),
+        "current_turn": game_data.get("current_turn", 1),
+        "quest_title": quest.get("title", "Unknown Quest"),
+        "quest_description": quest.get("description", "No description"),
+        "quest_type": quest.get("type", "General"),
+        "quest_difficulty": quest.get("difficulty", 2),
+        "selected_option": selected_option.get("text", "Unknown option")
+    })
@@ -5,14 +5,106 @@ Manages training data for fine-tuning and improving AI models.
 
 import os
 import json
+import mmap
 import logging
-from typing import List, Dict, Any, Optional
+from typing import Iterator, List, Dict, Any, Optional, Tuple
 import random
+import orjson
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class _LazyCategory:
+    """
+    Training examples of one category, backed by a memory-mapped JSON Lines file.
+    The file is mapped and indexed on first access, and an example is parsed only when it is read,
+    so unused categories and unsampled examples never occupy process memory.
+    """
+    
+    def __init__(self, file_path: str):
+        """
+        Initialize the category.
+        
+        Args:
+            file_path: Path to the category's JSON Lines file
+        """
+        self.file_path = file_path
+        self._mmap: Optional[mmap.mmap] = None
+        self._offsets: Optional[List[Tuple[int, int]]] = None  # (start, end) byte range of each example
+    
+    def _map(self) -> Optional[mmap.mmap]:
+        """Map the file into memory if it is not mapped yet (empty or missing files are not mapped)."""
+        if self._mmap is None:
+            try:
+                f = open(self.file_path, 'rb')
+            except FileNotFoundError:
+                return None
+            
+            with f:
+                if os.fstat(f.fileno()).st_size > 0:
+                    self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+    
+    def _index(self) -> List[Tuple[int, int]]:
+        """Get the byte range of every example, scanning the file for line breaks on first use."""
+        if self._offsets is None:
+            offsets = []
+            mm = self._map()
+            
+            if mm is not None:
+                size = len(mm)
+                start = 0
+                while start < size:
+                    end = mm.find(b"\n", start)
+                    if end == -1:
+                        end = size
+                    if end > start:
+                        offsets.append((start, end))
+                    start = end + 1
+            
+            self._offsets = offsets
+        
+        return self._offsets
+    
+    def __len__(self) -> int:
+        return len(self._index())
+    
+    def __getitem__(self, index: int) -> Dict:
+        start, end = self._index()[index]
+        return orjson.loads(self._map()[start:end])
+    
+    def __iter__(self) -> Iterator[Dict]:
+        for index in range(len(self)):
+            yield self[index]
+    
+    def append(self, example: Dict) -> None:
+        """
+        Append an example to the category file.
+        
+        Args:
+            example: The example to append
+        """
+        line = orjson.dumps(example)
+        
+        with open(self.file_path, 'ab+') as f:
+            start = f.tell()
+            
+            # Terminate a last line written without a newline so the two examples stay separate
+            if start > 0:
+                f.seek(start - 1)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+                    start += 1
+            
+            f.write(line + b"\n")
+        
+        if self._offsets is not None:
+            self._offsets.append((start, start + len(line)))
+        
+        # The mapping has a fixed size, so remap on the next read to cover the new line
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
 class TrainingData:
     """
     Manages training data for the ChronoCore AI engine.
@@ -28,38 +120,76 @@ class TrainingData:
         """
         self.data_dir = data_dir or os.path.join(os.path.dirname(__file__), "training")
         self.examples = {
-            "story_generation": [],
-            "quest_creation": [],
-            "ethical_dilemmas": [],
-            "decision_evaluation": [],
-            "timeline_impacts": [],
-            "realm_development": [],
-            "time_anomalies": []
+            category: _LazyCategory(os.path.join(self.data_dir, f"{category}.jsonl"))
+            for category in (
+                "story_generation",
+                "quest_creation",
+                "ethical_dilemmas",
+                "decision_evaluation",
+                "timeline_impacts",
+                "realm_development",
+                "time_anomalies"
+            )
         }
+        
+        # Rendered few-shot prompts keyed by (category, count, version); a category's
+        # version is bumped whenever its examples change
+        self._version = {category: 0 for category in self.examples}
+        self._few_shot_cache: Dict[Tuple[str, int, int], str] = {}
+        
+        self._rng = random.Random()
+        
         self._load_examples()
     
     def _load_examples(self) -> None:
-        """Load training examples from data files."""
+        """Prepare the training data files (examples themselves are loaded on first use)."""
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir, exist_ok=True)
-            logger.warning(f"Created training data directory: {self.data_dir}")
+            logger.warning("Created training data directory: %s", self.data_dir)
             self._create_sample_data()
             return
         
-        for category in self.examples.keys():
-            file_path = os.path.join(self.data_dir, f"{category}.json")
+        # List the directory once instead of checking every file separately
+        with os.scandir(self.data_dir) as entries:
+            present = {entry.name for entry in entries if entry.is_file()}
+        
+        for category, examples in self.examples.items():
+            file_path = examples.file_path
+            file_name = os.path.basename(file_path)
             
-            if not os.path.exists(file_path):
-                logger.warning(f"Training data file not found: {file_path}")
-                continue
+            # Convert files in the old single-document format once
+            if f"{category}.json" in present:
+                legacy_path = os.path.join(self.data_dir, f"{category}.json")
+                try:
+                    self._migrate_file(legacy_path, file_path)
+                    present.add(file_name)
+                    logger.info("Migrated training data file to JSON Lines: %s", legacy_path)
+                except Exception as e:
+                    logger.error("Error migrating training data from %s: %s", legacy_path, e)
             
-            try:
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                    self.examples[category] = data
-                    logger.info(f"Loaded {len(data)} examples for {category}")
-            except Exception as e:
-                logger.error(f"Error loading training data from {file_path}: {e}")
+            if file_name not in present:
+                logger.warning("Training data file not found: %s", file_path)
+    
+    @staticmethod
+    def _migrate_file(legacy_path: str, file_path: str) -> None:
+        """
+        Convert a legacy JSON training data file to JSON Lines and remove it.
+        
+        Args:
+            legacy_path: Path to the legacy JSON file
+            file_path: Path to the JSON Lines file to append the examples to
+        """
+        with open(legacy_path, 'rb') as f:
+            data = orjson.loads(f.read())
+        
+        # Legacy files hold either a list of examples or {"training_data": [...]}
+        if isinstance(data, dict):
+            data = data.get("training_data", [])
+        
+        with open(file_path, 'ab') as f:
+            f.write(b"".join(orjson.dumps(example) + b"\n" for example in data))
+        
+        os.remove(legacy_path)
     
     def _create_sample_data(self) -> None:
         """Create sample training data files if none exist."""
@@ -123,20 +253,21 @@ class TrainingData:
             }
         ]
         
-        # Create sample files
-        self.examples["story_generation"] = story_examples
-        self.examples["quest_creation"] = quest_examples
-        
         # Save sample files
-        for category, examples in self.examples.items():
+        samples = {
+            "story_generation": story_examples,
+            "quest_creation": quest_examples
+        }
+        
+        for category, examples in samples.items():
             if examples:
-                file_path = os.path.join(self.data_dir, f"{category}.json")
+                file_path = self.examples[category].file_path
                 try:
-                    with open(file_path, 'w') as f:
-                        json.dump(examples, f, indent=2)
-                    logger.info(f"Created sample data file: {file_path}")
+                    with open(file_path, 'wb') as f:
+                        f.write(b"".join(orjson.dumps(example) + b"\n" for example in examples))
+                    logger.info("Created sample data file: %s", file_path)
                 except Exception as e:
-                    logger.error(f"Error creating sample data file {file_path}: {e}")
+                    logger.error("Error creating sample data file %s: %s", file_path, e)
     
     def get_examples(self, category: str, count: int = 5) -> List[Dict]:
         """
@@ -150,20 +281,36 @@ class TrainingData:
             List of training examples
         """
         if category not in self.examples:
-            logger.error(f"Unknown category: {category}")
+            logger.error("Unknown category: %s", category)
             return []
         
         examples = self.examples.get(category, [])
         
         if not examples:
-            logger.warning(f"No examples found for category: {category}")
+            logger.warning("No examples found for category: %s", category)
             return []
         
         # Return random subset if we have more examples than requested
         if len(examples) > count:
-            return random.sample(examples, count)
+            return self._sample(self._rng, examples, count)
+        
+        return list(examples)
+    
+    @staticmethod
+    def _sample(rng: random.Random, examples: _LazyCategory, count: int) -> List[Dict]:
+        """
+        Pick a random subset of examples.
         
-        return examples
+        Args:
+            rng: Random number generator to sample with
+            examples: Examples to choose from
+            count: Number of examples to pick
+            
+        Returns:
+            The chosen examples
+        """
+        # Sample indices so only the chosen examples are parsed
+        return [examples[i] for i in rng.sample(range(len(examples)), count)]
     
     def add_example(self, category: str, input_data: Dict, output_data: Any) -> bool:
         """
@@ -178,7 +325,7 @@ class TrainingData:
             True if successful, False otherwise
         """
         if category not in self.examples:
-            logger.error(f"Unknown category: {category}")
+            logger.error("Unknown category: %s", category)
             return False
         
         try:
@@ -187,18 +334,20 @@ class TrainingData:
                 "output": output_data
             }
             
+            # Append the example to the category file
             self.examples[category].append(example)
             
-            # Save updated examples to file
-            file_path = os.path.join(self.data_dir, f"{category}.json")
-            with open(file_path, 'w') as f:
-                json.dump(self.examples[category], f, indent=2)
+            # Drop the category's rendered few-shot prompts
+            self._version[category] += 1
+            self._few_shot_cache = {
+                key: value for key, value in self._few_shot_cache.items() if key[0] != category
+            }
             
-            logger.info(f"Added new example to {category}")
+            logger.info("Added new example to %s", category)
             return True
             
         except Exception as e:
-            logger.error(f"Error adding example to {category}: {e}")
+            logger.error("Error adding example to %s: %s", category, e)
             return False
     
     def get_few_shot_examples(self, category: str, count: int = 3) -> str:
@@ -212,11 +361,24 @@ class TrainingData:
         Returns:
             Formatted string of examples for few-shot learning
         """
-        examples = self.get_examples(category, count)
+        if category not in self.examples:
+            logger.error("Unknown category: %s", category)
+            return ""
+        
+        key = (category, count, self._version[category])
+        if key in self._few_shot_cache:
+            return self._few_shot_cache[key]
+        
+        examples = self.examples[category]
         
         if not examples:
+            logger.warning("No examples found for category: %s", category)
             return ""
         
+        # Sample deterministically so the cached prompt stays valid until the examples change
+        if len(examples) > count:
+            examples = self._sample(random.Random(f"{category}:{self._version[category]}:{count}"), examples, count)
+        
         formatted = "Here are some examples:\n\n"
         
         for i, example in enumerate(examples):
@@ -224,4 +386,5 @@ class TrainingData:
             formatted += f"Input: {json.dumps(example['input'], indent=2)}\n"
             formatted += f"Output: {json.dumps(example['output'], indent=2)}\n\n"
         
+        self._few_shot_cache[key] = formatted
         return formatted
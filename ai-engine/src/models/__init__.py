@@ -7,6 +7,11 @@ from .player import Player, TechTree
 from .timeline import Timeline
 from .realm import Realm
 from .quest import Quest, QuestOption, QuestOutcome
+from .requests import (
+    EvaluateDecisionRequest, CalculateKarmaRequest, TimelineRequest,
+    RealmRequest, RealmEventRequest, NewGameRequest,
+    SimilarContextsRequest, CompareTextsRequest, TrainingExampleRequest
+)
 
 __all__ = [
     'GameState',
@@ -16,5 +21,14 @@ __all__ = [
     'Realm',
     'Quest',
     'QuestOption',
-    'QuestOutcome'
+    'QuestOutcome',
+    'EvaluateDecisionRequest',
+    'CalculateKarmaRequest',
+    'TimelineRequest',
+    'RealmRequest',
+    'RealmEventRequest',
+    'NewGameRequest',
+    'SimilarContextsRequest',
+    'CompareTextsRequest',
+    'TrainingExampleRequest'
 ]
@@ -3,21 +3,93 @@ Decision Model
 Handles evaluation of player decisions and their impacts on the game world
 """
 
-import json
 import asyncio
-from typing import Dict, Any, List, Optional
+import hashlib
+from typing import Dict, Any, List, Optional, Union
 import logging
-from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
-from langchain.chat_models import ChatOpenAI
-from ..data.training.decision_prompts import get_decision_evaluation_prompt
+import msgspec
+import orjson
+from langchain.prompts import ChatPromptTemplate
+from ..data.training.decision_prompts import get_decision_evaluation_template_raw
 from ..utils.config import Config
+from ..utils.llm import get_shared_llm
 from ..utils.embedding_utils import EmbeddingManager
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class DecisionEvaluation(msgspec.Struct):
+    """
+    Evaluation of a decision, decoded and type-checked straight from the LLM's JSON
+    Types are loose enough for what the LLM writes (e.g., "7", 7.0 or null karma, numeric IDs);
+    karma is made an int in range by DecisionModel._clamp_karma
+    """
+    
+    ethical_impact: Optional[str] = ""
+    technological_impact: Optional[str] = ""
+    temporal_impact: Optional[str] = ""
+    karma_impact: Union[int, float, None] = 0
+    affected_realms: List[Union[str, int]] = []
+    affected_timelines: List[Union[str, int]] = []
+    explanation: Optional[str] = ""
+
+def _default_evaluation() -> DecisionEvaluation:
+    """Get the evaluation returned when the LLM response cannot be parsed"""
+    return DecisionEvaluation(
+        ethical_impact="Unable to determine ethical impact",
+        technological_impact="Unable to determine technological impact",
+        temporal_impact="Unable to determine temporal impact",
+        explanation="Unable to evaluate decision"
+    )
+
+class _JsonObjectScanner:
+    """Incrementally locates the first balanced JSON object in text that arrives in pieces"""
+    
+    def __init__(self):
+        """Initialize the scanner"""
+        self.pieces: List[str] = []
+        self.length = 0
+        self.depth = 0
+        self.start = -1
+        self.in_string = False
+        self.escaped = False
+    
+    def feed(self, text: str) -> Optional[bytes]:
+        """
+        Scan the next piece of text
+        
+        Args:
+            text: Next piece of text
+            
+        Returns:
+            The encoded JSON object once it is complete, otherwise None
+        """
+        offset = self.length
+        self.pieces.append(text)
+        self.length += len(text)
+        
+        for i, c in enumerate(text):
+            if self.in_string:
+                # Braces inside string values do not affect nesting
+                if self.escaped:
+                    self.escaped = False
+                elif c == '\\':
+                    self.escaped = True
+                elif c == '"':
+                    self.in_string = False
+            elif c == '"':
+                if self.depth > 0:
+                    self.in_string = True
+            elif c == '{':
+                if self.depth == 0:
+                    self.start = offset + i
+                self.depth += 1
+            elif c == '}' and self.depth > 0:
+                self.depth -= 1
+                if self.depth == 0:
+                    return "".join(self.pieces)[self.start:offset + i + 1].encode()
+        
+        return None
+
 class DecisionModel:
     """Model for evaluating player decisions"""
     
@@ -26,30 +98,22 @@ class DecisionModel:
         # Load configuration
         self.config = Config.get_openai_config()
         self.game_config = Config.get_game_config()
+        self.karma_range = tuple(self.game_config["karma_range"])
+        self._karma_lo, self._karma_hi = self.karma_range
         
-        # Initialize OpenAI LLM
-        self.llm = ChatOpenAI(
-            model_name=self.config["model"],
-            temperature=self.config["temperature"],
-            openai_api_key=self.config["api_key"]
-        )
+        # Use the OpenAI LLM client shared by every model with this configuration
+        self.llm = get_shared_llm(self.config["model"], self.config["temperature"], self.config["api_key"])
         
         # Initialize embedding manager
         self.embedding_manager = EmbeddingManager()
         
         # Create decision evaluation chain
-        self.decision_template = PromptTemplate(
-            input_variables=["player_id", "player_role", "player_karma", 
-                            "current_era", "current_turn", "timeline_stability",
-                            "context", "decision"],
-            template=get_decision_evaluation_prompt({}, {}, "", {})
-        )
-        
-        self.decision_chain = LLMChain(
-            llm=self.llm,
-            prompt=self.decision_template,
-            verbose=True
-        )
+        # The static instructions go in the system message so the provider can reuse its cached prefix
+        prefix, suffix = get_decision_evaluation_template_raw()
+        self.decision_template = ChatPromptTemplate.from_messages([
+            ("system", prefix),
+            ("human", suffix)
+        ])
         
         logger.info("Decision model initialized")
     
@@ -71,72 +135,193 @@ class DecisionModel:
             Evaluation results
         """
         try:
+            player_role = player_data.get("role", "unknown")
+            current_era = game_data.get("current_era", "Initiation")
+            
+            # Reuse the evaluation of a near-identical past decision instead of calling the LLM
+            combined_text = self._decision_text(decision, context)
+            embedding = await self._create_embedding(combined_text)
+            if embedding is not None:
+                cached = await self._find_cached_evaluation(embedding, player_role, current_era, context)
+                if cached is not None:
+                    return cached
+            
             # Create context string
             context_str = "\n".join([f"- {k}: {v}" for k, v in context.items()])
             
-            # Run the evaluation chain
-            evaluation_text = await asyncio.to_thread(
-                self.decision_chain.run,
+            # Stream the evaluation, scanning for the JSON object as it arrives so
+            # reading can stop as soon as the object is complete
+            messages = self.decision_template.format_messages(
                 player_id=player_data.get("id", "unknown"),
-                player_role=player_data.get("role", "unknown"),
+                player_role=player_role,
                 player_karma=player_data.get("karma", 0),
-                current_era=game_data.get("current_era", "Initiation"),
+                current_era=current_era,
                 current_turn=game_data.get("current_turn", 1),
                 timeline_stability=game_data.get("timeline_stability", 100),
                 context=context_str,
                 decision=decision
             )
             
-            # Parse the evaluation
+            scanner = _JsonObjectScanner()
+            evaluation_json = None
+            stream = self.llm.astream(messages)
             try:
-                # Extract JSON from the response
-                json_start = evaluation_text.find('{')
-                json_end = evaluation_text.rfind('}') + 1
-                
-                if json_start >= 0 and json_end > json_start:
-                    evaluation_json = evaluation_text[json_start:json_end]
-                    evaluation = json.loads(evaluation_json)
-                else:
-                    # Fallback if JSON parsing fails
-                    logger.warning("Failed to extract JSON from evaluation text")
-                    evaluation = {
-                        "ethical_impact": "Unable to determine ethical impact",
-                        "technological_impact": "Unable to determine technological impact",
-                        "temporal_impact": "Unable to determine temporal impact",
-                        "karma_impact": 0,
-                        "affected_realms": [],
-                        "affected_timelines": [],
-                        "explanation": "Unable to evaluate decision"
-                    }
-            except json.JSONDecodeError:
-                logger.error("Failed to parse evaluation JSON")
-                evaluation = {
-                    "ethical_impact": "Unable to determine ethical impact",
-                    "technological_impact": "Unable to determine technological impact",
-                    "temporal_impact": "Unable to determine temporal impact",
-                    "karma_impact": 0,
-                    "affected_realms": [],
-                    "affected_timelines": [],
-                    "explanation": "Unable to evaluate decision"
-                }
+                async for chunk in stream:
+                    evaluation_json = scanner.feed(chunk.content)
+                    if evaluation_json is not None:
+                        break
+            finally:
+                await stream.aclose()
+            
+            # Parse the evaluation
+            evaluation = None
+            
+            if evaluation_json is None:
+                logger.warning("Failed to extract JSON from evaluation text")
+            else:
+                try:
+                    # Decode and validate against the expected schema in one pass, converting
+                    # numeric strings so only malformed JSON falls back to the default
+                    evaluation = msgspec.json.decode(evaluation_json, type=DecisionEvaluation, strict=False)
+                except msgspec.DecodeError as e:
+                    logger.error("Failed to parse evaluation JSON: %s", e)
+            
+            if evaluation is None:
+                # Fallback if JSON parsing fails
+                evaluation = _default_evaluation()
             
             # Ensure karma impact is within bounds
-            karma_range = self.game_config["karma_range"]
-            evaluation["karma_impact"] = max(min(evaluation.get("karma_impact", 0), karma_range[1]), karma_range[0])
+            self._clamp_karma(evaluation)
+            result = msgspec.structs.asdict(evaluation)
             
             # Store decision embedding for future reference
-            await self._store_decision_embedding(player_data["id"], decision, context, evaluation)
+            await self._store_decision_embedding(player_data["id"], decision, context, result,
+                                                 player_role, current_era, embedding)
             
-            return evaluation
+            return result
         except Exception as e:
-            logger.error(f"Error evaluating decision: {str(e)}")
+            logger.error("Error evaluating decision: %s", e)
             raise
     
+    async def evaluate_decisions_batch(self, decisions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Evaluate several decisions concurrently
+        
+        Args:
+            decisions: Decisions to evaluate, each a dict with "player_data", "game_data",
+                "decision" and "context" keys (the arguments of evaluate_decision)
+            
+        Returns:
+            Evaluation results, in the same order as the decisions
+        """
+        # Embedding, LLM and vector store calls of different decisions overlap instead of running one after another
+        return await asyncio.gather(*[
+            self.evaluate_decision(
+                item["player_data"],
+                item["game_data"],
+                item["decision"],
+                item.get("context", {})
+            )
+            for item in decisions
+        ])
+    
+    def _clamp_karma(self, evaluation: DecisionEvaluation) -> None:
+        """
+        Round an evaluation's karma impact and clamp it to the configured karma range
+        
+        Args:
+            evaluation: Decision evaluation, updated in place
+        """
+        karma = evaluation.karma_impact
+        if karma is None:
+            karma = 0
+        elif isinstance(karma, float):
+            karma = round(karma)
+        evaluation.karma_impact = min(max(karma, self._karma_lo), self._karma_hi)
+    
+    def _decision_text(self, decision: str, context: Dict[str, Any]) -> str:
+        """
+        Build the text embedded for a decision
+        
+        Args:
+            decision: Decision text
+            context: Decision context
+            
+        Returns:
+            Combined decision and context text
+        """
+        return f"Decision: {decision}\nContext: {orjson.dumps(context).decode()}"
+    
+    async def _create_embedding(self, text: str) -> Optional[List[float]]:
+        """
+        Create an embedding, returning None instead of raising on failure
+        
+        Args:
+            text: Text to embed
+            
+        Returns:
+            Embedding vector, or None if it could not be created
+        """
+        try:
+            return await asyncio.to_thread(self.embedding_manager.create_embedding, text)
+        except Exception as e:
+            logger.error("Error creating decision embedding: %s", e)
+            return None
+    
+    async def _find_cached_evaluation(self,
+                                    embedding: List[float],
+                                    player_role: str,
+                                    current_era: str,
+                                    context: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Find the stored evaluation of a near-identical decision by a player of the same role and era
+        
+        Args:
+            embedding: Embedding of the decision and its context
+            player_role: Role of the deciding player
+            current_era: Current game era
+            context: Decision context
+            
+        Returns:
+            The past evaluation adapted to this decision's context, or None on a cache miss
+        """
+        try:
+            matches = await asyncio.to_thread(
+                self.embedding_manager.query_vectors,
+                embedding,
+                5,
+                {"player_role": player_role, "current_era": current_era}
+            )
+            
+            # Matches are ordered by cosine similarity, so only the top hit can qualify
+            if not matches or matches[0].score < Config.DECISION_CACHE_SIMILARITY:
+                return None
+            
+            stored = (matches[0].metadata or {}).get("evaluation")
+            if not stored:
+                return None
+            
+            evaluation = msgspec.json.decode(stored, type=DecisionEvaluation, strict=False)
+            
+            # Realm and timeline IDs belong to the original game, so take them from this decision's context
+            evaluation.affected_realms = context.get("affected_realms", [])
+            evaluation.affected_timelines = context.get("affected_timelines", [])
+            self._clamp_karma(evaluation)
+            
+            logger.info("Reused cached evaluation (similarity %.3f)", matches[0].score)
+            return msgspec.structs.asdict(evaluation)
+        except Exception as e:
+            logger.error("Error looking up cached evaluation: %s", e)
+            return None
+    
     async def _store_decision_embedding(self, 
                                       player_id: str,
                                       decision: str,
                                       context: Dict[str, Any],
-                                      evaluation: Dict[str, Any]) -> None:
+                                      evaluation: Dict[str, Any],
+                                      player_role: str = "unknown",
+                                      current_era: str = "Initiation",
+                                      embedding: Optional[List[float]] = None) -> None:
         """
         Store decision embedding in vector database
         
@@ -145,32 +330,50 @@ class DecisionModel:
             decision: Decision text
             context: Decision context
             evaluation: Decision evaluation
+            player_role: Role of the deciding player
+            current_era: Current game era
+            embedding: Precomputed embedding of the decision (created if not given)
         """
         try:
-            # Create combined text for embedding
-            combined_text = f"Decision: {decision}\nContext: {json.dumps(context)}"
+            combined_text = self._decision_text(decision, context)
+            
+            # Key the vector by content so decisions without a timestamp do not overwrite each other
+            digest = hashlib.blake2b(combined_text.encode(), digest_size=16).hexdigest()
+            vector_id = f"decision:{player_id}:{digest}"
+            
+            if embedding is None:
+                # Skip the embedding call for a decision that is already stored
+                if await asyncio.to_thread(self.embedding_manager.exists, vector_id):
+                    return
+                
+                embedding = await asyncio.to_thread(
+                    self.embedding_manager.create_embedding,
+                    combined_text
+                )
             
             # Create metadata
             metadata = {
                 "player_id": player_id,
+                "player_role": player_role,
+                "current_era": current_era,
                 "decision": decision,
                 "karma_impact": evaluation.get("karma_impact", 0),
                 "ethical_impact": evaluation.get("ethical_impact", ""),
                 "technological_impact": evaluation.get("technological_impact", ""),
                 "temporal_impact": evaluation.get("temporal_impact", ""),
-                "timestamp": context.get("timestamp", "")
+                "timestamp": context.get("timestamp", ""),
+                "evaluation": orjson.dumps(evaluation).decode()
             }
             
             # Store in vector database
-            vector_id = f"decision:{player_id}:{context.get('timestamp', '')}"
             await asyncio.to_thread(
                 self.embedding_manager.store_vector,
                 vector_id,
-                await asyncio.to_thread(self.embedding_manager.create_embedding, combined_text),
+                embedding,
                 metadata
             )
         except Exception as e:
-            logger.error(f"Error storing decision embedding: {str(e)}")
+            logger.error("Error storing decision embedding: %s", e)
     
     async def find_similar_decisions(self, 
                                    query: str, 
@@ -208,5 +411,5 @@ class DecisionModel:
             
             return results
         except Exception as e:
-            logger.error(f"Error finding similar decisions: {str(e)}")
+            logger.error("Error finding similar decisions: %s", e)
             return []
@@ -3,31 +3,119 @@ Game State Model
 Represents the current state of a game session.
 """
 
-from typing import List, Dict, Optional
-from pydantic import BaseModel, Field
+from typing import Any, List, Dict, Optional
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
+from functools import cached_property
+import numpy as np
 
 from .player import Player
 from .timeline import Timeline
 from .realm import Realm
+from ..utils.config import Config
 
 
 class GameState(BaseModel):
     """
     Represents the complete state of a ChronoCore game session.
+    
+    Attributes:
+        game_id: Unique identifier for the game session
+        players: List of players in the game
+        timelines: List of active timelines in the game
+        realms: List of realms on the board
+        current_era: Current era of the game (Initiation, Progression, Distortion, Equilibrium)
+        current_turn: Current turn number
+        current_player_index: Index of the current player in the players list
+        events_history: History of events that have occurred in the game
+        global_karma: Global karma value affecting all players
+        time_rifts: Active time rifts on the board
+        created_at: When the game was created
+        updated_at: When the game state was last updated
     """
-    game_id: str = Field(..., description="Unique identifier for the game session")
-    players: List[Player] = Field(default_factory=list, description="List of players in the game")
-    timelines: List[Timeline] = Field(default_factory=list, description="List of active timelines in the game")
-    realms: List[Realm] = Field(default_factory=list, description="List of realms on the board")
-    current_era: str = Field(..., description="Current era of the game (Initiation, Progression, Distortion, Equilibrium)")
-    current_turn: int = Field(0, description="Current turn number")
-    current_player_index: int = Field(0, description="Index of the current player in the players list")
-    events_history: List[Dict] = Field(default_factory=list, description="History of events that have occurred in the game")
-    global_karma: int = Field(0, description="Global karma value affecting all players")
-    time_rifts: List[Dict] = Field(default_factory=list, description="Active time rifts on the board")
-    created_at: datetime = Field(default_factory=datetime.now, description="When the game was created")
-    updated_at: datetime = Field(default_factory=datetime.now, description="When the game state was last updated")
+    __slots__ = ()
+    model_config = ConfigDict(extra="ignore", validate_default=False, validate_assignment=False)
+    
+    game_id: str
+    players: List[Player] = Field(default_factory=list)
+    timelines: List[Timeline] = Field(default_factory=list)
+    realms: List[Realm] = Field(default_factory=list)
+    current_era: str
+    current_turn: int = 0
+    current_player_index: int = 0
+    events_history: List[Dict] = Field(default_factory=list)
+    global_karma: int = 0
+    time_rifts: List[Dict] = Field(default_factory=list)
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
+    
+    @classmethod
+    def from_stored(cls, data: Dict[str, Any]) -> "GameState":
+        """
+        Rebuild a game state from a document written by `model_dump`, skipping validation.
+        Only use this on trusted data that this engine stored itself.
+        """
+        values = dict(data)
+        values["players"] = [Player.from_stored(player) for player in values.get("players", ())]
+        values["timelines"] = [Timeline(**timeline) for timeline in values.get("timelines", ())]
+        values["realms"] = [Realm(**realm) for realm in values.get("realms", ())]
+        return cls.model_construct(**values)
+    
+    @cached_property
+    def timeline_index(self) -> Dict[str, Timeline]:
+        """Timelines keyed by ID, built on first access."""
+        return {timeline.timeline_id: timeline for timeline in self.timelines}
+    
+    @cached_property
+    def realm_timeline_ids(self) -> np.ndarray:
+        """Timeline ID of each realm, aligned with `realms`, built on first access."""
+        return np.array([realm.timeline_id for realm in self.realms], dtype=str)
+    
+    @cached_property
+    def realms_by_timeline(self) -> Dict[str, List[Realm]]:
+        """Realms grouped by the ID of the timeline they belong to, built on first access."""
+        if not self.realms:
+            return {}
+        
+        # Group realm positions with a single vectorized sort instead of per-realm dict appends
+        timeline_ids, inverse = np.unique(self.realm_timeline_ids, return_inverse=True)
+        order = np.argsort(inverse, kind="stable")
+        groups = np.split(order, np.cumsum(np.bincount(inverse))[:-1])
+        
+        return {
+            str(timeline_id): [self.realms[i] for i in group]
+            for timeline_id, group in zip(timeline_ids, groups)
+        }
+    
+    @cached_property
+    def rift_columns(self) -> Dict[str, np.ndarray]:
+        """
+        Time rift fields stored column-wise, aligned with `time_rifts`, built on first access
+        and rebuilt after a rift is created (resolving a rift updates it in place).
+        """
+        rifts = self.time_rifts
+        return {
+            "timeline_id": np.array([rift.get("location", {}).get("timeline_id") or "" for rift in rifts], dtype=str),
+            "severity": np.array([rift.get("severity", 1) for rift in rifts], dtype=np.float64),
+            "resolved": np.array([bool(rift.get("resolved", False)) for rift in rifts], dtype=bool)
+        }
+    
+    def get_unresolved_rift_severity(self, timeline_id: str) -> float:
+        """Get the total severity of the unresolved time rifts located in a timeline."""
+        if not self.time_rifts:
+            return 0
+        
+        columns = self.rift_columns
+        mask = (columns["timeline_id"] == timeline_id) & ~columns["resolved"]
+        return float(columns["severity"][mask].sum())
+    
+    def get_timeline(self, timeline_id: str) -> Optional[Timeline]:
+        """Get a timeline by ID."""
+        return self.timeline_index.get(timeline_id)
+    
+    def get_timeline_realms(self, timeline_id: str) -> List[Realm]:
+        """Get the realms belonging to a timeline."""
+        return self.realms_by_timeline.get(timeline_id, [])
     
     def get_current_player(self) -> Optional[Player]:
         """Get the player whose turn it currently is."""
@@ -38,12 +126,14 @@ class GameState(BaseModel):
     def advance_turn(self) -> None:
         """Advance to the next player's turn."""
         self.current_turn += 1
-        self.current_player_index = (self.current_player_index + 1) % len(self.players)
+        next_index = self.current_player_index + 1
+        self.current_player_index = 0 if next_index >= len(self.players) else next_index
         self.updated_at = datetime.now()
     
     def add_event(self, event_type: str, description: str, affected_players: List[str], 
                   affected_realms: List[str], karma_impact: int) -> None:
         """Add a new event to the game's history."""
+        now = datetime.now()
         self.events_history.append({
             "event_type": event_type,
             "description": description,
@@ -51,9 +141,14 @@ class GameState(BaseModel):
             "affected_realms": affected_realms,
             "karma_impact": karma_impact,
             "turn": self.current_turn,
-            "timestamp": datetime.now()
+            "timestamp": now
         })
-        self.updated_at = datetime.now()
+        
+        # Keep only the most recent events so the history (and every dump of it) stays bounded
+        if len(self.events_history) > Config.MAX_EVENTS_HISTORY:
+            del self.events_history[:-Config.MAX_EVENTS_HISTORY]
+        
+        self.updated_at = now
     
     def create_time_rift(self, location: Dict, severity: int, description: str) -> None:
         """Create a new time rift on the board."""
@@ -64,11 +159,22 @@ class GameState(BaseModel):
             "created_at_turn": self.current_turn,
             "resolved": False
         })
+        self.__dict__.pop("rift_columns", None)
         self.updated_at = datetime.now()
     
     def resolve_time_rift(self, rift_index: int) -> None:
         """Mark a time rift as resolved."""
         if 0 <= rift_index < len(self.time_rifts):
-            self.time_rifts[rift_index]["resolved"] = True
-            self.time_rifts[rift_index]["resolved_at_turn"] = self.current_turn
+            rift = self.time_rifts[rift_index]
+            if rift.get("resolved", False):
+                return
+            
+            rift["resolved"] = True
+            rift["resolved_at_turn"] = self.current_turn
+            
+            # Flip the cached column in place rather than rebuilding every column on next use
+            columns = self.__dict__.get("rift_columns")
+            if columns is not None:
+                columns["resolved"][rift_index] = True
+            
             self.updated_at = datetime.now()
@@ -3,70 +3,127 @@ Player Model
 Represents a player in the ChronoCore game.
 """
 
-from typing import List, Dict, Optional
-from pydantic import BaseModel, Field
+from typing import Any, Deque, List, Dict, Optional, Set
+from collections import deque
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_serializer
 from datetime import datetime
 
+from .quest import STATUS_ACTIVE, STATUS_COMPLETED
+
 
 class TechTree(BaseModel):
-    """Represents a player's technology development tree."""
+    """
+    Represents a player's technology development tree.
+    
+    Attributes:
+        research_progress: Progress towards current research (0-100)
+        tech_level: Overall technology level
+    """
+    __slots__ = ()
+    model_config = ConfigDict(extra="ignore", validate_default=False, validate_assignment=False)
+    
     unlocked_technologies: List[str] = Field(default_factory=list)
     current_research: Optional[str] = None
-    research_progress: int = Field(0, description="Progress towards current research (0-100)")
-    tech_level: int = Field(1, description="Overall technology level")
+    research_progress: int = 0
+    tech_level: int = 1
 
 
 class Player(BaseModel):
     """
     Represents a player in the ChronoCore game.
+    
+    Attributes:
+        player_id: Unique identifier for the player
+        user_id: ID of the user account associated with this player
+        username: Display name of the player
+        role: Player role (Techno Monk, Shadow Broker, Chrono Diplomat, Bio-Smith)
+        karma: Player's karma score
+        owned_realms: IDs of realms owned by this player
+        timeline_connections: Connections between timelines established by this player
+        inventory: Items and resources held by the player
+        abilities: Special abilities available to the player
+        quest_history: History of quests completed by the player
+        decision_history: History of significant decisions made by the player
     """
-    player_id: str = Field(..., description="Unique identifier for the player")
-    user_id: str = Field(..., description="ID of the user account associated with this player")
-    username: str = Field(..., description="Display name of the player")
-    role: str = Field(..., description="Player role (Techno Monk, Shadow Broker, Chrono Diplomat, Bio-Smith)")
-    karma: int = Field(0, description="Player's karma score")
+    __slots__ = ()
+    model_config = ConfigDict(extra="ignore", validate_default=False, validate_assignment=False)
+    
+    player_id: str
+    user_id: str
+    username: str
+    role: str
+    karma: int = 0
     tech_tree: TechTree = Field(default_factory=TechTree)
-    owned_realms: List[str] = Field(default_factory=list, description="IDs of realms owned by this player")
-    timeline_connections: List[Dict] = Field(default_factory=list, description="Connections between timelines established by this player")
-    inventory: Dict = Field(default_factory=dict, description="Items and resources held by the player")
-    abilities: List[Dict] = Field(default_factory=list, description="Special abilities available to the player")
-    quest_history: List[Dict] = Field(default_factory=list, description="History of quests completed by the player")
-    decision_history: List[Dict] = Field(default_factory=list, description="History of significant decisions made by the player")
+    owned_realms: Set[str] = Field(default_factory=set)
+    timeline_connections: List[Dict] = Field(default_factory=list)
+    inventory: Dict = Field(default_factory=dict)
+    abilities: List[Dict] = Field(default_factory=list)
+    quest_history: List[Dict] = Field(default_factory=list)
+    decision_history: List[Dict] = Field(default_factory=list)
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
     
+    # Positions in quest_history of the active entries of each quest ID, oldest first
+    _active_quests_by_id: Dict[str, Deque[int]] = PrivateAttr(default_factory=dict)
+    
+    def model_post_init(self, __context: Any) -> None:
+        """Index the active quests in the loaded quest history."""
+        for index, quest in enumerate(self.quest_history):
+            if quest.get("status") == STATUS_ACTIVE:
+                self._active_quests_by_id.setdefault(quest["quest_id"], deque()).append(index)
+    
+    @classmethod
+    def from_stored(cls, data: Dict[str, Any]) -> "Player":
+        """
+        Rebuild a player from a document written by `model_dump`, skipping validation.
+        Only use this on trusted data that this engine stored itself.
+        """
+        values = dict(data)
+        if isinstance(values.get("tech_tree"), dict):
+            values["tech_tree"] = TechTree.model_construct(**values["tech_tree"])
+        if "owned_realms" in values:
+            values["owned_realms"] = set(values["owned_realms"])
+        return cls.model_construct(**values)
+    
+    @field_serializer("owned_realms")
+    def serialize_owned_realms(self, owned_realms: Set[str]) -> List[str]:
+        """Serialize owned realms as a sorted list so dumps stay stable and JSON-compatible."""
+        return sorted(owned_realms)
+    
     def add_karma(self, amount: int, reason: str) -> None:
         """Add or subtract karma from the player."""
+        now = datetime.now()
         self.karma += amount
         self.decision_history.append({
             "type": "karma_change",
             "amount": amount,
             "reason": reason,
-            "timestamp": datetime.now()
+            "timestamp": now
         })
-        self.updated_at = datetime.now()
+        self.updated_at = now
     
     def add_realm(self, realm_id: str) -> None:
         """Add a realm to the player's owned realms."""
         if realm_id not in self.owned_realms:
-            self.owned_realms.append(realm_id)
+            self.owned_realms.add(realm_id)
             self.updated_at = datetime.now()
     
     def remove_realm(self, realm_id: str) -> None:
         """Remove a realm from the player's owned realms."""
         if realm_id in self.owned_realms:
-            self.owned_realms.remove(realm_id)
+            self.owned_realms.discard(realm_id)
             self.updated_at = datetime.now()
     
     def add_timeline_connection(self, from_timeline: str, to_timeline: str) -> None:
         """Add a connection between timelines established by this player."""
+        now = datetime.now()
         connection = {
             "from_timeline": from_timeline,
             "to_timeline": to_timeline,
-            "established_at": datetime.now()
+            "established_at": now
         }
         self.timeline_connections.append(connection)
-        self.updated_at = datetime.now()
+        self.updated_at = now
     
     def unlock_technology(self, tech_id: str) -> None:
         """Unlock a new technology in the player's tech tree."""
@@ -102,24 +159,38 @@ class Player(BaseModel):
     
     def add_quest(self, quest_id: str, title: str, description: str) -> None:
         """Add a new quest to the player's quest history."""
+        now = datetime.now()
         self.quest_history.append({
             "quest_id": quest_id,
             "title": title,
             "description": description,
-            "status": "active",
-            "started_at": datetime.now(),
+            "status": STATUS_ACTIVE,
+            "started_at": now,
             "completed_at": None
         })
-        self.updated_at = datetime.now()
+        self._active_quests_by_id.setdefault(quest_id, deque()).append(len(self.quest_history) - 1)
+        self.updated_at = now
     
     def complete_quest(self, quest_id: str, outcome: str, karma_reward: int) -> None:
         """Mark a quest as completed."""
-        for quest in self.quest_history:
-            if quest["quest_id"] == quest_id and quest["status"] == "active":
-                quest["status"] = "completed"
-                quest["outcome"] = outcome
-                quest["karma_reward"] = karma_reward
-                quest["completed_at"] = datetime.now()
-                self.add_karma(karma_reward, f"Completed quest: {quest['title']}")
-                break
-        self.updated_at = datetime.now()
+        now = datetime.now()
+        # Complete the earliest active entry, like the old first-match scan
+        indexes = self._active_quests_by_id.get(quest_id)
+        if indexes:
+            quest = self.quest_history[indexes.popleft()]
+            if not indexes:
+                del self._active_quests_by_id[quest_id]
+            quest["status"] = STATUS_COMPLETED
+            quest["outcome"] = outcome
+            quest["karma_reward"] = karma_reward
+            quest["completed_at"] = now
+            
+            # Same karma change record add_karma writes, stamped with this method's timestamp
+            self.karma += karma_reward
+            self.decision_history.append({
+                "type": "karma_change",
+                "amount": karma_reward,
+                "reason": f"Completed quest: {quest['title']}",
+                "timestamp": now
+            })
+        self.updated_at = now
@@ -4,76 +4,148 @@ Represents a quest in the ChronoCore game.
 """
 
 from typing import List, Dict, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_serializer, field_validator
 from datetime import datetime
+import sys
+
+# Quest statuses, interned so that equality checks against interned values short-circuit on identity
+STATUS_ACTIVE = sys.intern("active")
+STATUS_COMPLETED = sys.intern("completed")
+STATUS_FAILED = sys.intern("failed")
+
+# Expiration turn of quests that never expire, so expiry is a single comparison
+NEVER_EXPIRES = 2**31 - 1
 
 
 class QuestOption(BaseModel):
-    """Represents a possible choice for resolving a quest."""
-    option_id: str = Field(..., description="Unique identifier for this option")
-    description: str = Field(..., description="Description of this option")
-    karma_impact: int = Field(..., description="Impact on player's karma if this option is chosen")
-    tech_impact: int = Field(0, description="Impact on player's tech level if this option is chosen")
-    timeline_impact: Dict = Field(default_factory=dict, description="Impact on timelines if this option is chosen")
-    realm_impact: Dict = Field(default_factory=dict, description="Impact on realms if this option is chosen")
+    """
+    Represents a possible choice for resolving a quest.
+    
+    Attributes:
+        option_id: Unique identifier for this option
+        description: Description of this option
+        karma_impact: Impact on player's karma if this option is chosen
+        tech_impact: Impact on player's tech level if this option is chosen
+        timeline_impact: Impact on timelines if this option is chosen
+        realm_impact: Impact on realms if this option is chosen
+    """
+    __slots__ = ()
+    model_config = ConfigDict(extra="ignore", validate_default=False, validate_assignment=False)
+    
+    option_id: str
+    description: str
+    karma_impact: int
+    tech_impact: int = 0
+    timeline_impact: Dict = Field(default_factory=dict)
+    realm_impact: Dict = Field(default_factory=dict)
 
 
 class QuestOutcome(BaseModel):
-    """Represents the outcome of a completed quest."""
-    description: str = Field(..., description="Description of the outcome")
-    karma_reward: int = Field(..., description="Karma reward for completing the quest")
-    tech_reward: int = Field(0, description="Tech reward for completing the quest")
-    resource_rewards: Dict = Field(default_factory=dict, description="Resources rewarded for completing the quest")
-    timeline_effects: List[Dict] = Field(default_factory=list, description="Effects on timelines")
-    realm_effects: List[Dict] = Field(default_factory=list, description="Effects on realms")
+    """
+    Represents the outcome of a completed quest.
+    
+    Attributes:
+        description: Description of the outcome
+        karma_reward: Karma reward for completing the quest
+        tech_reward: Tech reward for completing the quest
+        resource_rewards: Resources rewarded for completing the quest
+        timeline_effects: Effects on timelines
+        realm_effects: Effects on realms
+    """
+    __slots__ = ()
+    model_config = ConfigDict(extra="ignore", validate_default=False, validate_assignment=False)
+    
+    description: str
+    karma_reward: int
+    tech_reward: int = 0
+    resource_rewards: Dict = Field(default_factory=dict)
+    timeline_effects: List[Dict] = Field(default_factory=list)
+    realm_effects: List[Dict] = Field(default_factory=list)
 
 
 class Quest(BaseModel):
     """
     Represents a quest in the ChronoCore game.
     Quests are AI-generated challenges for players.
+    
+    Attributes:
+        quest_id: Unique identifier for the quest
+        title: Title of the quest
+        description: Description of the quest
+        type: Type of quest (e.g., Ethical, Technical, Diplomatic)
+        difficulty: Difficulty level of the quest (1-5)
+        player_id: ID of the player this quest is assigned to
+        timeline_id: ID of the timeline this quest is associated with
+        realm_id: ID of the realm this quest is associated with
+        options: Possible options for resolving the quest
+        requirements: Requirements to complete the quest
+        outcome: Outcome of the quest if completed
+        status: Status of the quest (active, completed, failed)
+        expiration_turn: Turn number when the quest expires (null if it never expires)
+        completed_at: When the quest was completed
     """
-    quest_id: str = Field(..., description="Unique identifier for the quest")
-    title: str = Field(..., description="Title of the quest")
-    description: str = Field(..., description="Description of the quest")
-    type: str = Field(..., description="Type of quest (e.g., Ethical, Technical, Diplomatic)")
-    difficulty: int = Field(1, description="Difficulty level of the quest (1-5)")
-    player_id: str = Field(..., description="ID of the player this quest is assigned to")
-    timeline_id: Optional[str] = Field(None, description="ID of the timeline this quest is associated with")
-    realm_id: Optional[str] = Field(None, description="ID of the realm this quest is associated with")
-    options: List[QuestOption] = Field(..., description="Possible options for resolving the quest")
-    requirements: Dict = Field(default_factory=dict, description="Requirements to complete the quest")
-    outcome: Optional[QuestOutcome] = Field(None, description="Outcome of the quest if completed")
-    status: str = Field("active", description="Status of the quest (active, completed, failed)")
-    expiration_turn: Optional[int] = Field(None, description="Turn number when the quest expires")
+    __slots__ = ()
+    model_config = ConfigDict(extra="ignore", validate_default=False, validate_assignment=False)
+    
+    quest_id: str
+    title: str
+    description: str
+    type: str
+    difficulty: int = 1
+    player_id: str
+    timeline_id: Optional[str] = None
+    realm_id: Optional[str] = None
+    options: List[QuestOption]
+    requirements: Dict = Field(default_factory=dict)
+    outcome: Optional[QuestOutcome] = None
+    status: str = "active"
+    expiration_turn: int = NEVER_EXPIRES
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
-    completed_at: Optional[datetime] = Field(None, description="When the quest was completed")
+    completed_at: Optional[datetime] = None
+    
+    @field_validator("status")
+    @classmethod
+    def intern_status(cls, status: str) -> str:
+        """Intern the status so it shares identity with the status constants."""
+        return sys.intern(status)
+    
+    @field_validator("expiration_turn", mode="before")
+    @classmethod
+    def default_expiration_turn(cls, expiration_turn: Optional[int]) -> int:
+        """Store a missing expiration turn as the never-expires sentinel."""
+        return NEVER_EXPIRES if expiration_turn is None else expiration_turn
+    
+    @field_serializer("expiration_turn")
+    def serialize_expiration_turn(self, expiration_turn: int) -> Optional[int]:
+        """Serialize the never-expires sentinel back to null."""
+        return None if expiration_turn == NEVER_EXPIRES else expiration_turn
     
     def complete(self, chosen_option_id: str, outcome: QuestOutcome) -> None:
         """Mark the quest as completed with the chosen option and outcome."""
-        self.status = "completed"
+        self.status = STATUS_COMPLETED
         self.outcome = outcome
-        self.completed_at = datetime.now()
-        self.updated_at = datetime.now()
+        now = datetime.now()
+        self.completed_at = now
+        self.updated_at = now
     
     def fail(self, reason: str) -> None:
         """Mark the quest as failed."""
-        self.status = "failed"
+        self.status = STATUS_FAILED
         self.updated_at = datetime.now()
     
     def is_expired(self, current_turn: int) -> bool:
         """Check if the quest has expired."""
-        return self.expiration_turn is not None and current_turn > self.expiration_turn
+        return current_turn > self.expiration_turn
     
     def is_active(self) -> bool:
         """Check if the quest is active."""
-        return self.status == "active"
+        return self.status == STATUS_ACTIVE
     
     def is_completed(self) -> bool:
         """Check if the quest is completed."""
-        return self.status == "completed"
+        return self.status == STATUS_COMPLETED
     
     def is_failed(self) -> bool:
         """Check if the quest is failed."""
-        return self.status == "failed"
+        return self.status == STATUS_FAILED
@@ -3,21 +3,179 @@ Quest Model
 Handles generation of quests and their outcomes for players
 """
 
-import json
 import asyncio
+import re
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 import logging
 import uuid
-from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
-from langchain.chat_models import ChatOpenAI
-from ..data.training.decision_prompts import get_quest_generation_prompt
+import orjson
+from langchain.prompts import ChatPromptTemplate
+from ..data.training.decision_prompts import get_quest_generation_template_raw, get_quest_outcome_prompt
 from ..utils.config import Config
+from ..utils.llm import get_shared_llm
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+# Span from the first "{" to the last "}" of an LLM response
+_JSON_OBJECT_RE = re.compile(rb"\{.*\}", re.DOTALL)
+
+
+def _extract_json_object(text: str) -> Optional[bytes]:
+    """
+    Extract the JSON object embedded in an LLM response.
+    
+    Args:
+        text: Response text
+        
+    Returns:
+        The UTF-8 encoded JSON object text, or None if the response contains none
+    """
+    match = _JSON_OBJECT_RE.search(text.encode())
+    return match.group(0) if match else None
+
+
+# Title, description and type of the fallback quest for each player role
+_FALLBACK_QUESTS = {
+    "Techno Monk": {
+        "title": "Balance of Innovation",
+        "description": "A realm's technological advancement has created unforeseen consequences. You must decide how to guide their development while maintaining ethical balance.",
+        "type": "Ethical"
+    },
+    "Shadow Broker": {
+        "title": "Hidden Knowledge",
+        "description": "You've discovered information that could destabilize a timeline. Determine how to use this knowledge for your advantage without causing a temporal collapse.",
+        "type": "Diplomatic"
+    },
+    "Chrono Diplomat": {
+        "title": "Timeline Negotiation",
+        "description": "Two realms are on the brink of conflict that could create a time rift. Negotiate a resolution that preserves timeline stability.",
+        "type": "Diplomatic"
+    },
+    "Bio-Smith": {
+        "title": "Ecological Crisis",
+        "description": "A realm faces an ecological disaster that threatens their existence. Develop a solution that balances immediate needs with long-term sustainability.",
+        "type": "Technical"
+    }
+}
+
+# Fallback quest for any other role
+_DEFAULT_FALLBACK_QUEST = {
+    "title": "Temporal Anomaly",
+    "description": "A mysterious anomaly has appeared in a nearby realm. Investigate its cause and determine how to address it.",
+    "type": "Temporal"
+}
+
+# Options offered by every fallback quest (copied per quest, since callers may edit them)
+_FALLBACK_OPTIONS = (
+    {
+        "id": 1,
+        "text": "Take direct action to resolve the issue immediately.",
+        "potential_outcome": "Quick resolution but potential unforeseen consequences."
+    },
+    {
+        "id": 2,
+        "text": "Gather more information before deciding on a course of action.",
+        "potential_outcome": "Better understanding but the situation may worsen while you investigate."
+    },
+    {
+        "id": 3,
+        "text": "Collaborate with other players to find a solution.",
+        "potential_outcome": "Combined resources but shared responsibility for outcomes."
+    }
+)
+
+
+def _find_option(options: List[Dict[str, Any]], option_id: Any) -> Optional[Dict[str, Any]]:
+    """
+    Find a quest option by ID.
+    
+    Args:
+        options: Options of the quest
+        option_id: ID of the option to find
+        
+    Returns:
+        The option, or None if the quest has no option with this ID
+    """
+    # Option IDs are normally their 1-based position, so check that slot before scanning
+    if isinstance(option_id, int) and 0 < option_id <= len(options):
+        option = options[option_id - 1]
+        if option.get("id") == option_id:
+            return option
+    
+    for option in options:
+        if option.get("id") == option_id:
+            return option
+    
+    return None
+
+
+def _normalize_option(index: int, option: Any) -> Dict[str, Any]:
+    """
+    Ensure a quest option has an ID, text and potential outcome.
+    
+    Args:
+        index: Position of the option in the quest
+        option: Option as returned by the LLM
+        
+    Returns:
+        The option with any missing field filled in
+    """
+    if not isinstance(option, dict):
+        return {
+            "id": index + 1,
+            "text": "Take action",
+            "potential_outcome": "Unknown consequences"
+        }
+    
+    # Defaults first, so the option's own values (and any extra fields) win
+    return {
+        "id": index + 1,
+        "text": f"Option {index + 1}",
+        "potential_outcome": "Unknown consequences",
+        **option
+    }
+
+
+# Values of the quest fields an LLM response may leave out
+_QUEST_DEFAULTS = {
+    "title": "Mysterious Quest",
+    "description": "A mysterious challenge awaits you.",
+    "type": "General",
+    "difficulty": 2
+}
+
+# Options of a quest generated without any
+_DEFAULT_QUEST_OPTIONS = (
+    {
+        "id": 1,
+        "text": "Accept the challenge",
+        "potential_outcome": "Unknown consequences await"
+    },
+    {
+        "id": 2,
+        "text": "Decline the challenge",
+        "potential_outcome": "Opportunity lost, but safety preserved"
+    }
+)
+
+_VALID_QUEST_TYPES = frozenset({"Ethical", "Technical", "Diplomatic", "Temporal", "General"})
+
+
+@lru_cache(maxsize=1)
+def _get_quest_prompt() -> ChatPromptTemplate:
+    """Get the quest generation prompt, built once per process."""
+    # The static instructions go in the system message so the provider can reuse its cached prefix
+    prefix, suffix = get_quest_generation_template_raw()
+    return ChatPromptTemplate.from_messages([
+        ("system", prefix),
+        ("human", suffix)
+    ])
+
+
 class QuestModel:
     """Model for generating player quests"""
     
@@ -26,27 +184,13 @@ class QuestModel:
         # Load configuration
         self.config = Config.get_openai_config()
         self.game_config = Config.get_game_config()
+        self._karma_lo, self._karma_hi = self.game_config["karma_range"]
         
-        # Initialize OpenAI LLM
-        self.llm = ChatOpenAI(
-            model_name=self.config["model"],
-            temperature=self.config["temperature"],
-            openai_api_key=self.config["api_key"]
-        )
+        # Use the OpenAI LLM client shared by every model with this configuration
+        self.llm = get_shared_llm(self.config["model"], self.config["temperature"], self.config["api_key"])
         
-        # Create quest generation chain
-        self.quest_template = PromptTemplate(
-            input_variables=["player_id", "player_role", "player_karma", 
-                           "player_realms", "current_era", "current_turn", 
-                           "timeline_stability", "recent_events"],
-            template=get_quest_generation_prompt({}, {})
-        )
-        
-        self.quest_chain = LLMChain(
-            llm=self.llm,
-            prompt=self.quest_template,
-            verbose=True
-        )
+        # Use the quest generation prompt shared by every quest model
+        self.quest_template = _get_quest_prompt()
         
         logger.info("Quest model initialized")
     
@@ -65,14 +209,14 @@ class QuestModel:
         """
         try:
             # Format player realms
-            player_realms = ", ".join([r.get("name", "Unknown Realm") for r in player_data.get("realms", [])])
+            player_realms = ", ".join([r.get("name", "Unknown Realm") for r in player_data.get("realms", ())])
             
             # Format recent events
-            recent_events = "\n".join([f"- {e.get('description', '')}" for e in game_data.get("recent_events", [])])
+            event_descriptions = [e.get("description", "") for e in game_data.get("recent_events", ())]
+            recent_events = "- " + "\n- ".join(event_descriptions) if event_descriptions else ""
             
-            # Run the quest generation chain
-            quest_text = await asyncio.to_thread(
-                self.quest_chain.run,
+            # Run the quest generation prompt on the async client so concurrent quests overlap
+            messages = self.quest_template.format_messages(
                 player_id=player_data.get("id", "unknown"),
                 player_role=player_data.get("role", "unknown"),
                 player_karma=player_data.get("karma", 0),
@@ -82,21 +226,21 @@ class QuestModel:
                 timeline_stability=game_data.get("timeline_stability", 100),
                 recent_events=recent_events or "No recent events"
             )
+            response = await self.llm.ainvoke(messages)
+            quest_text = response.content
             
             # Parse the quest
             try:
                 # Extract JSON from the response
-                json_start = quest_text.find('{')
-                json_end = quest_text.rfind('}') + 1
+                quest_json = _extract_json_object(quest_text)
                 
-                if json_start >= 0 and json_end > json_start:
-                    quest_json = quest_text[json_start:json_end]
-                    quest = json.loads(quest_json)
+                if quest_json is not None:
+                    quest = orjson.loads(quest_json)
                 else:
                     # Fallback if JSON parsing fails
                     logger.warning("Failed to extract JSON from quest text")
                     quest = self._create_fallback_quest(player_data)
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 logger.error("Failed to parse quest JSON")
                 quest = self._create_fallback_quest(player_data)
             
@@ -114,6 +258,25 @@ class QuestModel:
             logger.error(f"Error generating quest: {str(e)}")
             return self._create_fallback_quest(player_data)
     
+    async def generate_quests_batch(self, 
+                                    players: List[Dict[str, Any]], 
+                                    game_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Generate quests for several players concurrently
+        
+        Args:
+            players: Player information for each player
+            game_data: Game state information
+            
+        Returns:
+            Generated quests, in the same order as the players
+        """
+        # LLM calls of different players overlap instead of running one after another
+        return await asyncio.gather(*[
+            self.generate_quest(player_data, game_data)
+            for player_data in players
+        ])
+    
     def _create_fallback_quest(self, player_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Create a fallback quest when generation fails
@@ -124,56 +287,13 @@ class QuestModel:
         Returns:
             Fallback quest
         """
-        role = player_data.get("role", "Architect")
-        
-        # Create quest based on player role
-        if role == "Techno Monk":
-            title = "Balance of Innovation"
-            description = "A realm's technological advancement has created unforeseen consequences. You must decide how to guide their development while maintaining ethical balance."
-            quest_type = "Ethical"
-        elif role == "Shadow Broker":
-            title = "Hidden Knowledge"
-            description = "You've discovered information that could destabilize a timeline. Determine how to use this knowledge for your advantage without causing a temporal collapse."
-            quest_type = "Diplomatic"
-        elif role == "Chrono Diplomat":
-            title = "Timeline Negotiation"
-            description = "Two realms are on the brink of conflict that could create a time rift. Negotiate a resolution that preserves timeline stability."
-            quest_type = "Diplomatic"
-        elif role == "Bio-Smith":
-            title = "Ecological Crisis"
-            description = "A realm faces an ecological disaster that threatens their existence. Develop a solution that balances immediate needs with long-term sustainability."
-            quest_type = "Technical"
-        else:
-            title = "Temporal Anomaly"
-            description = "A mysterious anomaly has appeared in a nearby realm. Investigate its cause and determine how to address it."
-            quest_type = "Temporal"
-        
-        # Create options
-        options = [
-            {
-                "id": 1,
-                "text": "Take direct action to resolve the issue immediately.",
-                "potential_outcome": "Quick resolution but potential unforeseen consequences."
-            },
-            {
-                "id": 2,
-                "text": "Gather more information before deciding on a course of action.",
-                "potential_outcome": "Better understanding but the situation may worsen while you investigate."
-            },
-            {
-                "id": 3,
-                "text": "Collaborate with other players to find a solution.",
-                "potential_outcome": "Combined resources but shared responsibility for outcomes."
-            }
-        ]
+        template = _FALLBACK_QUESTS.get(player_data.get("role"), _DEFAULT_FALLBACK_QUEST)
         
         return {
             "id": str(uuid.uuid4()),
-            "title": title,
-            "description": description,
-            "type": quest_type,
+            **template,
             "difficulty": 2,
-            "options": options,
+            "options": [dict(option) for option in _FALLBACK_OPTIONS],
             "player_id": player_data.get("id", "unknown"),
             "created_at": 1,
             "era": "Initiation"
@@ -186,74 +306,26 @@ class QuestModel:
         Args:
             quest: Quest to validate
         """
-        # Ensure required fields exist
-        required_fields = ["title", "description", "type", "difficulty", "options"]
-        for field in required_fields:
+        # Fill in missing scalar fields
+        for field, default in _QUEST_DEFAULTS.items():
             if field not in quest:
-                if field == "title":
-                    quest["title"] = "Mysterious Quest"
-                elif field == "description":
-                    quest["description"] = "A mysterious challenge awaits you."
-                elif field == "type":
-                    quest["type"] = "General"
-                elif field == "difficulty":
-                    quest["difficulty"] = 2
-                elif field == "options":
-                    quest["options"] = [
-                        {
-                            "id": 1,
-                            "text": "Accept the challenge",
-                            "potential_outcome": "Unknown consequences await"
-                        },
-                        {
-                            "id": 2,
-                            "text": "Decline the challenge",
-                            "potential_outcome": "Opportunity lost, but safety preserved"
-                        }
-                    ]
+                quest[field] = default
         
         # Validate quest type
-        valid_types = ["Ethical", "Technical", "Diplomatic", "Temporal", "General"]
-        if quest["type"] not in valid_types:
+        if quest["type"] not in _VALID_QUEST_TYPES:
             quest["type"] = "General"
         
         # Validate difficulty
         if not isinstance(quest["difficulty"], int) or quest["difficulty"] < 1 or quest["difficulty"] > 5:
             quest["difficulty"] = 2
         
-        # Validate options
-        if not isinstance(quest["options"], list) or len(quest["options"]) == 0:
-            quest["options"] = [
-                {
-                    "id": 1,
-                    "text": "Accept the challenge",
-                    "potential_outcome": "Unknown consequences await"
-                },
-                {
-                    "id": 2,
-                    "text": "Decline the challenge",
-                    "potential_outcome": "Opportunity lost, but safety preserved"
-                }
-            ]
+        # Validate options (a missing options list gets the default options too)
+        options = quest.get("options")
+        if not isinstance(options, list) or len(options) == 0:
+            quest["options"] = [dict(option) for option in _DEFAULT_QUEST_OPTIONS]
         
         # Ensure each option has required fields
-        for i, option in enumerate(quest["options"]):
-            if not isinstance(option, dict):
-                quest["options"][i] = {
-                    "id": i + 1,
-                    "text": "Take action",
-                    "potential_outcome": "Unknown consequences"
-                }
-                continue
-            
-            if "id" not in option:
-                option["id"] = i + 1
-            
-            if "text" not in option:
-                option["text"] = f"Option {i + 1}"
-            
-            if "potential_outcome" not in option:
-                option["potential_outcome"] = "Unknown consequences"
+        quest["options"] = [_normalize_option(i, option) for i, option in enumerate(quest["options"])]
     
     async def evaluate_quest_outcome(self, 
                                    quest: Dict[str, Any], 
@@ -274,88 +346,43 @@ class QuestModel:
         """
         try:
             # Find the selected option
-            selected_option = None
-            for option in quest.get("options", []):
-                if option.get("id") == selected_option_id:
-                    selected_option = option
-                    break
+            selected_option = _find_option(quest.get("options", []), selected_option_id)
             
             if not selected_option:
                 logger.warning(f"Selected option {selected_option_id} not found in quest {quest.get('id')}")
                 # Use the first option as fallback
                 selected_option = quest.get("options", [{}])[0]
             
-            # Create prompt for outcome evaluation
-            prompt = f"""
-            You are the AI engine for ChronoCore: Path of Realities, a game about time manipulation and ethical choices.
-            Your task is to evaluate the outcome of a player's quest choice.
-
-            ## Player Information
-            - Player ID: {player_data.get('id', 'unknown')}
-            - Player Role: {player_data.get('role', 'unknown')}
-            - Current Karma: {player_data.get('karma', 0)}
-
-            ## Game Context
-            - Current Era: {game_data.get('current_era', 'Initiation')}
-            - Current Turn: {game_data.get('current_turn', 1)}
-
-            ## Quest Information
-            - Title: {quest.get('title', 'Unknown Quest')}
-            - Description: {quest.get('description', 'No description')}
-            - Type: {quest.get('type', 'General')}
-            - Difficulty: {quest.get('difficulty', 2)}
-
-            ## Selected Option
-            {selected_option.get('text', 'Unknown option')}
-
-            ## Evaluation Instructions
-            1. Generate a detailed outcome based on the player's choice
-            2. Determine the karma impact of this choice (between -10 and +10)
-            3. Describe any effects on realms, timelines, or other players
-            4. Assign rewards or consequences based on the choice
-
-            ## Response Format
-            Provide your evaluation in the following JSON format:
-            ```
-            {{
-              "outcome_description": "Detailed description of what happens as a result of this choice",
-              "karma_impact": integer_between_minus_10_and_plus_10,
-              "realm_effects": "Description of how realms are affected",
-              "timeline_effects": "Description of how timelines are affected",
-              "rewards": ["list", "of", "rewards"],
-              "consequences": ["list", "of", "consequences"]
-            }}
-            ```
-
-            Make the outcome engaging, fair, and consistent with the game world.
-            """
+            # Create prompt for outcome evaluation (static instructions as the system message)
+            system_prompt, outcome_prompt = get_quest_outcome_prompt(quest, selected_option, player_data, game_data)
             
             # Run the evaluation
-            outcome_text = await asyncio.to_thread(
-                self.llm.predict,
-                prompt
-            )
+            response = await self.llm.ainvoke([("system", system_prompt), ("human", outcome_prompt)])
+            outcome_text = response.content
             
             # Parse the outcome
             try:
                 # Extract JSON from the response
-                json_start = outcome_text.find('{')
-                json_end = outcome_text.rfind('}') + 1
+                outcome_json = _extract_json_object(outcome_text)
                 
-                if json_start >= 0 and json_end > json_start:
-                    outcome_json = outcome_text[json_start:json_end]
-                    outcome = json.loads(outcome_json)
+                if outcome_json is not None:
+                    outcome = orjson.loads(outcome_json)
                 else:
                     # Fallback if JSON parsing fails
                     logger.warning("Failed to extract JSON from outcome text")
                     outcome = self._create_fallback_outcome(quest, selected_option)
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 logger.error("Failed to parse outcome JSON")
                 outcome = self._create_fallback_outcome(quest, selected_option)
             
             # Ensure karma impact is within bounds
-            karma_range = self.game_config["karma_range"]
-            outcome["karma_impact"] = max(min(outcome.get("karma_impact", 0), karma_range[1]), karma_range[0])
+            karma = outcome.get("karma_impact", 0)
+            if karma < self._karma_lo:
+                outcome["karma_impact"] = self._karma_lo
+            elif karma > self._karma_hi:
+                outcome["karma_impact"] = self._karma_hi
+            else:
+                outcome["karma_impact"] = karma
             
             # Add metadata
             outcome["quest_id"] = quest.get("id")
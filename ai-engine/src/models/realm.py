@@ -3,31 +3,67 @@ Realm Model
 Represents a realm (hexagonal tile) in the ChronoCore game.
 """
 
-from typing import List, Dict, Optional
-from pydantic import BaseModel, Field
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Set
+from pydantic import ConfigDict, TypeAdapter, field_serializer
 from datetime import datetime
+import sys
 
+# Slotted instances where the interpreter supports it (Python 3.10+)
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-class Realm(BaseModel):
+
+@dataclass(**_DATACLASS_OPTIONS)
+class Realm:
     """
     Represents a realm (hexagonal tile) in the ChronoCore game.
     Realms are the basic units of the game board.
+    
+    A plain dataclass, so the game logic mutates it without Pydantic in the way; input is
+    validated where it enters the engine (request bodies, GameState fields, REALM_ADAPTER).
+    
+    Attributes:
+        realm_id: Unique identifier for the realm
+        name: Name of the realm
+        description: Description of the realm
+        type: Type of realm (e.g., Urban, Natural, Technological)
+        timeline_id: ID of the timeline this realm belongs to
+        position: Position of the realm on the board (x, y coordinates)
+        owner_id: ID of the player who owns this realm
+        development_level: Development level of the realm (1-5)
+        resources: Resources available in this realm
+        structures: Structures built in this realm
+        events: Events that have occurred in this realm
+        ethical_dilemmas: Ethical dilemmas associated with this realm
+        adjacent_realms: IDs of realms adjacent to this one
     """
-    realm_id: str = Field(..., description="Unique identifier for the realm")
-    name: str = Field(..., description="Name of the realm")
-    description: str = Field(..., description="Description of the realm")
-    type: str = Field(..., description="Type of realm (e.g., Urban, Natural, Technological)")
-    timeline_id: str = Field(..., description="ID of the timeline this realm belongs to")
-    position: Dict = Field(..., description="Position of the realm on the board (x, y coordinates)")
-    owner_id: Optional[str] = Field(None, description="ID of the player who owns this realm")
-    development_level: int = Field(1, description="Development level of the realm (1-5)")
-    resources: Dict = Field(default_factory=dict, description="Resources available in this realm")
-    structures: List[Dict] = Field(default_factory=list, description="Structures built in this realm")
-    events: List[Dict] = Field(default_factory=list, description="Events that have occurred in this realm")
-    ethical_dilemmas: List[Dict] = Field(default_factory=list, description="Ethical dilemmas associated with this realm")
-    adjacent_realms: List[str] = Field(default_factory=list, description="IDs of realms adjacent to this one")
-    created_at: datetime = Field(default_factory=datetime.now)
-    updated_at: datetime = Field(default_factory=datetime.now)
+    __pydantic_config__ = ConfigDict(extra="ignore", validate_default=False)
+    
+    realm_id: str
+    name: str
+    description: str
+    type: str
+    timeline_id: str
+    position: Dict
+    owner_id: Optional[str] = None
+    development_level: int = 1
+    resources: Dict = field(default_factory=dict)
+    structures: List[Dict] = field(default_factory=list)
+    events: List[Dict] = field(default_factory=list)
+    ethical_dilemmas: List[Dict] = field(default_factory=list)
+    adjacent_realms: Set[str] = field(default_factory=set)
+    created_at: datetime = field(default_factory=datetime.now)
+    updated_at: datetime = field(default_factory=datetime.now)
+    
+    def __post_init__(self) -> None:
+        """Accept adjacent realm IDs given as a list (e.g., from a stored document)."""
+        if not isinstance(self.adjacent_realms, set):
+            self.adjacent_realms = set(self.adjacent_realms)
+    
+    @field_serializer("adjacent_realms")
+    def serialize_adjacent_realms(self, adjacent_realms: Set[str]) -> List[str]:
+        """Serialize adjacent realm IDs as a sorted list so dumps stay stable and JSON-compatible."""
+        return sorted(adjacent_realms)
     
     def set_owner(self, player_id: Optional[str]) -> None:
         """Set the owner of this realm."""
@@ -36,14 +72,15 @@ class Realm(BaseModel):
     
     def add_structure(self, structure_type: str, name: str, effects: Dict) -> None:
         """Add a new structure to the realm."""
+        now = datetime.now()
         structure = {
             "type": structure_type,
             "name": name,
             "effects": effects,
-            "built_at": datetime.now()
+            "built_at": now
         }
         self.structures.append(structure)
-        self.updated_at = datetime.now()
+        self.updated_at = now
     
     def remove_structure(self, structure_index: int) -> None:
         """Remove a structure from the realm."""
@@ -53,25 +90,27 @@ class Realm(BaseModel):
     
     def add_event(self, event_type: str, description: str, impact: Dict) -> None:
         """Add a new event to the realm's history."""
+        now = datetime.now()
         self.events.append({
             "event_type": event_type,
             "description": description,
             "impact": impact,
-            "timestamp": datetime.now()
+            "timestamp": now
         })
-        self.updated_at = datetime.now()
+        self.updated_at = now
     
     def add_ethical_dilemma(self, title: str, description: str, options: List[Dict]) -> None:
         """Add a new ethical dilemma to the realm."""
+        now = datetime.now()
         dilemma = {
             "title": title,
             "description": description,
             "options": options,
             "resolved": False,
-            "created_at": datetime.now()
+            "created_at": now
         }
         self.ethical_dilemmas.append(dilemma)
-        self.updated_at = datetime.now()
+        self.updated_at = now
     
     def resolve_ethical_dilemma(self, dilemma_index: int, chosen_option_index: int, 
                                 player_id: str, outcome: str) -> None:
@@ -82,8 +121,9 @@ class Realm(BaseModel):
             dilemma["resolved_by"] = player_id
             dilemma["chosen_option"] = chosen_option_index
             dilemma["outcome"] = outcome
-            dilemma["resolved_at"] = datetime.now()
-            self.updated_at = datetime.now()
+            now = datetime.now()
+            dilemma["resolved_at"] = now
+            self.updated_at = now
     
     def increase_development(self) -> bool:
         """
@@ -99,5 +139,18 @@ class Realm(BaseModel):
     def add_adjacent_realm(self, realm_id: str) -> None:
         """Add an adjacent realm to this realm."""
         if realm_id not in self.adjacent_realms:
-            self.adjacent_realms.append(realm_id)
+            self.adjacent_realms.add(realm_id)
             self.updated_at = datetime.now()
+    
+    def to_json_bytes(self) -> bytes:
+        """
+        Serialize the realm straight to JSON bytes, without building an intermediate dict.
+        
+        Returns:
+            The realm as UTF-8 encoded JSON
+        """
+        return REALM_ADAPTER.dump_json(self)
+
+
+# Validates and serializes realms at the engine boundary
+REALM_ADAPTER = TypeAdapter(Realm)
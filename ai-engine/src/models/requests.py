@@ -0,0 +1,84 @@
+"""
+Request Models
+Typed request bodies for the AI engine API endpoints.
+Bodies of the highest-traffic endpoints are msgspec structs, decoded straight from the raw JSON bytes.
+"""
+
+from typing import Annotated, Any, List, Dict, Optional
+import msgspec
+from pydantic import BaseModel, ConfigDict, Field
+
+from .game_state import GameState
+from .realm import Realm
+
+
+class EvaluateDecisionRequest(msgspec.Struct):
+    """Request body for evaluating a player's decision."""
+    
+    player_id: Annotated[str, msgspec.Meta(description="ID of the player making the decision")]
+    decision: Annotated[str, msgspec.Meta(description="The decision text")]
+    context: Annotated[Dict[str, Any], msgspec.Meta(description="Additional context about the decision")]
+
+
+class CalculateKarmaRequest(msgspec.Struct):
+    """Request body for calculating karma over a series of actions."""
+    
+    player_id: Annotated[str, msgspec.Meta(description="ID of the player")]
+    actions: Annotated[List[Dict[str, Any]], msgspec.Meta(description="Actions with their decision and evaluation")]
+
+
+class TimelineRequest(BaseModel):
+    """Request body for endpoints operating on a single timeline."""
+    model_config = ConfigDict(extra="ignore")
+    
+    timeline_id: str = Field(..., description="ID of the timeline")
+    game_state: GameState = Field(..., description="Current game state")
+
+
+class RealmRequest(BaseModel):
+    """Request body for endpoints operating on a single realm."""
+    model_config = ConfigDict(extra="ignore")
+    
+    realm: Realm = Field(..., description="The realm")
+    game_state: GameState = Field(..., description="Current game state")
+
+
+class RealmEventRequest(BaseModel):
+    """Request body for processing an event affecting a realm."""
+    model_config = ConfigDict(extra="ignore")
+    
+    realm: Realm = Field(..., description="The realm affected by the event")
+    event_type: str = Field(..., description="Type of event (e.g., disaster, discovery, cultural_shift)")
+    event_data: Dict[str, Any] = Field(..., description="Data specific to the event")
+    game_state: GameState = Field(..., description="Current game state")
+
+
+class NewGameRequest(BaseModel):
+    """Request body for creating a new game."""
+    model_config = ConfigDict(extra="ignore")
+    
+    players: List[Dict[str, Any]] = Field(..., description="Player data for each player in the game")
+    settings: Optional[Dict[str, Any]] = Field(None, description="Optional game settings")
+
+
+class SimilarContextsRequest(BaseModel):
+    """Request body for semantic search over game contexts."""
+    model_config = ConfigDict(extra="ignore")
+    
+    query: str = Field(..., description="Query text")
+    top_k: int = Field(5, description="Number of results to return")
+
+
+class CompareTextsRequest(msgspec.Struct):
+    """Request body for comparing two texts."""
+    
+    text_a: Annotated[str, msgspec.Meta(description="First text")]
+    text_b: Annotated[str, msgspec.Meta(description="Second text")]
+
+
+class TrainingExampleRequest(BaseModel):
+    """Request body for adding a training example."""
+    model_config = ConfigDict(extra="ignore")
+    
+    input_data: Dict[str, Any] = Field(..., description="Input data for the example")
+    output_data: Dict[str, Any] = Field(..., description="Output/target data for the example")
@@ -3,36 +3,71 @@ Timeline Model
 Represents a timeline in the ChronoCore game.
 """
 
-from typing import List, Dict, Optional
-from pydantic import BaseModel, Field
+from dataclasses import dataclass, field
+from typing import List, Dict, Set
+from pydantic import ConfigDict, TypeAdapter, field_serializer
 from datetime import datetime
+import sys
 
+# Slotted instances where the interpreter supports it (Python 3.10+)
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-class Timeline(BaseModel):
+
+@dataclass(**_DATACLASS_OPTIONS)
+class Timeline:
     """
     Represents a timeline in the ChronoCore game.
     Each timeline contains multiple realms and has its own properties.
+    
+    Like Realm, a plain dataclass validated only where it enters the engine.
+    
+    Attributes:
+        timeline_id: Unique identifier for the timeline
+        name: Name of the timeline
+        description: Description of the timeline
+        type: Type of timeline (e.g., Utopia, Dystopia, Tech Empire)
+        stability: Stability of the timeline (0-100)
+        tech_level: Technology level of the timeline (1-10)
+        karma_alignment: Karma alignment of the timeline (-100 to 100)
+        realms: IDs of realms within this timeline
+        events: Events that have occurred in this timeline
+        connected_timelines: IDs of timelines connected to this one
     """
-    timeline_id: str = Field(..., description="Unique identifier for the timeline")
-    name: str = Field(..., description="Name of the timeline")
-    description: str = Field(..., description="Description of the timeline")
-    type: str = Field(..., description="Type of timeline (e.g., Utopia, Dystopia, Tech Empire)")
-    stability: int = Field(100, description="Stability of the timeline (0-100)")
-    tech_level: int = Field(1, description="Technology level of the timeline (1-10)")
-    karma_alignment: int = Field(0, description="Karma alignment of the timeline (-100 to 100)")
-    realms: List[str] = Field(default_factory=list, description="IDs of realms within this timeline")
-    events: List[Dict] = Field(default_factory=list, description="Events that have occurred in this timeline")
-    connected_timelines: List[str] = Field(default_factory=list, description="IDs of timelines connected to this one")
-    created_at: datetime = Field(default_factory=datetime.now)
-    updated_at: datetime = Field(default_factory=datetime.now)
+    __pydantic_config__ = ConfigDict(extra="ignore", validate_default=False)
+    
+    timeline_id: str
+    name: str
+    description: str
+    type: str
+    stability: int = 100
+    tech_level: int = 1
+    karma_alignment: int = 0
+    realms: Set[str] = field(default_factory=set)
+    events: List[Dict] = field(default_factory=list)
+    connected_timelines: Set[str] = field(default_factory=set)
+    created_at: datetime = field(default_factory=datetime.now)
+    updated_at: datetime = field(default_factory=datetime.now)
+    
+    def __post_init__(self) -> None:
+        """Accept realm and timeline IDs given as lists (e.g., from a stored document)."""
+        if not isinstance(self.realms, set):
+            self.realms = set(self.realms)
+        if not isinstance(self.connected_timelines, set):
+            self.connected_timelines = set(self.connected_timelines)
+    
+    @field_serializer("realms", "connected_timelines")
+    def serialize_id_sets(self, ids: Set[str]) -> List[str]:
+        """Serialize ID sets as sorted lists so dumps stay stable and JSON-compatible."""
+        return sorted(ids)
     
     def add_event(self, event_type: str, description: str, impact: Dict) -> None:
         """Add a new event to the timeline's history."""
+        now = datetime.now()
         self.events.append({
             "event_type": event_type,
             "description": description,
             "impact": impact,
-            "timestamp": datetime.now()
+            "timestamp": now
         })
         
         # Apply impact to timeline properties
@@ -43,30 +78,30 @@ class Timeline(BaseModel):
         if "karma_alignment" in impact:
             self.karma_alignment = max(-100, min(100, self.karma_alignment + impact["karma_alignment"]))
             
-        self.updated_at = datetime.now()
+        self.updated_at = now
     
     def add_realm(self, realm_id: str) -> None:
         """Add a realm to this timeline."""
         if realm_id not in self.realms:
-            self.realms.append(realm_id)
+            self.realms.add(realm_id)
             self.updated_at = datetime.now()
     
     def remove_realm(self, realm_id: str) -> None:
         """Remove a realm from this timeline."""
         if realm_id in self.realms:
-            self.realms.remove(realm_id)
+            self.realms.discard(realm_id)
             self.updated_at = datetime.now()
     
     def connect_timeline(self, timeline_id: str) -> None:
         """Connect this timeline to another timeline."""
         if timeline_id not in self.connected_timelines:
-            self.connected_timelines.append(timeline_id)
+            self.connected_timelines.add(timeline_id)
             self.updated_at = datetime.now()
     
     def disconnect_timeline(self, timeline_id: str) -> None:
         """Disconnect this timeline from another timeline."""
         if timeline_id in self.connected_timelines:
-            self.connected_timelines.remove(timeline_id)
+            self.connected_timelines.discard(timeline_id)
             self.updated_at = datetime.now()
     
     def is_stable(self) -> bool:
@@ -76,3 +111,16 @@ class Timeline(BaseModel):
     def is_collapsing(self) -> bool:
         """Check if the timeline is in danger of collapsing."""
         return self.stability < 25
+    
+    def to_json_bytes(self) -> bytes:
+        """
+        Serialize the timeline straight to JSON bytes, without building an intermediate dict.
+        
+        Returns:
+            The timeline as UTF-8 encoded JSON
+        """
+        return TIMELINE_ADAPTER.dump_json(self)
+
+
+# Validates and serializes timelines at the engine boundary
+TIMELINE_ADAPTER = TypeAdapter(Timeline)
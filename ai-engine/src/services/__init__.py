@@ -2,12 +2,24 @@
 Services Package for ChronoCore AI Engine
 """
 
-from .story_generator import StoryGenerator
-from .decision_engine import DecisionEngine
-from .karma_calculator import KarmaCalculator
+import importlib
+
+# Services are imported on first attribute access so that importing one service
+# (or this package) does not load the LangChain dependencies of the others
+_SERVICE_MODULES = {
+    'StoryGenerator': '.story_generator',
+    'DecisionEngine': '.decision_engine',
+    'KarmaCalculator': '.karma_calculator'
+}
 
 __all__ = [
     'StoryGenerator',
     'DecisionEngine',
     'KarmaCalculator'
 ]
+
+
+def __getattr__(name):
+    if name in _SERVICE_MODULES:
+        return getattr(importlib.import_module(_SERVICE_MODULES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
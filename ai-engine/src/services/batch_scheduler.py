@@ -0,0 +1,204 @@
+"""
+Batch Scheduler Service
+Coalesces concurrent LLM requests into micro-batches before dispatching them to their handlers.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+import asyncio
+import logging
+
+from ..utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Handlers return one result per payload, in order; an exception in place of a result fails only that request
+BatchHandler = Callable[[List[Any]], Awaitable[List[Any]]]
+
+
+class BatchScheduler:
+    """
+    Service for micro-batching concurrent requests of the same kind.
+    Requests are queued and drained by a background worker, which hands each group of up to
+    `max_batch` items to its handler. A request that arrives to an empty queue is dispatched
+    at once; only when others are already queued does the worker wait up to `max_wait_ms`
+    for the batch to fill.
+    Batching bounds how many requests are dispatched at once; it does not reduce the
+    number of provider calls unless a handler can serve a whole batch in one call.
+    """
+    
+    def __init__(self, max_batch: Optional[int] = None, max_wait_ms: Optional[int] = None):
+        """
+        Initialize the batch scheduler.
+        
+        Args:
+            max_batch: Maximum number of requests per batch (defaults to Config.BATCH_MAX_SIZE)
+            max_wait_ms: Maximum time to wait for a batch to fill (defaults to Config.BATCH_MAX_WAIT_MS)
+        """
+        self.max_batch = max(1, max_batch or Config.BATCH_MAX_SIZE)
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else Config.BATCH_MAX_WAIT_MS) / 1000
+        self.handlers: Dict[str, BatchHandler] = {}
+        self.queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._batch: List[Tuple[str, Any, asyncio.Future]] = []  # Requests taken off the queue but not yet dispatched
+        self._tasks: Set[asyncio.Task] = set()  # In-flight batch dispatches
+    
+    def register(self, kind: str, handler: BatchHandler) -> None:
+        """
+        Register a batch handler for a request kind.
+        
+        Args:
+            kind: Name of the request kind (e.g., "generate_story")
+            handler: Coroutine taking a list of payloads and returning a result (or exception)
+                for each, in the same order
+        """
+        self.handlers[kind] = handler
+    
+    async def start(self) -> None:
+        """Start the background batching worker."""
+        if self._worker is not None:
+            return
+        
+        self.queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+        logger.info(f"Batch scheduler started (max_batch={self.max_batch}, max_wait_ms={self.max_wait * 1000:.0f})")
+    
+    async def stop(self) -> None:
+        """Stop the background worker and fail any requests still queued."""
+        if self._worker is None:
+            return
+        
+        await self._cancel_worker()
+        
+        for _, _, future in self._take_pending():
+            if not future.done():
+                future.set_exception(RuntimeError("Batch scheduler stopped"))
+        
+        logger.info("Batch scheduler stopped")
+    
+    async def flush(self) -> None:
+        """Dispatch all queued requests now and wait for every in-flight batch to finish."""
+        if self._worker is None:
+            return
+        
+        # Pause the worker so it cannot hold back a partially filled batch
+        await self._cancel_worker()
+        
+        self._dispatch_groups(self._take_pending())
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        
+        self._worker = asyncio.create_task(self._run())
+    
+    async def _cancel_worker(self) -> None:
+        """Cancel the background worker and wait for it to exit."""
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        
+        self._worker = None
+    
+    def _take_pending(self) -> List[Tuple[str, Any, asyncio.Future]]:
+        """Remove and return every request not yet dispatched."""
+        pending, self._batch = self._batch, []
+        while not self.queue.empty():
+            pending.append(self.queue.get_nowait())
+        return pending
+    
+    async def submit(self, kind: str, payload: Any) -> Any:
+        """
+        Submit a request and wait for its result.
+        
+        Args:
+            kind: Name of the request kind
+            payload: Payload passed to the handler as part of a batch
+        
+        Returns:
+            The handler's result for this payload
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"No batch handler registered for {kind}")
+        
+        # Dispatch directly if the worker is not running (e.g., outside the app lifespan)
+        if self._worker is None:
+            results = await self.handlers[kind]([payload])
+            if not results:
+                raise RuntimeError(f"Batch handler for {kind} returned no result")
+            if isinstance(results[0], BaseException):
+                raise results[0]
+            return results[0]
+        
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((kind, payload, future))
+        return await future
+    
+    async def _run(self) -> None:
+        """Drain the queue into batches and dispatch them until cancelled."""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            self._batch.append(await self.queue.get())
+            
+            # A lone request is dispatched right away rather than waiting for company
+            deadline = loop.time() + (0 if self.queue.empty() else self.max_wait)
+            
+            while len(self._batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    self._batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            batch, self._batch = self._batch, []
+            self._dispatch_groups(batch)
+    
+    def _dispatch_groups(self, batch: List[Tuple[str, Any, asyncio.Future]]) -> None:
+        """
+        Group requests by kind and dispatch each group without blocking the next drain.
+        
+        Args:
+            batch: List of (kind, payload, future) requests
+        """
+        groups: Dict[str, List[Tuple[Any, asyncio.Future]]] = {}
+        for kind, payload, future in batch:
+            groups.setdefault(kind, []).append((payload, future))
+        
+        for kind, items in groups.items():
+            task = asyncio.create_task(self._dispatch(kind, items))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    async def _dispatch(self, kind: str, items: List[Tuple[Any, asyncio.Future]]) -> None:
+        """
+        Run a handler over a batch and resolve each request's future with its own result.
+        
+        Args:
+            kind: Name of the request kind
+            items: List of (payload, future) pairs
+        """
+        try:
+            results = await self.handlers[kind]([payload for payload, _ in items])
+        except Exception as e:
+            logger.error(f"Batch {kind} of {len(items)} failed: {e}")
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        except BaseException:
+            # Cancelled mid-batch: wake the waiting requests rather than leaving them pending
+            for _, future in items:
+                future.cancel()
+            raise
+        
+        for index, (_, future) in enumerate(items):
+            if future.done():
+                continue
+            if index >= len(results):
+                future.set_exception(RuntimeError(f"Batch handler for {kind} returned no result"))
+            elif isinstance(results[index], BaseException):
+                future.set_exception(results[index])
+            else:
+                future.set_result(results[index])
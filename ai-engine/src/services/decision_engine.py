@@ -5,15 +5,116 @@ Evaluates player decisions and their impact on the game world.
 
 import os
 import random
-from typing import List, Dict, Optional
-import asyncio
+import re
+from typing import Dict, Optional, Tuple
+import hashlib
+import httpx
+import orjson
+from cachetools import LRUCache
 
 from langchain_openai import ChatOpenAI
 from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
+from langchain.schema.output_parser import StrOutputParser
 
 from ..models.player import Player
 from ..utils.config import Config
+from ..utils.http_client import get_http_client, get_async_http_client
+
+# A line opening an evaluation section (or giving the karma score), anywhere in the line
+_SECTION_LINE_RE = re.compile(
+    r"^[^\n]*?(ethical impact|technological impact|temporal impact|karma score|karma impact)[^\n]*",
+    re.IGNORECASE | re.MULTILINE
+)
+
+# Signed karma score on a karma line (e.g., "Karma Score: +7" or "karma impact - 3")
+_KARMA_VALUE_RE = re.compile(r"([+-]?)\s*(\d+)")
+
+# Evaluation field of each section heading
+_SECTION_FIELDS = {
+    "ethical impact": "ethical",
+    "technological impact": "technological",
+    "temporal impact": "temporal"
+}
+
+
+def _parse_evaluation(evaluation_text: str) -> Tuple[str, str, str, int]:
+    """
+    Parse the sections of a decision evaluation.
+    A section runs from its heading line (text after the first colon) to the next heading;
+    text after the karma line belongs to no section.
+    
+    Args:
+        evaluation_text: The evaluation text returned by the LLM
+        
+    Returns:
+        Tuple of (ethical impact, technological impact, temporal impact, karma score)
+    """
+    sections = {"ethical": "", "technological": "", "temporal": ""}
+    karma_score = 0
+    
+    headings = list(_SECTION_LINE_RE.finditer(evaluation_text))
+    ends = [heading.start() for heading in headings[1:]] + [len(evaluation_text)]
+    
+    for heading, end in zip(headings, ends):
+        line = heading.group()
+        field = _SECTION_FIELDS.get(heading.group(1).lower())
+        
+        if field is not None:
+            # Heading text after the colon, then the lines up to the next heading
+            text = line.partition(":")[2] + evaluation_text[heading.end():end]
+            sections[field] = " ".join(text.split())
+            continue
+        
+        value = _KARMA_VALUE_RE.search(evaluation_text, heading.end(1), heading.end())
+        if value is not None:
+            karma_score = int(value.group(1) + value.group(2))
+        else:
+            # Default to a random small karma impact if no score is given
+            karma_score = random.randint(-3, 3)
+    
+    return sections["ethical"], sections["technological"], sections["temporal"], karma_score
+
+
+def _evaluation_complete(evaluation_text: str) -> bool:
+    """
+    Check whether a partial evaluation already holds everything _parse_evaluation reads.
+    
+    Args:
+        evaluation_text: The evaluation text received so far
+        
+    Returns:
+        True once all three sections are followed by a finished karma line with a score
+    """
+    seen = set()
+    
+    for heading in _SECTION_LINE_RE.finditer(evaluation_text):
+        field = _SECTION_FIELDS.get(heading.group(1).lower())
+        if field is not None:
+            seen.add(field)
+        elif (len(seen) == len(_SECTION_FIELDS)
+              and heading.end() < len(evaluation_text)
+              and _KARMA_VALUE_RE.search(evaluation_text, heading.end(1), heading.end()) is not None):
+            return True
+    
+    return False
+
+
+def _format_context(context: dict) -> str:
+    """
+    Format decision context as "key: value" lines for the prompt.
+    Nested dicts and lists are written as JSON, which orjson encodes far faster than repr().
+    
+    Args:
+        context: Additional context about the decision
+        
+    Returns:
+        The context as prompt text
+    """
+    return "\n".join([
+        f"{key}: {orjson.dumps(value, default=str).decode()}"
+        if isinstance(value, (dict, list)) else f"{key}: {value}"
+        for key, value in context.items()
+    ])
 
 
 class DecisionEngine:
@@ -22,14 +123,23 @@ class DecisionEngine:
     Uses LangChain and OpenAI to analyze decisions from ethical, technological, and temporal perspectives.
     """
     
-    def __init__(self):
-        """Initialize the decision engine with LangChain components."""
+    def __init__(self, http_client: Optional[httpx.Client] = None,
+                 http_async_client: Optional[httpx.AsyncClient] = None):
+        """
+        Initialize the decision engine with LangChain components.
+        
+        Args:
+            http_client: HTTP client for OpenAI calls (defaults to the shared pooled client)
+            http_async_client: Async HTTP client for OpenAI calls (defaults to the shared pooled client)
+        """
         # Initialize OpenAI Chat model
         self.llm = ChatOpenAI(
             temperature=0.5,  # Lower temperature for more consistent evaluations
             max_tokens=Config.OPENAI_MAX_TOKENS,
             model_name=Config.OPENAI_MODEL,
-            openai_api_key=Config.OPENAI_API_KEY
+            openai_api_key=Config.OPENAI_API_KEY,
+            http_client=http_client or get_http_client(),
+            http_async_client=http_async_client or get_async_http_client()
         )
         
         # Initialize prompt templates
@@ -59,8 +169,11 @@ class DecisionEngine:
             """
         )
         
-        # Initialize LLM chain
-        self.decision_chain = LLMChain(llm=self.llm, prompt=self.decision_prompt)
+        # Prompt -> model -> text pipeline, streamed by evaluate
+        self.decision_chain = self.decision_prompt | self.llm | StrOutputParser()
+        
+        # Evaluations of exact repeat decisions, keyed by a digest of the decision and its context
+        self.evaluation_cache = LRUCache(maxsize=Config.EVALUATION_CACHE_SIZE)
     
     async def evaluate(self, player_id: str, decision: str, context: dict) -> Dict:
         """
@@ -74,65 +187,37 @@ class DecisionEngine:
         Returns:
             A dictionary containing the evaluation results
         """
+        # Serve repeat decisions in the same context from the cache
+        cache_key = self._cache_key(decision, context)
+        cached = self.evaluation_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)
+        
         # Get player role from context or use a default
         player_role = context.get("player_role", "Unknown Role")
         
         # Convert context to string format for the prompt
-        context_str = "\n".join([f"{key}: {value}" for key, value in context.items()])
-        
-        # Generate evaluation
-        evaluation_text = await asyncio.to_thread(
-            self.decision_chain.run,
-            player_role=player_role,
-            decision=decision,
-            context=context_str
-        )
-        
-        # Parse the evaluation text
-        lines = evaluation_text.strip().split("\n")
+        context_str = _format_context(context)
         
-        ethical_impact = ""
-        technological_impact = ""
-        temporal_impact = ""
-        karma_score = 0
+        # Stream the evaluation, stopping once the karma score has been given
+        pieces = []
+        stream = self.decision_chain.astream({
+            "player_role": player_role,
+            "decision": decision,
+            "context": context_str
+        })
+        try:
+            async for chunk in stream:
+                pieces.append(chunk)
+                # Only a finished line can complete the evaluation
+                if "\n" in chunk and _evaluation_complete("".join(pieces)):
+                    break
+        finally:
+            await stream.aclose()
+        evaluation_text = "".join(pieces)
         
-        current_section = None
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            if "ethical impact" in line.lower():
-                current_section = "ethical"
-                ethical_impact = line.split(":", 1)[1].strip() if ":" in line else ""
-            elif "technological impact" in line.lower():
-                current_section = "technological"
-                technological_impact = line.split(":", 1)[1].strip() if ":" in line else ""
-            elif "temporal impact" in line.lower():
-                current_section = "temporal"
-                temporal_impact = line.split(":", 1)[1].strip() if ":" in line else ""
-            elif "karma score" in line.lower() or "karma impact" in line.lower():
-                try:
-                    # Extract the karma score
-                    if "+" in line:
-                        karma_score = int(line.split("+")[1].split()[0])
-                    elif "-" in line:
-                        karma_score = -int(line.split("-")[1].split()[0])
-                    else:
-                        for word in line.split():
-                            if word.isdigit() or (word[0] == '-' and word[1:].isdigit()):
-                                karma_score = int(word)
-                                break
-                except:
-                    # Default to a random small karma impact if parsing fails
-                    karma_score = random.randint(-3, 3)
-            elif current_section == "ethical":
-                ethical_impact += " " + line
-            elif current_section == "technological":
-                technological_impact += " " + line
-            elif current_section == "temporal":
-                temporal_impact += " " + line
+        # Parse the evaluation text
+        ethical_impact, technological_impact, temporal_impact, karma_score = _parse_evaluation(evaluation_text)
         
         # Ensure karma score is within bounds
         karma_score = max(-10, min(10, karma_score))
@@ -146,7 +231,23 @@ class DecisionEngine:
             "summary": self._generate_summary(ethical_impact, technological_impact, temporal_impact, karma_score)
         }
         
-        return evaluation
+        self.evaluation_cache[cache_key] = evaluation
+        return dict(evaluation)
+    
+    def _cache_key(self, decision: str, context: dict) -> bytes:
+        """
+        Get the evaluation cache key for a decision.
+        The context (which carries the player role) is encoded with sorted keys, so its order does not matter.
+        
+        Args:
+            decision: The decision text
+            context: Additional context about the decision
+            
+        Returns:
+            A 16-byte digest of the decision and its context
+        """
+        encoded = orjson.dumps([decision, context], option=orjson.OPT_SORT_KEYS, default=str)
+        return hashlib.blake2b(encoded, digest_size=16).digest()
     
     def _generate_summary(self, ethical_impact: str, technological_impact: str, 
                           temporal_impact: str, karma_score: int) -> str:
@@ -3,13 +3,100 @@ Karma Calculator Service
 Calculates karma impacts for player actions and decisions.
 """
 
-from typing import List, Dict, Optional
+from typing import TYPE_CHECKING, Deque, Dict, Iterable, List, Optional
+from collections import defaultdict, deque
+from functools import partial
+from itertools import islice
 import asyncio
 import math
 import random
+import re
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    # Fall back to plain Python when numba is not installed
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
 
 from ..models.player import Player
 
+if TYPE_CHECKING:
+    from .decision_engine import DecisionEngine
+
+# Action categories in kernel index order ("neutral" is used when nothing else applies)
+ACTION_CATEGORIES = (
+    "ethical_positive", "ethical_negative",
+    "tech_positive", "tech_negative",
+    "temporal_positive", "temporal_negative",
+    "neutral"
+)
+
+# Number of recent actions kept per player
+ACTION_HISTORY_LENGTH = 20
+
+
+@njit(cache=True)
+def _fallback_category(karma_impact: float) -> int:
+    """Categorize an action by karma impact alone (mirrors KarmaCalculator._categorize_action)."""
+    if karma_impact > 3:
+        return 0  # ethical_positive
+    elif karma_impact < -3:
+        return 1  # ethical_negative
+    elif 0 < karma_impact <= 3:
+        return 2  # tech_positive
+    elif -3 <= karma_impact < 0:
+        return 3  # tech_negative
+    return 6  # neutral
+
+
+@njit(cache=True)
+def _karma_kernel(base_scores, role_modifiers, era_modifiers, keyword_categories, history_categories):
+    """
+    Compute karma impacts for a sequence of actions.
+    
+    Args:
+        base_scores: Base karma score of each action
+        role_modifiers: Role modifier of each action
+        era_modifiers: Era modifier of each action
+        keyword_categories: Category index matched from each decision's keywords (-1 if none)
+        history_categories: Category indices of the player's previous actions, oldest first
+        
+    Returns:
+        Tuple of (karma impact of each action, category index of each action)
+    """
+    n = base_scores.shape[0]
+    h = history_categories.shape[0]
+    categories = np.empty(h + n, dtype=np.int64)
+    categories[:h] = history_categories
+    impacts = np.empty(n, dtype=np.int64)
+    
+    for i in range(n):
+        base = base_scores[i]
+        keyword_category = keyword_categories[i]
+        current = keyword_category if keyword_category >= 0 else _fallback_category(base)
+        
+        # Count consecutive actions of the same category among the last 5
+        end = h + i
+        consecutive_count = 0
+        j = end - 1
+        while j >= 0 and j >= end - 5 and categories[j] == current:
+            consecutive_count += 1
+            j -= 1
+        consecutive_modifier = 1.0 / (1.0 + (consecutive_count * 0.2))
+        
+        # Round half to even like round(), then clamp to -10..+10
+        karma_impact = np.rint(base * role_modifiers[i] * era_modifiers[i] * consecutive_modifier)
+        karma_impact = max(-10.0, min(10.0, karma_impact))
+        impacts[i] = int(karma_impact)
+        
+        categories[end] = keyword_category if keyword_category >= 0 else _fallback_category(impacts[i])
+    
+    return impacts, categories[h:]
+
 
 class KarmaCalculator:
     """
@@ -36,6 +123,12 @@ class KarmaCalculator:
             "Bio-Smith": {"ethical": 1.1, "technological": 1.2, "temporal": 0.7}
         }
         
+        # (ethical, technological, temporal) modifiers of each role, unpacked in one step per lookup
+        self.role_weights = {
+            role: (modifiers["ethical"], modifiers["technological"], modifiers["temporal"])
+            for role, modifiers in self.role_modifiers.items()
+        }
+        
         # Era-specific karma modifiers
         self.era_modifiers = {
             "Initiation": 0.8,    # Early game - karma impacts are less severe
@@ -54,10 +147,42 @@ class KarmaCalculator:
             "temporal_negative": ["disrupt", "fracture", "collapse", "sever"]
         }
         
+        # Kernel index of each action category
+        self.category_ids = {category: i for i, category in enumerate(ACTION_CATEGORIES)}
+        
+        # Keyword lookup: one pattern over every keyword, plus, per category, a pattern over
+        # the keywords of the categories that take precedence over it (None for the first)
+        self.keyword_categories = {}
+        self.earlier_keyword_patterns = {}
+        for category, keywords in self.action_categories.items():
+            self.earlier_keyword_patterns[category] = (
+                self._compile_keywords(self.keyword_categories) if self.keyword_categories else None
+            )
+            for keyword in keywords:
+                self.keyword_categories.setdefault(keyword, category)
+        self.keyword_pattern = self._compile_keywords(self.keyword_categories)
+        
         # Player action history cache (would be stored in database in production)
-        self.player_action_history = {}
+        self.player_action_history: Dict[str, Deque[Dict]] = defaultdict(
+            partial(deque, maxlen=ACTION_HISTORY_LENGTH)
+        )
+    
+    @staticmethod
+    def _compile_keywords(keywords: Iterable[str]) -> re.Pattern:
+        """Compile an alternation matching any of the given keywords as a substring."""
+        return re.compile("|".join(map(re.escape, keywords)))
+    
+    def warm_up(self) -> None:
+        """Compile the karma kernel ahead of the first request."""
+        _karma_kernel(
+            np.zeros(1, dtype=np.float64),
+            np.ones(1, dtype=np.float64),
+            np.ones(1, dtype=np.float64),
+            np.full(1, -1, dtype=np.int64),
+            np.zeros(0, dtype=np.int64)
+        )
     
-    async def calculate(self, player_id: str, decision: str, evaluation: Dict) -> int:
+    def calculate(self, player_id: str, decision: str, evaluation: Dict) -> int:
         """
         Calculate karma impact for a single decision based on its evaluation.
         
@@ -73,29 +198,14 @@ class KarmaCalculator:
         base_karma = evaluation.get("karma_score", 0)
         
         # Apply role modifier if available in the evaluation context
-        role = evaluation.get("player_role", None)
-        role_modifier = 1.0
-        
-        if role in self.role_modifiers:
-            # Apply different weights based on the impact types
-            ethical_weight = self.role_modifiers[role]["ethical"]
-            tech_weight = self.role_modifiers[role]["technological"]
-            temporal_weight = self.role_modifiers[role]["temporal"]
-            
-            # Determine which impact type is most relevant to this decision
-            if "ethical_impact" in evaluation and evaluation["ethical_impact"]:
-                role_modifier = ethical_weight
-            elif "technological_impact" in evaluation and evaluation["technological_impact"]:
-                role_modifier = tech_weight
-            elif "temporal_impact" in evaluation and evaluation["temporal_impact"]:
-                role_modifier = temporal_weight
+        role_modifier = self._role_modifier(evaluation)
         
         # Apply era modifier if available
         era = evaluation.get("game_era", "Progression")  # Default to mid-game
         era_modifier = self.era_modifiers.get(era, 1.0)
         
         # Check for consecutive similar actions
-        consecutive_modifier = await self._calculate_consecutive_modifier(player_id, decision, base_karma)
+        consecutive_modifier = self._calculate_consecutive_modifier(player_id, decision, base_karma)
         
         # Calculate final karma impact
         karma_impact = base_karma * role_modifier * era_modifier * consecutive_modifier
@@ -107,11 +217,11 @@ class KarmaCalculator:
         karma_impact = max(-10, min(10, karma_impact))
         
         # Update player action history
-        await self._update_action_history(player_id, decision, karma_impact)
+        self._update_action_history(player_id, decision, karma_impact)
         
         return karma_impact
     
-    async def calculate_total(self, player_id: str, actions: list) -> int:
+    def calculate_total(self, player_id: str, actions: list) -> int:
         """
         Calculate total karma impact for a series of actions.
         
@@ -122,18 +232,133 @@ class KarmaCalculator:
         Returns:
             The total calculated karma impact
         """
-        total_karma = 0
+        if not actions:
+            return 0
+        
+        decisions = [action.get("decision", "") for action in actions]
+        evaluations = [action.get("evaluation", {}) for action in actions]
+        
+        return int(self._score_actions(player_id, decisions, evaluations).sum())
+    
+    async def evaluate_and_score_batch(self, engine: "DecisionEngine", player_id: str,
+                                       actions: List[Dict]) -> List[Dict]:
+        """
+        Evaluate a series of decisions concurrently, then calculate their karma impacts in order.
         
-        for action in actions:
-            decision = action.get("decision", "")
-            evaluation = action.get("evaluation", {})
+        Args:
+            engine: The decision engine evaluating the decisions
+            player_id: The ID of the player
+            actions: List of action dictionaries with decision and context
             
-            karma = await self.calculate(player_id, decision, evaluation)
-            total_karma += karma
+        Returns:
+            The evaluation and karma impact of each action, in the same order as the actions
+        """
+        if not actions:
+            return []
+        
+        decisions = [action.get("decision", "") for action in actions]
         
-        return total_karma
+        # The LLM calls overlap, so the batch takes about as long as its slowest evaluation
+        evaluations = await asyncio.gather(*[
+            engine.evaluate(player_id, decision, action.get("context", {}))
+            for decision, action in zip(decisions, actions)
+        ])
+        
+        impacts = self._score_actions(player_id, decisions, evaluations)
+        return [
+            {"evaluation": evaluation, "karma_impact": int(karma_impact)}
+            for evaluation, karma_impact in zip(evaluations, impacts)
+        ]
     
-    async def _calculate_consecutive_modifier(self, player_id: str, decision: str, base_karma: int) -> float:
+    def _score_actions(self, player_id: str, decisions: List[str], evaluations: List[Dict]) -> np.ndarray:
+        """
+        Calculate the karma impact of each of a series of evaluated decisions and record them.
+        
+        Args:
+            player_id: The ID of the player
+            decisions: The decision texts, oldest first
+            evaluations: The evaluation results of each decision from the DecisionEngine
+            
+        Returns:
+            The karma impact of each decision
+        """
+        count = len(decisions)
+        
+        # Marshal the per-action inputs into arrays for the compiled kernel
+        role_modifier = self._role_modifier
+        era_modifier = self.era_modifiers.get
+        keyword_category = self._keyword_category
+        category_id = self.category_ids.get
+        base_scores = np.fromiter(
+            (evaluation.get("karma_score", 0) for evaluation in evaluations),
+            dtype=np.float64, count=count
+        )
+        role_modifiers = np.fromiter(
+            (role_modifier(evaluation) for evaluation in evaluations),
+            dtype=np.float64, count=count
+        )
+        era_modifiers = np.fromiter(
+            (era_modifier(evaluation.get("game_era", "Progression"), 1.0) for evaluation in evaluations),
+            dtype=np.float64, count=count
+        )
+        keyword_categories = np.fromiter(
+            (category_id(keyword_category(decision), -1) for decision in decisions),
+            dtype=np.int64, count=count
+        )
+        
+        # Only the last 5 actions affect the consecutive modifier
+        history = self.player_action_history.get(player_id, ())
+        history_categories = np.array(
+            [
+                self.category_ids.get(past_action.get("category"), -2)
+                for past_action in islice(history, max(len(history) - 5, 0), None)
+            ],
+            dtype=np.int64
+        )
+        
+        impacts, categories = _karma_kernel(
+            base_scores, role_modifiers, era_modifiers, keyword_categories, history_categories
+        )
+        
+        # Update player action history (the deque drops actions past the last 20)
+        history = self.player_action_history[player_id]
+        for decision, karma_impact, category in zip(decisions, impacts, categories):
+            history.append({
+                "decision": decision,
+                "karma_impact": int(karma_impact),
+                "category": ACTION_CATEGORIES[category]
+            })
+        
+        return impacts
+    
+    def _role_modifier(self, evaluation: Dict) -> float:
+        """
+        Get the role-specific modifier for an evaluated decision.
+        
+        Args:
+            evaluation: The evaluation results from the DecisionEngine
+            
+        Returns:
+            The role modifier (1.0 if the role is unknown)
+        """
+        weights = self.role_weights.get(evaluation.get("player_role"))
+        if weights is None:
+            return 1.0
+        
+        # Apply different weights based on the impact types
+        ethical_weight, tech_weight, temporal_weight = weights
+        
+        # Determine which impact type is most relevant to this decision
+        if evaluation.get("ethical_impact"):
+            return ethical_weight
+        elif evaluation.get("technological_impact"):
+            return tech_weight
+        elif evaluation.get("temporal_impact"):
+            return temporal_weight
+        
+        return 1.0
+    
+    def _calculate_consecutive_modifier(self, player_id: str, decision: str, base_karma: int) -> float:
         """
         Calculate modifier for consecutive similar actions.
         Repeated similar actions have diminishing karma returns.
@@ -147,7 +372,7 @@ class KarmaCalculator:
             A modifier for consecutive similar actions
         """
         # Get player's action history
-        history = self.player_action_history.get(player_id, [])
+        history = self.player_action_history.get(player_id)
         
         if not history:
             return 1.0
@@ -157,7 +382,7 @@ class KarmaCalculator:
         
         # Count consecutive actions of the same category
         consecutive_count = 0
-        for past_action in reversed(history[-5:]):  # Look at last 5 actions
+        for past_action in islice(reversed(history), 5):  # Look at last 5 actions
             past_category = past_action.get("category", None)
             if past_category == current_category:
                 consecutive_count += 1
@@ -170,7 +395,7 @@ class KarmaCalculator:
         
         return 1.0
     
-    async def _update_action_history(self, player_id: str, decision: str, karma_impact: int) -> None:
+    def _update_action_history(self, player_id: str, decision: str, karma_impact: int) -> None:
         """
         Update a player's action history.
         
@@ -179,20 +404,14 @@ class KarmaCalculator:
             decision: The decision text
             karma_impact: The calculated karma impact
         """
-        if player_id not in self.player_action_history:
-            self.player_action_history[player_id] = []
-        
         category = self._categorize_action(decision, karma_impact)
         
+        # The deque drops actions past the last 20
         self.player_action_history[player_id].append({
             "decision": decision,
             "karma_impact": karma_impact,
             "category": category
         })
-        
-        # Keep history limited to last 20 actions
-        if len(self.player_action_history[player_id]) > 20:
-            self.player_action_history[player_id] = self.player_action_history[player_id][-20:]
     
     def _categorize_action(self, decision: str, karma_impact: int) -> str:
         """
@@ -205,12 +424,10 @@ class KarmaCalculator:
         Returns:
             The category of the action
         """
-        decision_lower = decision.lower()
-        
         # Check if the decision contains any keywords from the categories
-        for category, keywords in self.action_categories.items():
-            if any(keyword in decision_lower for keyword in keywords):
-                return category
+        category = self._keyword_category(decision)
+        if category is not None:
+            return category
         
         # If no keywords match, categorize based on karma impact
         if karma_impact > 3:
@@ -223,3 +440,26 @@ class KarmaCalculator:
             return "tech_negative"
         else:
             return "neutral"
+    
+    def _keyword_category(self, decision: str) -> Optional[str]:
+        """
+        Categorize an action by the keywords in its decision text.
+        
+        Args:
+            decision: The decision text
+            
+        Returns:
+            The matching category, or None if no keywords match
+        """
+        decision_lower = decision.lower()
+        category = None
+        
+        match = self.keyword_pattern.search(decision_lower)
+        while match is not None:
+            category = self.keyword_categories[match.group()]
+            
+            # A keyword of an earlier category wins wherever it appears in the text
+            earlier_pattern = self.earlier_keyword_patterns[category]
+            match = earlier_pattern.search(decision_lower) if earlier_pattern is not None else None
+        
+        return category
@@ -4,9 +4,13 @@ Generates narrative content for the ChronoCore game using LangChain and OpenAI.
 """
 
 import os
+import copy
+import hashlib
 import random
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional, Tuple, Union
 import asyncio
+import httpx
+from cachetools import TTLCache
 
 from langchain_openai import ChatOpenAI
 from langchain.prompts import PromptTemplate
@@ -15,8 +19,10 @@ from langchain.output_parsers import PydanticOutputParser
 
 from ..models.game_state import GameState
 from ..models.player import Player
-from ..models.quest import Quest, QuestOption, QuestOutcome
+from ..models.quest import Quest, QuestOption, QuestOutcome, STATUS_ACTIVE
+from ..models.timeline import Timeline
 from ..utils.config import Config
+from ..utils.http_client import get_http_client, get_async_http_client
 
 
 class StoryGenerator:
@@ -25,14 +31,23 @@ class StoryGenerator:
     Uses LangChain and OpenAI to create dynamic, contextually relevant stories.
     """
     
-    def __init__(self):
-        """Initialize the story generator with LangChain components."""
+    def __init__(self, http_client: Optional[httpx.Client] = None,
+                 http_async_client: Optional[httpx.AsyncClient] = None):
+        """
+        Initialize the story generator with LangChain components.
+        
+        Args:
+            http_client: HTTP client for OpenAI calls (defaults to the shared pooled client)
+            http_async_client: Async HTTP client for OpenAI calls (defaults to the shared pooled client)
+        """
         # Initialize OpenAI Chat model
         self.llm = ChatOpenAI(
             temperature=Config.OPENAI_TEMPERATURE,
             max_tokens=Config.OPENAI_MAX_TOKENS,
             model_name=Config.OPENAI_MODEL,
-            openai_api_key=Config.OPENAI_API_KEY
+            openai_api_key=Config.OPENAI_API_KEY,
+            http_client=http_client or get_http_client(),
+            http_async_client=http_async_client or get_async_http_client()
         )
         
         # Initialize prompt templates
@@ -111,6 +126,11 @@ class StoryGenerator:
         self.story_chain = LLMChain(llm=self.llm, prompt=self.story_prompt)
         self.quest_chain = LLMChain(llm=self.llm, prompt=self.quest_prompt)
         self.ethical_dilemma_chain = LLMChain(llm=self.llm, prompt=self.ethical_dilemma_prompt)
+        
+        # Recently generated dilemmas keyed by realm and a hash of its prompt context,
+        # plus in-flight generations so concurrent identical requests share one LLM call
+        self.dilemma_cache = TTLCache(maxsize=Config.CACHE_MAX_SIZE, ttl=Config.DILEMMA_CACHE_TTL_SECONDS)
+        self.pending_dilemmas: Dict[Tuple[str, str], asyncio.Future] = {}
     
     async def generate(self, game_state: GameState) -> str:
         """
@@ -122,19 +142,62 @@ class StoryGenerator:
         Returns:
             A narrative description of the game world
         """
+        # Generate story
+        result = await self.story_chain.arun(**self._build_story_inputs(game_state))
+        
+        return result
+    
+    async def stream(self, game_state: GameState) -> AsyncIterator[str]:
+        """
+        Stream a narrative description of the current game state as it is generated.
+        
+        Args:
+            game_state: The current state of the game
+            
+        Yields:
+            Chunks of the narrative text, in order
+        """
+        prompt = self.story_prompt.format(**self._build_story_inputs(game_state))
+        
+        async for chunk in self.llm.astream(prompt):
+            if chunk.content:
+                yield chunk.content
+    
+    async def generate_batch(self, game_states: List[GameState]) -> List[Union[str, BaseException]]:
+        """
+        Generate narrative descriptions for several game states concurrently.
+        Each game state is still one provider request; a failure only affects its own entry.
+        
+        Args:
+            game_states: The game states to describe
+            
+        Returns:
+            A narrative description (or the exception raised) for each game state, in the same order
+        """
+        return await asyncio.gather(
+            *[self.generate(game_state) for game_state in game_states],
+            return_exceptions=True
+        )
+    
+    def _build_story_inputs(self, game_state: GameState) -> Dict:
+        """
+        Build the story prompt inputs for a game state.
+        
+        Args:
+            game_state: The current state of the game
+            
+        Returns:
+            Dictionary of story prompt variables
+        """
         # Extract recent events from game state
         recent_events = game_state.events_history[-5:] if game_state.events_history else []
         recent_events_text = "\n".join([f"- {event['description']}" for event in recent_events])
         
-        # Generate story
-        result = await asyncio.to_thread(
-            self.story_chain.run,
-            game_state=game_state.json(),
-            current_era=game_state.current_era,
-            recent_events=recent_events_text
-        )
-        
-        return result
+        return {
+            "game_state": game_state.model_dump_json(),
+            "current_era": game_state.current_era,
+            "recent_events": recent_events_text
+        }
     
     async def generate_quest(self, player: Player, game_state: GameState) -> Quest:
         """
@@ -147,6 +210,40 @@ class StoryGenerator:
         Returns:
             A new quest object
         """
+        inputs, timeline = self._build_quest_inputs(player, game_state)
+        
+        # Generate quest text
+        quest_text = await self.quest_chain.arun(**inputs)
+        
+        return self._parse_quest(quest_text, player, game_state, timeline)
+    
+    async def generate_quest_batch(self, requests: List[Tuple[Player, GameState]]) -> List[Union[Quest, BaseException]]:
+        """
+        Generate quests for several players concurrently.
+        Each quest is still one provider request; a failure only affects its own entry.
+        
+        Args:
+            requests: List of (player, game_state) pairs to generate quests for
+            
+        Returns:
+            A new quest object (or the exception raised) for each request, in the same order
+        """
+        return await asyncio.gather(
+            *[self.generate_quest(player, game_state) for player, game_state in requests],
+            return_exceptions=True
+        )
+    
+    def _build_quest_inputs(self, player: Player, game_state: GameState) -> Tuple[Dict, Optional[Timeline]]:
+        """
+        Build the quest prompt inputs for a player.
+        
+        Args:
+            player: The player to generate a quest for
+            game_state: The current state of the game
+            
+        Returns:
+            Tuple of (quest prompt variables, timeline the quest is set in)
+        """
         # Get player's owned realms
         owned_realms = []
         for realm_id in player.owned_realms:
@@ -167,17 +264,31 @@ class StoryGenerator:
             if timeline is None:
                 timeline = random.choice(game_state.timelines)
         
-        # Generate quest text
-        quest_text = await asyncio.to_thread(
-            self.quest_chain.run,
-            player=player.username,
-            player_role=player.role,
-            karma=player.karma,
-            owned_realms=", ".join(owned_realms) if owned_realms else "None",
-            timeline=timeline.json() if timeline else "No timeline context available",
-            game_state=game_state.json()
-        )
+        inputs = {
+            "player": player.username,
+            "player_role": player.role,
+            "karma": player.karma,
+            "owned_realms": ", ".join(owned_realms) if owned_realms else "None",
+            "timeline": timeline.to_json_bytes().decode() if timeline else "No timeline context available",
+            "game_state": game_state.model_dump_json()
+        }
         
+        return inputs, timeline
+    
+    def _parse_quest(self, quest_text: str, player: Player, game_state: GameState,
+                     timeline: Optional[Timeline]) -> Quest:
+        """
+        Parse generated quest text into a structured quest.
+        
+        Args:
+            quest_text: The generated quest text
+            player: The player the quest was generated for
+            game_state: The current state of the game
+            timeline: The timeline the quest is set in
+            
+        Returns:
+            A new quest object
+        """
         # Parse the generated text into a structured quest
         # This is a simplified version - in a real implementation, you would use a more robust parser
         lines = quest_text.strip().split("\n")
@@ -228,10 +339,10 @@ class StoryGenerator:
             difficulty=random.randint(1, 5),
             player_id=player.player_id,
             timeline_id=timeline.timeline_id if timeline else None,
-            realm_id=random.choice(player.owned_realms) if player.owned_realms else None,
+            realm_id=random.choice(sorted(player.owned_realms)) if player.owned_realms else None,
             options=options,
             requirements={},
-            status="active",
+            status=STATUS_ACTIVE,
             expiration_turn=game_state.current_turn + 5  # Quest expires after 5 turns
         )
         
@@ -265,13 +376,56 @@ class StoryGenerator:
                 timeline = t
                 break
         
+        inputs = {
+            "realm": realm.to_json_bytes().decode(),
+            "timeline": timeline.to_json_bytes().decode() if timeline else "No timeline context available",
+            "tech_level": realm.development_level
+        }
+        
+        key = (realm_id, hashlib.blake2b(
+            f"{inputs['realm']}|{inputs['timeline']}".encode(), digest_size=16
+        ).hexdigest())
+        
+        # Serve repeat requests from the cache and join identical in-flight generations
+        if key in self.dilemma_cache:
+            return copy.deepcopy(self.dilemma_cache[key])
+        
+        if key in self.pending_dilemmas:
+            return copy.deepcopy(await asyncio.shield(self.pending_dilemmas[key]))
+        
+        future = asyncio.get_running_loop().create_future()
+        self.pending_dilemmas[key] = future
+        
+        try:
+            dilemma = await self._create_ethical_dilemma(inputs)
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case no other request joined
+            future.exception()
+            raise
+        else:
+            self.dilemma_cache[key] = dilemma
+            future.set_result(dilemma)
+        finally:
+            # Wake joined requests even if this one was cancelled before the dilemma was ready
+            if not future.done():
+                future.cancel()
+            del self.pending_dilemmas[key]
+        
+        return copy.deepcopy(dilemma)
+    
+    async def _create_ethical_dilemma(self, inputs: Dict) -> Dict:
+        """
+        Generate and parse an ethical dilemma.
+        
+        Args:
+            inputs: Ethical dilemma prompt variables
+            
+        Returns:
+            A dictionary representing an ethical dilemma
+        """
         # Generate dilemma text
-        dilemma_text = await asyncio.to_thread(
-            self.ethical_dilemma_chain.run,
-            realm=realm.json(),
-            timeline=timeline.json() if timeline else "No timeline context available",
-            tech_level=realm.development_level
-        )
+        dilemma_text = await self.ethical_dilemma_chain.arun(**inputs)
         
         # Parse the generated text into a structured dilemma
         # This is a simplified version - in a real implementation, you would use a more robust parser
@@ -59,18 +59,14 @@ class TimelineAnalyzer:
             Dictionary with analysis results
         """
         # Find the timeline
-        timeline = None
-        for t in game_state.timelines:
-            if t.timeline_id == timeline_id:
-                timeline = t
-                break
+        timeline = game_state.get_timeline(timeline_id)
         
         if timeline is None:
             logger.error(f"Timeline with ID {timeline_id} not found")
             return {"error": f"Timeline with ID {timeline_id} not found"}
         
         # Get realms in this timeline
-        realms = [r for r in game_state.realms if r.timeline_id == timeline_id]
+        realms = game_state.get_timeline_realms(timeline_id)
         
         # Calculate stability
         stability = await self.calculate_stability(timeline, realms, game_state)
@@ -137,14 +133,8 @@ class TimelineAnalyzer:
         # Higher disparity reduces stability (0-10 scale)
         tech_impact = -tech_disparity
         
-        # Impact of time rifts
-        rift_impact = 0
-        for rift in game_state.time_rifts:
-            if not rift.get("resolved", False):
-                # Check if rift affects this timeline
-                rift_location = rift.get("location", {})
-                if rift_location.get("timeline_id") == timeline.timeline_id:
-                    rift_impact -= rift.get("severity", 1) * 5
+        # Impact of unresolved time rifts in this timeline
+        rift_impact = -game_state.get_unresolved_rift_severity(timeline.timeline_id) * 5
         
         # Impact of paradoxes
         paradox_impact = 0
@@ -329,7 +319,7 @@ class TimelineAnalyzer:
         
         for timeline in game_state.timelines:
             # Calculate stability
-            realms = [r for r in game_state.realms if r.timeline_id == timeline.timeline_id]
+            realms = game_state.get_timeline_realms(timeline.timeline_id)
             stability = await self.calculate_stability(timeline, realms, game_state)
             
             # If stability is below threshold, this timeline is a candidate for a rift
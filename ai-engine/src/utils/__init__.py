@@ -7,19 +7,27 @@ from .database import (
     init_db, save_game_state, get_game_state, 
     save_player, get_player, save_quest, get_quest,
     get_player_quests, save_decision, get_player_decisions,
-    store_vector, query_vectors, close_connections
+    store_vector, store_vectors, query_vectors, close_connections
 )
 from .embeddings import (
     init_embeddings, get_embedding, get_embeddings_batch,
-    chunk_text, cosine_similarity, find_most_similar
+    chunk_text, normalize, cosine_similarity, cosine_similarity_prenorm,
+    cosine_similarity_batch, find_most_similar
 )
+from .http_client import get_http_client, get_async_http_client, close_http_clients
+from .llm import get_shared_llm
+from .query_cache import QueryCache
 
 __all__ = [
     'Config',
     'init_db', 'save_game_state', 'get_game_state',
     'save_player', 'get_player', 'save_quest', 'get_quest',
     'get_player_quests', 'save_decision', 'get_player_decisions',
-    'store_vector', 'query_vectors', 'close_connections',
+    'store_vector', 'store_vectors', 'query_vectors', 'close_connections',
     'init_embeddings', 'get_embedding', 'get_embeddings_batch',
-    'chunk_text', 'cosine_similarity', 'find_most_similar'
+    'chunk_text', 'normalize', 'cosine_similarity', 'cosine_similarity_prenorm',
+    'cosine_similarity_batch', 'find_most_similar',
+    'get_http_client', 'get_async_http_client', 'close_http_clients',
+    'get_shared_llm',
+    'QueryCache'
 ]
@@ -4,6 +4,7 @@ Manages configuration settings for the AI engine.
 """
 
 import os
+from functools import lru_cache
 from typing import Dict, Any, Optional
 import logging
 from dotenv import load_dotenv
@@ -36,11 +37,36 @@ class Config:
     PORT = int(os.getenv("PORT", "8000"))
     DEBUG = os.getenv("DEBUG", "False").lower() == "true"
     
+    # Request batching settings
+    BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "8"))
+    BATCH_MAX_WAIT_MS = int(os.getenv("BATCH_MAX_WAIT_MS", "20"))
+    EMBEDDING_BATCH_WAIT_MS = int(os.getenv("EMBEDDING_BATCH_WAIT_MS", "10"))
+    EMBEDDING_WRITE_BATCH_SIZE = int(os.getenv("EMBEDDING_WRITE_BATCH_SIZE", "64"))
+    EMBEDDING_WRITE_WAIT_MS = int(os.getenv("EMBEDDING_WRITE_WAIT_MS", "20"))
+    EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "10000"))
+    EMBEDDING_CACHE_DTYPE = os.getenv("EMBEDDING_CACHE_DTYPE", "int8")  # "int8" or "float16"
+    RERANK_OVERSAMPLE = int(os.getenv("RERANK_OVERSAMPLE", "1"))  # Values above 1 rerank a wider ANN candidate set locally
+    
+    # Cache settings
+    CACHE_MAX_SIZE = int(os.getenv("CACHE_MAX_SIZE", "1024"))
+    CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "30"))
+    DILEMMA_CACHE_TTL_SECONDS = int(os.getenv("DILEMMA_CACHE_TTL_SECONDS", "120"))
+    QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "2000"))
+    QUERY_CACHE_TTL_SECONDS = int(os.getenv("QUERY_CACHE_TTL_SECONDS", "300"))
+    DECISION_CACHE_SIMILARITY = float(os.getenv("DECISION_CACHE_SIMILARITY", "0.92"))  # Minimum similarity to reuse a past evaluation
+    EVALUATION_CACHE_SIZE = int(os.getenv("EVALUATION_CACHE_SIZE", "10000"))  # Exact repeat decisions served without an LLM call
+    
+    # Outbound HTTP settings
+    HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "50"))
+    HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "30"))
+    
     # Game settings
     DEFAULT_KARMA_RANGE = (-10, 10)
     MAX_TECH_LEVEL = 10
     MAX_DEVELOPMENT_LEVEL = 5
     MAX_STABILITY = 100
+    MAX_EVENTS_HISTORY = int(os.getenv("MAX_EVENTS_HISTORY", "1024"))  # Older game events are dropped past this many
     
     @classmethod
     def validate(cls) -> bool:
@@ -63,9 +89,10 @@ class Config:
         return True
     
     @classmethod
+    @lru_cache(maxsize=1)
     def get_openai_config(cls) -> Dict[str, Any]:
         """
-        Get OpenAI configuration.
+        Get OpenAI configuration (built once and shared; do not modify).
         
         Returns:
             Dictionary of OpenAI configuration
@@ -78,9 +105,10 @@ class Config:
         }
     
     @classmethod
+    @lru_cache(maxsize=1)
     def get_mongodb_config(cls) -> Dict[str, Any]:
         """
-        Get MongoDB configuration.
+        Get MongoDB configuration (built once and shared; do not modify).
         
         Returns:
             Dictionary of MongoDB configuration
@@ -90,9 +118,10 @@ class Config:
         }
     
     @classmethod
+    @lru_cache(maxsize=1)
     def get_pinecone_config(cls) -> Dict[str, Any]:
         """
-        Get Pinecone configuration.
+        Get Pinecone configuration (built once and shared; do not modify).
         
         Returns:
             Dictionary of Pinecone configuration
@@ -104,9 +133,10 @@ class Config:
         }
     
     @classmethod
+    @lru_cache(maxsize=1)
     def get_game_config(cls) -> Dict[str, Any]:
         """
-        Get game configuration.
+        Get game configuration (built once and shared; do not modify).
         
         Returns:
             Dictionary of game configuration
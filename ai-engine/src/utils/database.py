@@ -5,7 +5,7 @@ Provides database connection and operations for the AI engine.
 
 import os
 import asyncio
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import logging
 from datetime import datetime
 
@@ -414,6 +414,10 @@ async def get_player_decisions(player_id: str, limit: int = 20) -> List[Dict]:
         logger.error(f"Failed to get player decisions: {e}")
         return []
 
+def _as_list(vector) -> List[float]:
+    """Convert a vector (e.g., a NumPy array) to the plain list Pinecone expects."""
+    return vector.tolist() if hasattr(vector, "tolist") else vector
+
 async def store_vector(id: str, vector: List[float], metadata: Dict) -> bool:
     """
     Store a vector in Pinecone.
@@ -434,7 +438,7 @@ async def store_vector(id: str, vector: List[float], metadata: Dict) -> bool:
         # Upsert the vector
         result = await asyncio.to_thread(
             lambda: pinecone_index.upsert(
-                vectors=[(id, vector, metadata)]
+                vectors=[(id, _as_list(vector), metadata)]
             )
         )
         
@@ -444,13 +448,43 @@ async def store_vector(id: str, vector: List[float], metadata: Dict) -> bool:
         logger.error(f"Failed to store vector: {e}")
         return False
 
-async def query_vectors(query_vector: List[float], top_k: int = 5) -> List[Dict]:
+async def store_vectors(vectors: List[Tuple[str, List[float], Dict]]) -> bool:
+    """
+    Store several vectors in Pinecone with a single upsert.
+    
+    Args:
+        vectors: List of (id, vector, metadata) tuples
+        
+    Returns:
+        True if successful, False otherwise
+    """
+    if pinecone_index is None:
+        logger.error("Pinecone index not initialized")
+        return False
+    
+    if not vectors:
+        return True
+    
+    try:
+        # Upsert all vectors in one request
+        await asyncio.to_thread(
+            lambda: pinecone_index.upsert(vectors=[(id, _as_list(vector), metadata) for id, vector, metadata in vectors])
+        )
+        
+        return True
+        
+    except Exception as e:
+        logger.error(f"Failed to store vectors: {e}")
+        return False
+
+async def query_vectors(query_vector: List[float], top_k: int = 5, include_values: bool = False) -> List[Dict]:
     """
     Query vectors in Pinecone.
     
     Args:
         query_vector: The query vector
         top_k: Number of results to return
+        include_values: Whether to return the matched vectors themselves
         
     Returns:
         A list of matching vectors with metadata
@@ -463,9 +497,10 @@ async def query_vectors(query_vector: List[float], top_k: int = 5) -> List[Dict]
         # Query the index
         results = await asyncio.to_thread(
             lambda: pinecone_index.query(
-                vector=query_vector,
+                vector=_as_list(query_vector),
                 top_k=top_k,
-                include_metadata=True
+                include_metadata=True,
+                include_values=include_values
             )
         )
         
@@ -7,7 +7,7 @@ import os
 import numpy as np
 from typing import List, Dict, Any, Optional, Union
 import openai
-from langchain.embeddings import OpenAIEmbeddings
+from langchain_community.embeddings import OpenAIEmbeddings
 from pinecone import Pinecone, ServerlessSpec
 import logging
 
@@ -128,6 +128,27 @@ class EmbeddingManager:
             logger.error(f"Error storing vector in Pinecone: {str(e)}")
             return False
     
+    def exists(self, id: str, namespace: str = "default") -> bool:
+        """
+        Check whether a vector is stored in Pinecone
+        
+        Args:
+            id: Unique ID for the vector
+            namespace: Pinecone namespace
+            
+        Returns:
+            True if the vector exists, False otherwise
+        """
+        if not self.index:
+            return False
+        
+        try:
+            result = self.index.fetch(ids=[id], namespace=namespace)
+            return id in result.vectors
+        except Exception as e:
+            logger.error(f"Error fetching vector from Pinecone: {str(e)}")
+            return False
+    
     def query_vectors(self, 
                      vector: List[float], 
                      top_k: int = 5, 
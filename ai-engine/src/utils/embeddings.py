@@ -4,36 +4,56 @@ Provides functions for generating embeddings and vector operations.
 """
 
 import os
+import hashlib
 from typing import List, Dict, Any, Optional
 import asyncio
 import logging
 import numpy as np
+from cachetools import LRUCache
 
-from langchain_community.embeddings import OpenAIEmbeddings
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+try:
+    import simsimd
+except ImportError:
+    # Fall back to NumPy when simsimd is not installed
+    simsimd = None
 
 from .config import Config
+from .http_client import get_http_client
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize OpenAI embeddings
 embeddings = None
 
+# Embeddings of recently embedded texts keyed by a digest of the text.
+# Embeddings are deterministic for a model, so entries are shared across games.
+embedding_cache = LRUCache(maxsize=Config.EMBEDDING_CACHE_SIZE)
+
+def _text_key(text: str) -> bytes:
+    """Get the embedding cache key for a text."""
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
 async def init_embeddings():
     """Initialize embeddings."""
     global embeddings
     
     if Config.OPENAI_API_KEY:
+        # Imported here so that importing this module does not load LangChain
+        from langchain_community.embeddings import OpenAIEmbeddings
+        
         embeddings = OpenAIEmbeddings(
-            openai_api_key=Config.OPENAI_API_KEY
+            openai_api_key=Config.OPENAI_API_KEY,
+            http_client=get_http_client()
         )
         logger.info("OpenAI embeddings initialized")
     else:
         logger.warning("OpenAI API key not found. Embeddings functionality will be limited.")
 
-async def get_embedding(text: str) -> Optional[List[float]]:
+def _as_embedding(embedding: List[float]) -> np.ndarray:
+    """Convert a provider embedding to the contiguous float32 layout used by every vector operation."""
+    return np.ascontiguousarray(embedding, dtype=np.float32)
+
+async def get_embedding(text: str) -> Optional[np.ndarray]:
     """
     Get embedding for a text.
     
@@ -41,26 +61,31 @@ async def get_embedding(text: str) -> Optional[List[float]]:
         text: The text to embed
         
     Returns:
-        The embedding vector or None if embeddings are not initialized
+        The embedding as a contiguous float32 array or None if embeddings are not initialized
     """
     if embeddings is None:
         logger.error("Embeddings not initialized")
         return None
     
+    key = _text_key(text)
+    if key in embedding_cache:
+        return embedding_cache[key]
+    
     try:
         # Get embedding from OpenAI
-        embedding = await asyncio.to_thread(
+        embedding = _as_embedding(await asyncio.to_thread(
             embeddings.embed_query,
             text
-        )
+        ))
         
+        embedding_cache[key] = embedding
         return embedding
         
     except Exception as e:
         logger.error(f"Failed to get embedding: {e}")
         return None
 
-async def get_embeddings_batch(texts: List[str]) -> Optional[List[List[float]]]:
+async def get_embeddings_batch(texts: List[str]) -> Optional[List[np.ndarray]]:
     """
     Get embeddings for a batch of texts.
     
@@ -68,20 +93,37 @@ async def get_embeddings_batch(texts: List[str]) -> Optional[List[List[float]]]:
         texts: The texts to embed
         
     Returns:
-        The embedding vectors or None if embeddings are not initialized
+        The embeddings as contiguous float32 arrays or None if embeddings are not initialized
     """
     if embeddings is None:
         logger.error("Embeddings not initialized")
         return None
     
     try:
-        # Get embeddings from OpenAI
-        embeddings_batch = await asyncio.to_thread(
-            embeddings.embed_documents,
-            texts
-        )
+        # Only embed each distinct text that is not already cached
+        keys = [_text_key(text) for text in texts]
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in embedding_cache and key not in missing:
+                missing[key] = text
         
-        return embeddings_batch
+        if missing:
+            # Send texts grouped by length so each provider request pads as little as possible
+            pending = sorted(missing.items(), key=lambda item: len(item[1]))
+            
+            # Get embeddings from OpenAI
+            new_embeddings = await asyncio.to_thread(
+                embeddings.embed_documents,
+                [text for _, text in pending]
+            )
+            
+            fetched = {key: _as_embedding(embedding) for (key, _), embedding in zip(pending, new_embeddings)}
+            embedding_cache.update(fetched)
+        else:
+            fetched = {}
+        
+        # Return embeddings in the caller's order
+        return [fetched[key] if key in fetched else embedding_cache[key] for key in keys]
         
     except Exception as e:
         logger.error(f"Failed to get embeddings batch: {e}")
@@ -100,6 +142,8 @@ async def chunk_text(text: str, chunk_size: int = 1000, chunk_overlap: int = 200
         A list of text chunks
     """
     try:
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+        
         # Initialize text splitter
         text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=chunk_size,
@@ -119,6 +163,12 @@ async def chunk_text(text: str, chunk_size: int = 1000, chunk_overlap: int = 200
         logger.error(f"Failed to chunk text: {e}")
         return [text]
 
+def _as_vectors(vectors) -> np.ndarray:
+    """Convert vectors to a contiguous array, keeping float16 input as float16 for SIMD kernels."""
+    vectors = np.asarray(vectors)
+    dtype = np.float16 if vectors.dtype == np.float16 else np.float32
+    return np.ascontiguousarray(vectors, dtype=dtype)
+
 def cosine_similarity(vector_a: List[float], vector_b: List[float]) -> float:
     """
     Calculate cosine similarity between two vectors.
@@ -130,13 +180,27 @@ def cosine_similarity(vector_a: List[float], vector_b: List[float]) -> float:
     Returns:
         Cosine similarity (0-1)
     """
+    if __debug__:
+        # Arrays should already be in their final layout (see get_embedding) so no hidden copy is made
+        for vector in (vector_a, vector_b):
+            if isinstance(vector, np.ndarray):
+                assert vector.dtype in (np.float32, np.float16) and vector.flags.c_contiguous, \
+                    f"Expected a contiguous float32 array, got {vector.dtype}"
+    
     try:
-        # Convert to numpy arrays
-        a = np.array(vector_a)
-        b = np.array(vector_b)
+        # Convert to contiguous arrays of a common dtype
+        a = _as_vectors(vector_a)
+        b = _as_vectors(vector_b)
+        if a.dtype != b.dtype:
+            a, b = a.astype(np.float32), b.astype(np.float32)
+        
+        if simsimd is not None:
+            return float(1.0 - simsimd.cosine(a, b))
         
-        # Calculate cosine similarity
-        similarity = np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
+        a, b = a.astype(np.float32, copy=False), b.astype(np.float32, copy=False)
+        
+        # Calculate cosine similarity with a single square root over both squared norms
+        similarity = np.dot(a, b) / np.sqrt(np.vdot(a, a) * np.vdot(b, b) + 1e-12)
         
         return float(similarity)
         
@@ -144,6 +208,58 @@ def cosine_similarity(vector_a: List[float], vector_b: List[float]) -> float:
         logger.error(f"Failed to calculate cosine similarity: {e}")
         return 0.0
 
+def normalize(vector: List[float]) -> np.ndarray:
+    """
+    Scale a vector to unit length.
+    
+    Args:
+        vector: The vector to normalize
+        
+    Returns:
+        The unit-length vector as a float32 array (all zeros for a zero vector)
+    """
+    v = np.array(vector, dtype=np.float32)
+    v /= np.sqrt(np.vdot(v, v)) + 1e-12
+    return v
+
+def cosine_similarity_prenorm(vector_a: np.ndarray, vector_b: np.ndarray) -> float:
+    """
+    Calculate cosine similarity between two unit-length vectors.
+    
+    Args:
+        vector_a: First vector, already normalized
+        vector_b: Second vector, already normalized
+        
+    Returns:
+        Cosine similarity, which for unit vectors is their dot product
+    """
+    return float(np.dot(vector_a, vector_b))
+
+def cosine_similarity_batch(queries, vectors) -> np.ndarray:
+    """
+    Calculate cosine similarity between every query and every vector.
+    
+    Args:
+        queries: Query vectors, shape (m, d)
+        vectors: Vectors to compare against, shape (n, d)
+        
+    Returns:
+        Similarity matrix of shape (m, n)
+    """
+    q = _as_vectors(queries)
+    x = _as_vectors(vectors)
+    if q.dtype != x.dtype:
+        q, x = q.astype(np.float32), x.astype(np.float32)
+    q, x = np.atleast_2d(q), np.atleast_2d(x)
+    
+    if simsimd is not None:
+        return 1.0 - np.asarray(simsimd.cdist(q, x, metric="cosine"), dtype=np.float32)
+    
+    q, x = q.astype(np.float32, copy=False), x.astype(np.float32, copy=False)
+    q_norms = np.sqrt(np.einsum("ij,ij->i", q, q))
+    x_norms = np.sqrt(np.einsum("ij,ij->i", x, x))
+    return (q @ x.T) / (np.outer(q_norms, x_norms) + 1e-12)
+
 def find_most_similar(query_vector: List[float], vectors: List[List[float]]) -> int:
     """
     Find the index of the most similar vector.
@@ -156,11 +272,11 @@ def find_most_similar(query_vector: List[float], vectors: List[List[float]]) ->
         The index of the most similar vector
     """
     try:
-        # Calculate similarities
-        similarities = [cosine_similarity(query_vector, vector) for vector in vectors]
+        # Calculate all similarities at once
+        similarities = cosine_similarity_batch(query_vector, vectors)[0]
         
         # Find index of maximum similarity
-        max_index = similarities.index(max(similarities))
+        max_index = int(np.argmax(similarities))
         
         return max_index
         
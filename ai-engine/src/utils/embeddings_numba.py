@@ -0,0 +1,47 @@
+"""
+Numba Embeddings Kernels
+Compiled kernels for scoring many candidate embeddings against a query.
+"""
+
+import math
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    # Fall back to plain Python when numba is not installed
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+    
+    prange = range
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def cosine_scores(matrix, query, out_scores):
+    """
+    Compute the cosine similarity of each row of a matrix with a unit-length query.
+    
+    Args:
+        matrix: Candidate vectors, float32 array of shape (n, d)
+        query: L2-normalized query vector, float32 array of shape (d,)
+        out_scores: Output float32 array of shape (n,)
+    """
+    for i in prange(matrix.shape[0]):
+        dot = 0.0
+        norm = 0.0
+        for d in range(matrix.shape[1]):
+            value = matrix[i, d]
+            dot += value * query[d]
+            norm += value * value
+        out_scores[i] = dot / math.sqrt(norm) if norm > 0.0 else 0.0
+
+
+def warm_up() -> None:
+    """Compile the kernels ahead of the first request."""
+    cosine_scores(
+        np.ones((1, 1), dtype=np.float32),
+        np.ones(1, dtype=np.float32),
+        np.empty(1, dtype=np.float32)
+    )
@@ -0,0 +1,70 @@
+"""
+HTTP Client Utility Module
+Provides shared, connection-pooled HTTP clients for outbound API calls.
+"""
+
+from typing import Optional
+import logging
+
+import httpx
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+# Shared HTTP clients, created on first use
+http_client: Optional[httpx.Client] = None
+async_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_limits() -> httpx.Limits:
+    """Get the connection pool limits for the shared clients."""
+    return httpx.Limits(
+        max_connections=Config.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=Config.HTTP_MAX_KEEPALIVE_CONNECTIONS
+    )
+
+
+def get_http_client() -> httpx.Client:
+    """
+    Get the shared synchronous HTTP client.
+    
+    Returns:
+        An HTTP/2 client with keep-alive connection pooling
+    """
+    global http_client
+    
+    if http_client is None:
+        http_client = httpx.Client(http2=True, timeout=Config.HTTP_TIMEOUT, limits=_get_limits())
+    
+    return http_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared asynchronous HTTP client.
+    
+    Returns:
+        An HTTP/2 async client with keep-alive connection pooling
+    """
+    global async_http_client
+    
+    if async_http_client is None:
+        async_http_client = httpx.AsyncClient(http2=True, timeout=Config.HTTP_TIMEOUT, limits=_get_limits())
+    
+    return async_http_client
+
+
+async def close_http_clients() -> None:
+    """Close the shared HTTP clients."""
+    global http_client, async_http_client
+    
+    if async_http_client is not None:
+        await async_http_client.aclose()
+        async_http_client = None
+    
+    if http_client is not None:
+        http_client.close()
+        http_client = None
+    
+    logger.info("HTTP clients closed")
@@ -0,0 +1,42 @@
+"""
+LLM Utility Module
+Provides chat model clients shared across the AI engine's models.
+"""
+
+from functools import lru_cache
+import logging
+
+from .config import Config
+from .http_client import get_http_client, get_async_http_client
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def get_shared_llm(model: str, temperature: float, api_key: str):
+    """
+    Get the chat model client for a model configuration, created once per process.
+    Models with the same configuration share one client, and every client sends its
+    requests over the shared connection-pooled HTTP clients.
+    
+    Args:
+        model: Model name
+        temperature: Sampling temperature
+        api_key: OpenAI API key
+    
+    Returns:
+        A ChatOpenAI client
+    """
+    # Imported here so that importing this module does not load LangChain
+    from langchain_openai import ChatOpenAI
+    
+    logger.info(f"Creating shared LLM client for {model} (temperature={temperature})")
+    return ChatOpenAI(
+        model_name=model,
+        temperature=temperature,
+        openai_api_key=api_key,
+        max_retries=2,
+        timeout=Config.HTTP_TIMEOUT,
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client()
+    )
@@ -0,0 +1,96 @@
+"""
+Query Cache Utility Module
+Provides an LRU cache with per-entry expiry for repeated query results.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+import time
+import logging
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class QueryCache:
+    """
+    Least-recently-used cache whose entries expire after a fixed time to live.
+    Keeps hit, miss and eviction counts for monitoring.
+    """
+    
+    def __init__(self, capacity: Optional[int] = None, ttl: Optional[float] = None):
+        """
+        Initialize the query cache.
+        
+        Args:
+            capacity: Maximum number of entries (defaults to Config.QUERY_CACHE_SIZE)
+            ttl: Seconds an entry stays valid (defaults to Config.QUERY_CACHE_TTL_SECONDS)
+        """
+        self.capacity = capacity or Config.QUERY_CACHE_SIZE
+        self.ttl = ttl if ttl is not None else Config.QUERY_CACHE_TTL_SECONDS
+        self.entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a cached value.
+        
+        Args:
+            key: The cache key
+        
+        Returns:
+            The cached value, or None if it is missing or expired
+        """
+        entry = self.entries.get(key)
+        
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self.entries[key]
+            self.misses += 1
+            return None
+        
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+    
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Cache a value, evicting the least recently used entry if the cache is full.
+        
+        Args:
+            key: The cache key
+            value: The value to cache
+        """
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        self.entries.move_to_end(key)
+        
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+    
+    def invalidate(self, key: Hashable) -> None:
+        """Remove a cached value."""
+        self.entries.pop(key, None)
+    
+    def invalidate_all(self) -> None:
+        """Remove all cached values."""
+        self.entries.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Dictionary with size, hits, misses, evictions and hit rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
@@ -0,0 +1,9 @@
+"""
+Shared test setup: make the `src` package importable and give the config a dummy API key.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
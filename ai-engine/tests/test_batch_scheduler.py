@@ -0,0 +1,175 @@
+"""
+Tests for the batch scheduler.
+"""
+
+import asyncio
+
+import pytest
+
+from src.services.batch_scheduler import BatchScheduler
+
+
+async def _double_or_fail(payloads):
+    """Double each payload, failing negative ones."""
+    return [ValueError(f"bad {p}") if p < 0 else p * 2 for p in payloads]
+
+
+def test_partial_failure_fails_only_that_request():
+    async def scenario():
+        scheduler = BatchScheduler(max_batch=8, max_wait_ms=20)
+        scheduler.register("double", _double_or_fail)
+        await scheduler.start()
+        try:
+            return await asyncio.gather(
+                *[scheduler.submit("double", p) for p in (1, -1, 3)],
+                return_exceptions=True
+            )
+        finally:
+            await scheduler.stop()
+    
+    ok, failed, other = asyncio.run(scenario())
+    assert ok == 2
+    assert isinstance(failed, ValueError)
+    assert other == 6
+
+
+def test_short_result_list_fails_missing_requests():
+    async def first_only(payloads):
+        return payloads[:1]
+    
+    async def scenario():
+        scheduler = BatchScheduler(max_batch=8, max_wait_ms=20)
+        scheduler.register("short", first_only)
+        await scheduler.start()
+        try:
+            return await asyncio.gather(
+                *[scheduler.submit("short", p) for p in ("a", "b")],
+                return_exceptions=True
+            )
+        finally:
+            await scheduler.stop()
+    
+    first, second = asyncio.run(scenario())
+    assert first == "a"
+    assert isinstance(second, RuntimeError)
+
+
+def test_handler_exception_fails_whole_batch():
+    async def broken(payloads):
+        raise KeyError("down")
+    
+    async def scenario():
+        scheduler = BatchScheduler(max_batch=8, max_wait_ms=20)
+        scheduler.register("broken", broken)
+        await scheduler.start()
+        try:
+            return await asyncio.gather(
+                *[scheduler.submit("broken", p) for p in range(3)],
+                return_exceptions=True
+            )
+        finally:
+            await scheduler.stop()
+    
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, KeyError) for result in results)
+
+
+def test_flush_dispatches_partial_batch_without_waiting():
+    batches = []
+    
+    async def record(payloads):
+        batches.append(list(payloads))
+        return payloads
+    
+    async def scenario():
+        # A long wait would hold the batch back if flush did not dispatch it
+        scheduler = BatchScheduler(max_batch=8, max_wait_ms=60_000)
+        scheduler.register("echo", record)
+        await scheduler.start()
+        try:
+            tasks = [asyncio.create_task(scheduler.submit("echo", p)) for p in range(3)]
+            await asyncio.sleep(0)
+            await asyncio.wait_for(scheduler.flush(), timeout=1)
+            results = await asyncio.wait_for(asyncio.gather(*tasks), timeout=1)
+            
+            # The worker is running again after a flush
+            late = await asyncio.wait_for(
+                asyncio.gather(scheduler.submit("echo", 9), scheduler.flush()), timeout=1
+            )
+            return results, late[0]
+        finally:
+            await scheduler.stop()
+    
+    results, late = asyncio.run(scenario())
+    assert results == [0, 1, 2]
+    assert late == 9
+    assert batches == [[0, 1, 2], [9]]
+
+
+def test_stop_fails_queued_requests():
+    async def never_called(payloads):
+        raise AssertionError("queued requests must not be dispatched after stop")
+    
+    async def scenario():
+        scheduler = BatchScheduler(max_batch=8, max_wait_ms=60_000)
+        scheduler.register("idle", never_called)
+        await scheduler.start()
+        task = asyncio.create_task(scheduler.submit("idle", 1))
+        await asyncio.sleep(0)
+        await scheduler.stop()
+        with pytest.raises(RuntimeError, match="stopped"):
+            await asyncio.wait_for(task, timeout=1)
+    
+    asyncio.run(scenario())
+
+
+def test_submit_without_worker_dispatches_directly():
+    async def scenario():
+        scheduler = BatchScheduler()
+        scheduler.register("double", _double_or_fail)
+        assert await scheduler.submit("double", 4) == 8
+        with pytest.raises(ValueError):
+            await scheduler.submit("double", -4)
+        with pytest.raises(ValueError, match="No batch handler"):
+            await scheduler.submit("missing", 1)
+    
+    asyncio.run(scenario())
+
+
+def test_lone_request_is_not_held_back():
+    async def echo(payloads):
+        return payloads
+    
+    async def scenario():
+        scheduler = BatchScheduler(max_batch=8, max_wait_ms=60_000)
+        scheduler.register("echo", echo)
+        await scheduler.start()
+        try:
+            return await asyncio.wait_for(scheduler.submit("echo", 1), timeout=1)
+        finally:
+            await scheduler.stop()
+    
+    assert asyncio.run(scenario()) == 1
+
+
+def test_queued_requests_are_batched_together():
+    batches = []
+    
+    async def record(payloads):
+        batches.append(list(payloads))
+        return payloads
+    
+    async def scenario():
+        scheduler = BatchScheduler(max_batch=3, max_wait_ms=60_000)
+        scheduler.register("echo", record)
+        await scheduler.start()
+        try:
+            # Queue everything before the worker runs, so it finds company and fills full batches
+            return await asyncio.wait_for(
+                asyncio.gather(*[scheduler.submit("echo", p) for p in range(6)]), timeout=1
+            )
+        finally:
+            await scheduler.stop()
+    
+    assert asyncio.run(scenario()) == list(range(6))
+    assert batches == [[0, 1, 2], [3, 4, 5]]
@@ -0,0 +1,66 @@
+"""
+Tests for parsing decision evaluations.
+"""
+
+from src.services.decision_engine import _evaluation_complete, _parse_evaluation
+
+EVALUATION = """Here is my evaluation.
+
+Ethical Impact: Sparing the prisoners shows mercy,
+though it risks future unrest.
+**Technological Impact**: None of note.
+Temporal Impact:
+The timeline bends slightly toward stability.
+Karma Score: +7
+Closing remarks that belong to no section.
+"""
+
+
+def test_parse_evaluation_sections_and_score():
+    ethical, technological, temporal, karma = _parse_evaluation(EVALUATION)
+    
+    assert ethical == "Sparing the prisoners shows mercy, though it risks future unrest."
+    assert technological == "None of note."
+    assert temporal == "The timeline bends slightly toward stability."
+    assert karma == 7
+
+
+def test_parse_evaluation_negative_score_with_space():
+    *_, karma = _parse_evaluation("Ethical Impact: bad\nKarma Impact - 3\n")
+    
+    assert karma == -3
+
+
+def test_parse_evaluation_missing_score_is_small_random():
+    ethical, technological, temporal, karma = _parse_evaluation("Ethical Impact: fine\nKarma Score: unclear\n")
+    
+    assert ethical == "fine"
+    assert technological == temporal == ""
+    assert -3 <= karma <= 3
+
+
+def test_parse_evaluation_without_sections():
+    assert _parse_evaluation("Nothing structured here.") == ("", "", "", 0)
+
+
+def test_evaluation_complete_only_after_finished_karma_line():
+    karma_line_end = EVALUATION.index("Karma Score: +7") + len("Karma Score: +7")
+    
+    # Every prefix that ends before the karma line is finished is incomplete
+    for end in range(karma_line_end + 1):
+        assert not _evaluation_complete(EVALUATION[:end]), EVALUATION[:end]
+    
+    assert _evaluation_complete(EVALUATION[:karma_line_end + 1])
+    assert _evaluation_complete(EVALUATION)
+
+
+def test_evaluation_complete_needs_every_section():
+    assert not _evaluation_complete("Ethical Impact: a\nTemporal Impact: b\nKarma Score: 2\n")
+    assert not _evaluation_complete("Karma Score: 2\nEthical Impact: a\nTechnological Impact: b\nTemporal Impact: c\n")
+
+
+def test_complete_prefix_parses_like_full_text():
+    karma_line_end = EVALUATION.index("Karma Score: +7") + len("Karma Score: +7")
+    prefix = EVALUATION[:karma_line_end + 1]
+    
+    assert _parse_evaluation(prefix) == _parse_evaluation(EVALUATION)
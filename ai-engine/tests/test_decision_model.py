@@ -0,0 +1,72 @@
+"""
+Tests for locating and decoding the JSON evaluation in a streamed decision model response.
+"""
+
+import msgspec
+import orjson
+import pytest
+
+from src.models.decision_model import DecisionEvaluation, DecisionModel, _JsonObjectScanner
+
+RESPONSE = (
+    'Sure! Here is the evaluation:\n'
+    '{"explanation": "Braces {like these} and \\"quotes\\" stay inside the string", '
+    '"karma_impact": 4, "affected_realms": ["r1"], "nested": {"depth": {"level": 2}}}\n'
+    'Trailing {"second": "object"}'
+)
+
+
+def _feed_in_pieces(text, size):
+    """Feed text to a new scanner in pieces of the given size, returning the first object found."""
+    scanner = _JsonObjectScanner()
+    for start in range(0, len(text), size):
+        found = scanner.feed(text[start:start + size])
+        if found is not None:
+            return found
+    return None
+
+
+def test_scanner_finds_first_object_for_any_piece_size():
+    expected = RESPONSE[RESPONSE.index("{"):RESPONSE.index("\nTrailing")].encode()
+    
+    for size in range(1, len(RESPONSE) + 1):
+        assert _feed_in_pieces(RESPONSE, size) == expected, size
+    
+    data = orjson.loads(expected)
+    assert data["karma_impact"] == 4
+    assert data["nested"] == {"depth": {"level": 2}}
+
+
+def test_scanner_ignores_quotes_and_stray_braces_outside_objects():
+    text = 'It "said" } then {"a": "}"}'
+    
+    assert _feed_in_pieces(text, 3) == b'{"a": "}"}'
+
+
+def test_scanner_returns_none_for_unfinished_object():
+    assert _feed_in_pieces('{"a": {"b": 1}', 2) is None
+
+
+@pytest.mark.parametrize("karma, expected", [
+    ("7", 7), ("7.0", 7), ('"7"', 7), ('"7.6"', 8), ("null", 0), ("-25", -10), ("25", 10)
+])
+def test_loosely_typed_evaluation_is_kept(karma, expected):
+    model = DecisionModel.__new__(DecisionModel)
+    model._karma_lo, model._karma_hi = -10, 10
+    document = (
+        '{"ethical_impact": "Mercy", "karma_impact": %s, "affected_realms": [3, "r1"], '
+        '"explanation": null}' % karma
+    )
+    
+    evaluation = msgspec.json.decode(document, type=DecisionEvaluation, strict=False)
+    model._clamp_karma(evaluation)
+    
+    assert evaluation.ethical_impact == "Mercy"
+    assert evaluation.karma_impact == expected
+    assert isinstance(evaluation.karma_impact, int)
+    assert evaluation.affected_realms == [3, "r1"]
+
+
+def test_malformed_evaluation_is_rejected():
+    with pytest.raises(msgspec.DecodeError):
+        msgspec.json.decode('{"karma_impact": "very good"}', type=DecisionEvaluation, strict=False)
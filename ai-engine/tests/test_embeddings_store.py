@@ -0,0 +1,69 @@
+"""
+Tests for similarity search over the vector database and the local corpus.
+"""
+
+import asyncio
+
+import numpy as np
+
+from src.data import embeddings_store as store_module
+from src.data.embeddings_store import EmbeddingsStore
+
+
+def _store(tmp_path, monkeypatch, query, db_matches):
+    """Build a store whose query embedding and vector database answers are fixed."""
+    store = EmbeddingsStore(corpus_dir=str(tmp_path))
+    db_calls = []
+    
+    async def embed(kind, text):
+        return query
+    
+    async def query_vectors(vector, top_k, include_values=False):
+        db_calls.append(top_k)
+        return db_matches
+    
+    monkeypatch.setattr(store.query_batcher, "submit", embed)
+    monkeypatch.setattr(store_module, "query_vectors", query_vectors)
+    return store, db_calls
+
+
+def _save_corpus(store, vectors):
+    for id, vector in vectors.items():
+        store._cache_embedding(id, vector, {"source": id})
+    assert store.save_corpus()
+
+
+def test_vector_database_results_skip_local_scan(tmp_path, monkeypatch):
+    db_matches = [{"id": "db", "score": 0.5, "metadata": {"source": "db"}}]
+    store, db_calls = _store(tmp_path, monkeypatch, [1.0, 0.0], db_matches)
+    _save_corpus(store, {"close": [1.0, 0.0]})
+    store.load_corpus()
+    
+    def fail(*args):
+        raise AssertionError("the local corpus must not be scanned when the database answers")
+    
+    monkeypatch.setattr(store, "_search_local", fail)
+    
+    results = asyncio.run(store.find_similar("query", top_k=3))
+    
+    assert results == db_matches
+    assert db_calls == [3]
+
+
+def test_local_corpus_used_when_database_has_no_answer(tmp_path, monkeypatch):
+    store, db_calls = _store(tmp_path, monkeypatch, [1.0, 0.0], [])
+    _save_corpus(store, {"close": [1.0, 0.1], "far": [0.0, 1.0], "changed": [0.0, 1.0]})
+    
+    fresh = EmbeddingsStore(corpus_dir=str(tmp_path))
+    fresh.query_batcher, fresh.query_cache = store.query_batcher, store.query_cache
+    assert fresh.load_corpus()
+    
+    # Embeddings cached since startup override corpus rows with the same ID
+    fresh._cache_embedding("changed", [1.0, 0.0], {"source": "cache"})
+    
+    results = asyncio.run(fresh.find_similar("query", top_k=2))
+    
+    assert [result["id"] for result in results] == ["changed", "close"]
+    assert results[0]["metadata"] == {"source": "cache"}
+    assert db_calls == [2]
+    assert np.isclose(results[0]["score"], 1.0, atol=1e-2)
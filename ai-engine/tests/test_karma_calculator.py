@@ -0,0 +1,74 @@
+"""
+Tests for the karma calculator.
+"""
+
+import random
+
+from src.services.karma_calculator import KarmaCalculator
+
+
+def _actions(seed, count):
+    """Build a reproducible mix of actions covering keywords, roles, eras and clamping."""
+    rng = random.Random(seed)
+    decisions = [
+        "help the villagers", "steal the relic", "research the core", "sabotage the gate",
+        "stabilize the rift", "sever the link", "wait and watch", "help and destroy"
+    ]
+    roles = ["Techno Monk", "Shadow Broker", "Chrono Diplomat", "Bio-Smith", None]
+    eras = ["Initiation", "Progression", "Distortion", "Equilibrium", "Unknown"]
+    impact_fields = ["ethical_impact", "technological_impact", "temporal_impact", None]
+    
+    actions = []
+    for _ in range(count):
+        evaluation = {
+            "karma_score": rng.choice([-12, -7, -5, -3, -1, 0, 1, 2, 3, 5, 8, 12]),
+            "game_era": rng.choice(eras)
+        }
+        role = rng.choice(roles)
+        if role is not None:
+            evaluation["player_role"] = role
+        field = rng.choice(impact_fields)
+        if field is not None:
+            evaluation[field] = "some impact"
+        actions.append({"decision": rng.choice(decisions), "evaluation": evaluation})
+    return actions
+
+
+def test_batch_kernel_matches_sequential_calculate():
+    for seed in range(20):
+        actions = _actions(seed, 30)
+        sequential = KarmaCalculator()
+        batched = KarmaCalculator()
+        
+        expected = [
+            sequential.calculate("p1", action["decision"], action["evaluation"])
+            for action in actions
+        ]
+        impacts = batched._score_actions(
+            "p1", [action["decision"] for action in actions], [action["evaluation"] for action in actions]
+        )
+        
+        assert impacts.tolist() == expected
+        assert list(batched.player_action_history["p1"]) == list(sequential.player_action_history["p1"])
+
+
+def test_batch_continues_existing_history():
+    history = _actions(99, 12)
+    actions = _actions(100, 10)
+    sequential = KarmaCalculator()
+    batched = KarmaCalculator()
+    for calculator in (sequential, batched):
+        for action in history:
+            calculator.calculate("p1", action["decision"], action["evaluation"])
+    
+    expected = sum(
+        sequential.calculate("p1", action["decision"], action["evaluation"])
+        for action in actions
+    )
+    
+    assert batched.calculate_total("p1", actions) == expected
+    assert list(batched.player_action_history["p1"]) == list(sequential.player_action_history["p1"])
+
+
+def test_calculate_total_of_no_actions():
+    assert KarmaCalculator().calculate_total("p1", []) == 0
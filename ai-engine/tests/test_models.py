@@ -0,0 +1,87 @@
+"""
+Tests for rebuilding stored game states and players.
+"""
+
+from src.models.game_state import GameState
+from src.models.player import Player, TechTree
+from src.models.realm import Realm
+from src.models.timeline import Timeline
+
+
+def _game_state():
+    player = Player(
+        player_id="p1", user_id="u1", username="Ada", role="Techno Monk",
+        owned_realms={"r2", "r1"},
+        quest_history=[{"quest_id": "q1", "status": "active"}]
+    )
+    return GameState(
+        game_id="g1",
+        current_era="Progression",
+        players=[player],
+        timelines=[Timeline(timeline_id="t1", name="Prime", description="d", type="balanced")],
+        realms=[Realm(realm_id="r1", name="Haven", description="d", type="city",
+                      timeline_id="t1", position={"x": 0, "y": 0})],
+        time_rifts=[{"location": {"timeline_id": "t1"}, "severity": 2, "resolved": False}]
+    )
+
+
+def test_game_state_round_trip_ignores_mongo_id():
+    game_state = _game_state()
+    document = game_state.model_dump()
+    document["_id"] = "6543210fedcba"
+    document["players"][0]["_id"] = "0123456789abc"
+    
+    restored = GameState.from_stored(document)
+    
+    assert restored.model_dump() == game_state.model_dump()
+    assert "_id" not in restored.model_dump()
+    assert "_id" not in restored.players[0].model_dump()
+
+
+def test_restored_game_state_rebuilds_nested_types_and_indexes():
+    document = _game_state().model_dump()
+    document["_id"] = "6543210fedcba"
+    
+    restored = GameState.from_stored(document)
+    player = restored.players[0]
+    
+    assert isinstance(player, Player)
+    assert isinstance(player.tech_tree, TechTree)
+    assert player.owned_realms == {"r1", "r2"}
+    assert list(player._active_quests_by_id["q1"]) == [0]
+    assert restored.get_timeline("t1").name == "Prime"
+    assert [realm.realm_id for realm in restored.get_timeline_realms("t1")] == ["r1"]
+    assert restored.get_unresolved_rift_severity("t1") == 2
+    
+    restored.resolve_time_rift(0)
+    assert restored.get_unresolved_rift_severity("t1") == 0
+
+
+def test_repeated_quest_ids_complete_in_order():
+    player = Player(player_id="p1", user_id="u1", username="Ada", role="Bio-Smith")
+    player.add_quest("q", "Quest", "first")
+    player.add_quest("q", "Quest", "second")
+    
+    player.complete_quest("q", "done", 3)
+    player.complete_quest("q", "done", 3)
+    player.complete_quest("q", "done", 3)
+    
+    assert [quest["status"] for quest in player.quest_history] == ["completed", "completed"]
+    assert player.karma == 6
+
+
+def test_restored_player_completes_earliest_active_entry_first():
+    document = Player(
+        player_id="p1", user_id="u1", username="Ada", role="Bio-Smith",
+        quest_history=[
+            {"quest_id": "q", "title": "Quest", "status": "completed"},
+            {"quest_id": "q", "title": "Quest", "status": "active"},
+            {"quest_id": "q", "title": "Quest", "status": "active"}
+        ]
+    ).model_dump()
+    player = Player.from_stored(document)
+    
+    player.complete_quest("q", "done", 2)
+    
+    assert [quest["status"] for quest in player.quest_history] == ["completed", "completed", "active"]
+    assert player.karma == 2
@@ -0,0 +1,56 @@
+"""
+Tests for the memory-mapped training data categories.
+"""
+
+from src.data.training_data import _LazyCategory
+
+
+def test_missing_file_is_empty(tmp_path):
+    category = _LazyCategory(str(tmp_path / "missing.jsonl"))
+    
+    assert len(category) == 0
+    assert list(category) == []
+
+
+def test_index_skips_blank_lines_and_reads_multibyte_text(tmp_path):
+    path = tmp_path / "examples.jsonl"
+    path.write_bytes('{"input": "a", "output": "é"}\n\n{"input": "b"}\n'.encode())
+    category = _LazyCategory(str(path))
+    
+    assert len(category) == 2
+    assert category[0] == {"input": "a", "output": "é"}
+    assert category[-1] == {"input": "b"}
+
+
+def test_append_after_indexing_extends_index(tmp_path):
+    path = tmp_path / "examples.jsonl"
+    path.write_bytes(b'{"input": "a"}\n')
+    category = _LazyCategory(str(path))
+    assert category[0] == {"input": "a"}
+    
+    category.append({"input": "ß"})
+    category.append({"input": "c"})
+    
+    assert list(category) == [{"input": "a"}, {"input": "ß"}, {"input": "c"}]
+    assert list(_LazyCategory(str(path))) == list(category)
+
+
+def test_append_to_new_file_before_indexing(tmp_path):
+    category = _LazyCategory(str(tmp_path / "new.jsonl"))
+    
+    category.append({"input": "a"})
+    
+    assert len(category) == 1
+    assert category[0] == {"input": "a"}
+
+
+def test_append_after_unterminated_last_line(tmp_path):
+    path = tmp_path / "examples.jsonl"
+    path.write_bytes(b'{"input": "a"}')
+    category = _LazyCategory(str(path))
+    assert len(category) == 1
+    
+    category.append({"input": "b"})
+    
+    assert list(category) == [{"input": "a"}, {"input": "b"}]
+    assert list(_LazyCategory(str(path))) == [{"input": "a"}, {"input": "b"}]